@@ -7,11 +7,10 @@ from lib.oled.ssd1306 import SSD1306_I2C
 from lib.io.rotary    import Rotary
 from lib.sound.buzzer import BUZZER
 from lib.oled.writer  import Writer
+from lib.io.devices   import Devices
 
 from micropython      import const
-from machine          import I2C, Pin, Timer, ADC
-
-import lib.oled.seven_segment_48 as font
+from machine          import I2C, Pin, Timer, ADC, RTC
 
 
 # Settings
@@ -19,11 +18,30 @@ WIDTH         = const(128)                   # display width
 HEIGHT        = const(64)                    # display height
 DEFAULT_TIMER = const(8 * 60)                # default timer is 8 minutes
 MAX_TIME      = const(5999)                  # 99 * 60 + 59 maximum time allowed
+MAX_TIMERS    = const(6)                     # independent timers, picked with the rotary
+MAX_LAPS      = const(16)                    # stopwatch laps kept
+PROGRAMS_FILE = 'programs.bin'               # multi-stage programs, see lib/core/programs.py
+PRESETS_FILE  = 'presets.bin'                # saved presets, see lib/core/presets.py
+MAX_PRESETS   = const(48)                    # presets kept
+JOURNAL_FILE  = 'journal.bin'                # timer state, to resume after a power loss
+JOURNAL_SLOTS = const(8)                     # records the journal rotates through
+JOURNAL_MS    = const(10000)                 # running timers saved this often. 0: no journal
 CONV_FACTOR   = (3.3 / (65535)) * 3          # ADC voltage conversion factor
 BATTERY_MAX   = const(4.20)                  # volts
 BATTERY_MIN   = const(3.3)                   # volts
 BAR_WIDTH     = const(48)                    # setup underline width
 BAR_THICKNESS = const(4)                     # setup underline thickness
+BLINK_MS      = const(500)                   # finished alarm blink half-period
+SNOOZE_TIME   = const(5 * 60)                # a turn of the knob on the alarm snoozes this long
+PROFILE_HEAP  = const(False)                 # print heap allocations per tick
+RECORD_INPUT  = const(False)                 # log rotary events and ADC readings
+TRACE_LATENCY = const(False)                 # event-to-pixel latency histogram
+PROFILE_BOOT  = const(False)                 # print the boot-time breakdown
+SHOW_TENTHS   = const(False)                 # SS.t at 10 Hz in the last minute
+SEGMENT_TIME  = const(False)                 # draw the time with bars instead of the bitmap font
+SEGMENT_BAR   = const(3)                     # their thickness, odd
+PACKED_FONT   = const(False)                 # bitmap font stored as row runs, decoded on demand
+FONT_FILE     = None                         # 'seven_segment_48.bin': glyphs read from flash, see lib/oled/filefont.py
 
 
 # States - PLEASE DO NOT CHANGE
@@ -34,6 +52,10 @@ TIMER_FINISHED = const(2)                    # [state] time has finished
 SET_MINUTES    = const(0)                    # [mode] app is setting minutes
 SET_SECONDS    = const(1)                    # [mode] app is setting seconds
 RUN_MODE       = const(2)                    # [mode] app is doing the timing
+STOPWATCH      = const(3)                    # [mode] app is a stopwatch
+SET_PROGRAM    = const(4)                    # [mode] app is picking a program
+SET_PRESET     = const(5)                    # [mode] app is in the preset menu
+SET_READY      = const(6)                    # [mode] app is setting a "ready at" time
 
 
 def setup_ssd(scl = 1, sda = 0, i2c = 0):
@@ -63,10 +85,48 @@ def setup_ssd(scl = 1, sda = 0, i2c = 0):
 
     return ssd
 
-ssd = setup_ssd()
-rotary  = Rotary(2, 3, 4)                    # initialize rotary encoder
-buzzer  = BUZZER(15)                         # initialize buzzer
-tim     = Timer(-1)                          # initialize rotary switch IRQ timer
-Vsys    = ADC(29)                            # initialize ADC for Vsys reading
-Vin     = ADC(26)                            # init ADC for Vin (battery) measurement
-writer  = Writer(ssd, font, False)           # init writer NOT verbose
+
+def setup_writer():
+    """
+    The renderer of the time: bars, or the bitmap font, from a font file,
+    packed or not. Only the one used is imported; with no font file, the
+    font module
+
+    Returns : Segments or Writer
+    """
+
+    if SEGMENT_TIME:
+        from lib.oled.segments import Segments
+
+        return Segments(devices.ssd, 48, SEGMENT_BAR)
+
+    if FONT_FILE:
+        from lib.oled.filefont import FileFont
+
+        try:
+            return Writer(devices.ssd, FileFont(FONT_FILE), False)
+        except OSError:
+            pass                             # not copied to the Pico: the module below
+
+    if PACKED_FONT:
+        import lib.oled.seven_segment_48_rle as font
+    else:
+        import lib.oled.seven_segment_48 as font
+
+    return Writer(devices.ssd, font, False)  # init writer NOT verbose
+
+
+# peripherals, each set up on first use: devices.ssd, or config.ssd
+devices = Devices()
+devices.add('ssd',    setup_ssd)
+devices.add('writer', setup_writer)
+devices.add('rotary', lambda: Rotary(2, 3, 4))                   # initialize rotary encoder
+devices.add('buzzer', lambda: BUZZER(15))                        # initialize buzzer
+devices.add('tim',    lambda: Timer(-1))                         # initialize rotary switch IRQ timer
+devices.add('Vsys',   lambda: ADC(29))                           # initialize ADC for Vsys reading
+devices.add('Vin',    lambda: ADC(26))                           # init ADC for Vin (battery) measurement
+devices.add('rtc',    RTC)                                       # wall clock, for "ready at" times
+
+
+def __getattr__(name):
+    return getattr(devices, name)
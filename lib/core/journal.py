@@ -0,0 +1,209 @@
+"""
+journal.py
+Timer state journal, to resume after a power loss
+
+The journal file holds `slots` fixed-size records, written in turn:
+
+    <I seq> <B selected> <b ready> <H target>
+    count * (<B state> <B program> <B stage> <H duration> <I left ms>)
+    <I crc32 of all of the above>                               little endian
+
+ready is the timer counting down to a time of day, -1 for none, and
+target that time in minutes since midnight (lib/core/readyat.py).
+
+A record goes to slot seq % slots, so the latest ones are always spread
+over several slots: a write torn by the power going off spoils only the
+slot it was writing, and its CRC gives it away. On boot the valid record
+with the highest seq wins.
+
+Changes (set, start, pause, expiry, another timer on display) are written
+at the next poll, at most once a second. While a timer runs its remaining
+time is refreshed every `every` ms: a shorter cadence resumes closer to
+where the timer was, a longer one writes flash less often. The time the
+power was off is not counted: there is no clock running meanwhile. A
+"ready at" timer is the exception: it comes back as a plain countdown,
+and the app arms it again on the RTC from `ready` and `target`.
+"""
+
+import struct
+
+from binascii import crc32
+
+from config import TIMER_RUNNING, TIMER_FINISHED
+from utime import ticks_ms, ticks_diff
+
+
+HEAD     = '<IBbH'
+TIMER    = '<BBBHI'
+HEAD_SZ  = 8
+TIMER_SZ = 9
+GAP_MS   = 1000                              # fastest rate for changes
+
+
+class Journal:
+    """
+    Rotating state journal
+
+    Attributes
+    --------------
+    selected : int
+        timer on display in the restored record
+    ready, target : int
+        "ready at" timer in the restored record, -1 for none, and its
+        target in minutes since midnight
+    readyat : ReadyAt
+        journaled along with the timers once set, None before
+    """
+
+    def __init__(self, path, slots, every, timers, programs, clock = ticks_ms):
+        """
+        Parameters
+        ----------
+        path : str
+            journal file on the Pico filesystem
+        slots : int
+            records to rotate through
+        every : int
+            ms between refreshes while a timer runs
+        timers : TimerManager
+            the timers
+        programs : ProgramEngine
+            programs running on them
+        clock : callable, optional
+            returns ticks in ms. Default utime.ticks_ms
+        """
+
+        self.path     = path
+        self.slots    = slots
+        self.every    = every
+        self.timers   = timers
+        self.programs = programs
+        self.clock    = clock
+        self.size     = HEAD_SZ + timers.count * TIMER_SZ + 4
+        self.buf      = bytearray(self.size)
+        self.seq      = 0
+        self.last     = clock()
+        self.changes  = -1                   # timers.changes when last written
+        self.selected = 0
+        self.ready    = -1
+        self.target   = 0
+        self.readyat  = None
+
+
+    def restore(self):
+        """
+        Load the latest valid record into the timers and programs
+
+        Returns : bool
+            a record was found
+        """
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+
+        best = -1
+
+        for at in range(0, len(data) - self.size + 1, self.size):
+            body = data[at:at + self.size - 4]
+
+            if struct.unpack_from('<I', data, at + self.size - 4)[0] != crc32(body):
+                continue
+
+            seq = struct.unpack_from('<I', data, at)[0]
+
+            if best < 0 or seq > self.seq:
+                best     = at
+                self.seq = seq
+
+        if best < 0:
+            return False
+
+        self.seq += 1
+        _, self.selected, self.ready, self.target = struct.unpack_from(HEAD, data, best)
+
+        timers = self.timers
+        at     = best + HEAD_SZ
+
+        for i in range(timers.count):
+            state, program, stage, duration, left = struct.unpack_from(TIMER, data, at)
+            at += TIMER_SZ
+
+            timers.set(i, duration)
+
+            if program < self.programs.table.count:
+                self.programs.program[i] = program
+                self.programs.stage[i]   = stage
+
+            if state != TIMER_FINISHED:      # a ringing timer comes back rewound
+                timers.left_ms[i] = left
+
+            if state == TIMER_RUNNING:
+                timers.start(i)
+
+        self.changes = timers.changes
+
+        return True
+
+
+    def poll(self, selected):
+        """
+        Write a record if something changed or a running timer is due
+        for a refresh
+
+        Parameters
+        ----------
+        selected : int
+            timer on display
+        """
+
+        since = ticks_diff(self.clock(), self.last)
+
+        if since < GAP_MS:
+            return
+
+        changed = self.changes != self.timers.changes or selected != self.selected
+
+        if changed or (since >= self.every and self.timers.running()):
+            self.write(selected)
+
+
+    def write(self, selected):
+        """Append a record to the next slot"""
+
+        timers   = self.timers
+        programs = self.programs
+        buf      = self.buf
+        at       = HEAD_SZ
+
+        ready = self.readyat.slot if self.readyat is not None else -1
+
+        struct.pack_into(HEAD, buf, 0, self.seq, selected, ready, self.readyat.target if ready >= 0 else 0)
+
+        for i in range(timers.count):
+            struct.pack_into(TIMER, buf, at, timers.states[i], programs.program[i],
+                             programs.stage[i], timers.durations[i], timers.remaining_ms(i))
+            at += TIMER_SZ
+
+        struct.pack_into('<I', buf, at, crc32(memoryview(buf)[:at]))
+
+        self._store(self.seq % self.slots)
+
+        self.seq     += 1
+        self.last     = self.clock()
+        self.changes  = timers.changes
+        self.selected = selected
+
+
+    def _store(self, slot):
+        try:
+            f = open(self.path, 'r+b')
+        except OSError:
+            f = open(self.path, 'wb')        # first write: lay out every slot
+            f.write(bytes(self.size * self.slots))
+
+        with f:
+            f.seek(slot * self.size)
+            f.write(self.buf)
@@ -0,0 +1,192 @@
+"""
+presets.py
+Named timer presets kept on the Pico filesystem
+
+File layout: the 4-byte magic b'KTS1', then 10-byte records
+
+    <8s name> <H seconds>        little endian
+
+name is ASCII, padded with spaces. Saving only ever adds a record;
+a later record for a name replaces the earlier ones, so flash blocks
+already written are never rewritten. A record is written after the
+last whole one, over whatever a power cut left half-written past it.
+Once dead records outnumber the live ones by `slack` the file is
+compacted in one go: the live records go to a new file, renamed over
+the old one once whole, so a power cut leaves one or the other.
+
+Nothing is read until the presets are first needed. The file is then
+scanned once into a small index (names and record numbers); a preset's
+time is read with a single seek when it is recalled.
+"""
+
+import os
+import struct
+
+from array import array
+
+
+MAGIC  = b'KTS1'
+NAME   = 8
+RECORD = 10
+
+
+def pack(name, seconds):
+    """
+    Returns : bytes
+        the record for a preset
+    """
+
+    name = name[:NAME].encode()
+
+    return name + b' ' * (NAME - len(name)) + struct.pack('<H', seconds)
+
+
+class Presets:
+    """
+    Preset store
+
+    Attributes
+    --------------
+    path : str
+        preset file on the Pico filesystem
+    size : int
+        most presets kept
+    """
+
+    def __init__(self, path = 'presets.bin', size = 48, slack = 64):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            preset file. Default 'presets.bin'
+        size : int, optional
+            most presets kept. Default 48
+        slack : int, optional
+            dead records tolerated before compacting. Default 64
+        """
+
+        self.path    = path
+        self.size    = size
+        self.slack   = slack
+        self.names   = None                  # index, loaded on first use
+        self.records = None
+        self.total   = 0                     # records in the file, dead ones included
+
+
+    def _load(self):
+        if self.names is not None:
+            return
+
+        self.names   = []
+        self.records = array('H')
+        self.total   = 0
+
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return
+
+        with f:
+            if f.read(4) != MAGIC:
+                return
+
+            rec = bytearray(RECORD)
+
+            while f.readinto(rec) == RECORD:
+                self._index(bytes(rec[:NAME]).decode().rstrip(), self.total)
+                self.total += 1
+
+
+    def _index(self, name, n):
+        if name in self.names:
+            self.records[self.names.index(name)] = n
+        else:
+            self.names.append(name)
+            self.records.append(n)
+
+
+    def count(self):
+        self._load()
+
+        return len(self.names)
+
+
+    def name(self, i):
+        self._load()
+
+        return self.names[i]
+
+
+    def seconds(self, i):
+        """
+        Returns : int
+            time of preset `i`, read from flash
+        """
+
+        self._load()
+
+        with open(self.path, 'rb') as f:
+            f.seek(4 + self.records[i] * RECORD + NAME)
+
+            return struct.unpack('<H', f.read(2))[0]
+
+
+    def save(self, name, seconds):
+        """
+        Save a preset, replacing any with the same name
+
+        Parameters
+        ----------
+        name : str
+            up to 8 ASCII characters
+        seconds : int
+            the time
+
+        Returns : bool
+            False if the store is full
+        """
+
+        self._load()
+
+        name = name[:NAME].rstrip()
+
+        if name not in self.names and len(self.names) >= self.size:
+            return False
+
+        with open(self.path, 'r+b' if self.total else 'wb') as f:
+            if self.total:
+                f.seek(4 + self.total * RECORD)  # over a torn record, not after it
+            else:
+                f.write(MAGIC)
+
+            f.write(pack(name, seconds))
+
+        self._index(name, self.total)
+        self.total += 1
+
+        if self.total - len(self.names) > self.slack:
+            self.compact()
+
+        return True
+
+
+    def compact(self):
+        """Rewrite the file with live records only, through a temporary file"""
+
+        self._load()
+
+        tmp = self.path + '.tmp'
+        rec = bytearray(RECORD)
+
+        with open(self.path, 'rb') as src, open(tmp, 'wb') as f:
+            f.write(MAGIC)
+
+            for n in self.records:
+                src.seek(4 + n * RECORD)
+                src.readinto(rec)
+                f.write(rec)
+
+        os.rename(tmp, self.path)            # replaces the old file
+
+        self.records = array('H', range(len(self.names)))
+        self.total   = len(self.names)
@@ -0,0 +1,244 @@
+"""
+programs.py
+Multi-stage programs ("boil 8:00 -> rest 2:00 -> alarm") run on the timers
+
+Table layout: the 4-byte magic b'KTP1', a <B count>, then for every
+program
+
+    <8s name> <B stages> stages * (<H seconds> <B tone>)     little endian
+
+name is ASCII, padded with spaces. tone is a BUZZER.TONE_* number and
+sounds when the stage ends; the tone of the last stage is the alarm.
+The table is read from flash once and stays a single bytes object:
+stages are unpacked on demand, never turned into lists.
+
+A program runs on one of the TimerManager timers. When a stage runs
+out, poll() starts the next one from the old deadline, so a program
+takes exactly the sum of its stages however late the loop notices.
+"""
+
+import struct
+
+from array import array
+
+from config import TIMER_FINISHED
+
+
+MAGIC  = b'KTP1'
+NAME   = 8
+STAGE  = 3
+NONE   = 0xFF                                # no program on a timer
+
+
+def pack(programs):
+    """
+    Build a program table
+
+    Parameters
+    ----------
+    programs : list of (str, list of (int, int))
+        name and (seconds, tone) stages of every program
+
+    Returns : bytes
+    """
+
+    out = bytearray(MAGIC)
+    out.append(len(programs))
+
+    for name, stages in programs:
+        out += name[:NAME].encode().ljust(NAME)
+        out.append(len(stages))
+
+        for seconds, tone in stages:
+            out += struct.pack('<HB', seconds, tone)
+
+    return bytes(out)
+
+
+class ProgramTable:
+    """
+    Read-only view of a packed program table
+
+    Attributes
+    --------------
+    count : int
+        number of programs
+    """
+
+    def __init__(self, data = None):
+        """
+        Parameters
+        ----------
+        data : bytes, optional
+            packed table. Default: no programs
+        """
+
+        self.data    = data or MAGIC + b'\x00'
+        self.offsets = array('H')
+
+        if self.data[:4] != MAGIC:
+            raise ValueError('not a program table')
+
+        at = 5
+
+        for _ in range(self.data[4]):
+            self.offsets.append(at)
+            at += NAME + 1 + self.data[at + NAME] * STAGE
+
+        self.count = len(self.offsets)
+
+
+    def name(self, p):
+        at = self.offsets[p]
+
+        return self.data[at:at + NAME].decode().rstrip()
+
+
+    def stages(self, p):
+        return self.data[self.offsets[p] + NAME]
+
+
+    def stage(self, p, s):
+        """
+        Returns : (int, int)
+            seconds and tone of stage `s` of program `p`
+        """
+
+        return struct.unpack_from('<HB', self.data, self.offsets[p] + NAME + 1 + s * STAGE)
+
+
+def load_table(path):
+    """
+    Read a program table from flash
+
+    Returns : ProgramTable
+        empty if there is no file
+    """
+
+    try:
+        with open(path, 'rb') as f:
+            return ProgramTable(f.read())
+    except OSError:
+        return ProgramTable()
+
+
+class ProgramEngine:
+    """
+    Runs programs from a table on the timers of a TimerManager
+
+    Attributes
+    --------------
+    tone : int
+        tone of the last stage change, -1 once played
+    """
+
+    def __init__(self, table, timers, alarm):
+        """
+        Parameters
+        ----------
+        table : ProgramTable
+            programs to pick from
+        timers : TimerManager
+            timers to run them on
+        alarm : int
+            tone of a timer without a program
+        """
+
+        self.table   = table
+        self.timers  = timers
+        self.alarm   = alarm
+        self.program = bytearray([NONE] * timers.count)
+        self.stage   = bytearray(timers.count)
+        self.tone    = -1
+
+
+    def active(self, i):
+        """
+        Returns : int
+            program on timer `i`, -1 for none
+        """
+
+        p = self.program[i]
+
+        return -1 if p == NONE else p
+
+
+    def load(self, i, p):
+        """
+        Put program `p` on timer `i`, rewound to its first stage
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        p : int
+            program index, -1 to leave the timer as a plain one
+        """
+
+        if p < 0:
+            self.program[i] = NONE
+            return
+
+        self.program[i] = p
+        self.stage[i]   = 0
+        self.timers.set(i, self.table.stage(p, 0)[0])
+
+
+    def rewind(self, i):
+        """Stop timer `i` and rewind its program, if it has one"""
+
+        if self.program[i] != NONE:
+            self.load(i, self.program[i])
+
+
+    def clear(self, i):
+        """Timer `i` was set by hand: it no longer runs a program"""
+
+        self.program[i] = NONE
+
+
+    def alarm_tone(self, i):
+        """
+        Returns : int
+            tone for timer `i` ringing
+        """
+
+        p = self.program[i]
+
+        if p == NONE:
+            return self.alarm
+
+        return self.table.stage(p, self.stage[i])[1]
+
+
+    def poll(self):
+        """
+        Move every timer whose stage ran out on to its next stage, then
+        poll the timers
+
+        Returns : int
+            index of a finished timer, -1 if none is ringing
+        """
+
+        timers  = self.timers
+        ringing = timers.poll()
+
+        if ringing < 0:
+            return ringing
+
+        for i in range(timers.count):
+            p = self.program[i]
+
+            if p == NONE or timers.states[i] != TIMER_FINISHED:
+                continue
+
+            s = self.stage[i] + 1
+
+            if s >= self.table.stages(p):
+                continue                     # last stage: ring
+
+            self.tone     = self.table.stage(p, s - 1)[1]
+            self.stage[i] = s
+            timers.follow(i, self.table.stage(p, s)[0])
+
+        return timers.poll()
@@ -0,0 +1,132 @@
+"""
+readyat.py
+Count a timer down to a time of day ("ready at 18:30")
+
+The time left is worked out from the RTC on every poll, never counted
+down. The timer itself keeps running on the TimerManager, which gives
+the sub-second deadline and the alarm. The RTC only tells whole seconds,
+so reading `left` seconds to go means somewhere in (left - 1, left]:
+the deadline is set in the middle of that window, and put back there
+whenever the timer falls outside it (the RTC was set, or the two clocks
+drifted apart). The alarm is then within half a second of the RTC.
+
+Targets are minutes since midnight. A target earlier than now is
+tomorrow.
+"""
+
+from config import TIMER_RUNNING
+
+
+DAY  = 24 * 60 * 60
+HALF = 500                                   # ms, middle of an RTC second
+
+
+class ReadyAt:
+    """
+    Time-of-day target for one of the timers
+
+    Attributes
+    --------------
+    slot : int
+        timer counting down to the target, -1 for none
+    target : int
+        minutes since midnight
+    """
+
+    def __init__(self, rtc, timers):
+        """
+        Parameters
+        ----------
+        rtc : machine.RTC
+            anything with the RTC datetime() method
+        timers : TimerManager
+            the timers
+        """
+
+        self.rtc    = rtc
+        self.timers = timers
+        self.slot   = -1
+        self.target = 0
+
+
+    def now(self):
+        """
+        Returns : int
+            seconds since midnight, from the RTC
+        """
+
+        dt = self.rtc.datetime()
+
+        return dt[4] * 3600 + dt[5] * 60 + dt[6]
+
+
+    def left(self, target = None):
+        """
+        Parameters
+        ----------
+        target : int, optional
+            minutes since midnight. Default: the armed target
+
+        Returns : int
+            seconds from now to the target
+        """
+
+        if target is None:
+            target = self.target
+
+        return (target * 60 - self.now()) % DAY
+
+
+    def arm(self, i, target):
+        """
+        Start timer `i` towards `target`
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        target : int
+            minutes since midnight
+        """
+
+        self.slot   = i
+        self.target = target
+
+        left = self.left()
+
+        self.timers.set(i, left)
+        self.timers.start(i)
+        self.timers.retarget(i, left * 1000 - HALF)
+
+
+    def poll(self):
+        """
+        Keep the armed timer on the RTC. A timer that was paused, set
+        or has finished is no longer armed
+        """
+
+        i = self.slot
+
+        if i < 0:
+            return
+
+        if self.timers.state(i) != TIMER_RUNNING:
+            self.slot = -1
+            return
+
+        left = self.seconds()
+        ms   = self.timers.remaining_ms(i)
+
+        if ms > left * 1000 or ms <= (left - 1) * 1000:
+            self.timers.retarget(i, max(left * 1000 - HALF, 0))
+
+
+    def seconds(self):
+        """
+        Returns : int
+            seconds left on the armed timer, from the RTC. 0 once past
+        """
+
+        left = self.left()
+
+        return 0 if left > DAY // 2 else left
@@ -0,0 +1,138 @@
+"""
+stopwatch.py
+Count-up stopwatch with a fixed lap buffer
+
+Time is read from a ticks_ms() baseline, never accumulated tick by
+tick, so the reading is as good as the clock whatever the loop does.
+Laps are kept as cumulative tenths in a preallocated ring: once it is
+full the oldest lap is overwritten.
+"""
+
+from array import array
+
+from utime import ticks_ms, ticks_diff
+
+
+class Stopwatch:
+    """
+    Stopwatch with 1/10 s resolution
+
+    Attributes
+    --------------
+    running : bool
+        counting
+    laps : int
+        laps taken since the last reset
+    """
+
+    def __init__(self, max_laps, clock = ticks_ms):
+        """
+        Parameters
+        ----------
+        max_laps : int
+            laps kept
+        clock : callable, optional
+            returns ticks in ms. Default utime.ticks_ms
+        """
+
+        self.clock   = clock
+        self.base    = 0                     # ticks_ms when (re)started
+        self.total   = 0                     # ms counted before that
+        self.running = False
+        self.buf     = array('l', [0] * max_laps)
+        self.laps    = 0
+
+
+    def elapsed(self):
+        """
+        Returns : int
+            ms counted
+        """
+
+        if self.running:
+            return self.total + ticks_diff(self.clock(), self.base)
+
+        return self.total
+
+
+    def tenths(self):
+        """
+        Returns : int
+            tenths of a second counted
+        """
+
+        return self.elapsed() // 100
+
+
+    def start(self):
+        if self.running:
+            return
+
+        self.base    = self.clock()
+        self.running = True
+
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.total   = self.elapsed()
+        self.running = False
+
+
+    def reset(self):
+        """Stop and clear time and laps"""
+
+        self.running = False
+        self.total   = 0
+        self.laps    = 0
+
+
+    def lap(self):
+        """
+        Record a lap
+
+        Returns : int
+            the lap number
+        """
+
+        self.buf[self.laps % len(self.buf)] = self.tenths()
+        self.laps += 1
+
+        return self.laps
+
+
+    def split(self, n):
+        """
+        Duration of lap `n` (1-based), if still in the buffer
+
+        Returns : int
+            tenths of a second, -1 if lap `n` is gone
+        """
+
+        size = len(self.buf)
+
+        if n < 1 or n > self.laps or n <= self.laps - size:
+            return -1
+
+        end = self.buf[(n - 1) % size]
+
+        if n == 1:
+            return end
+
+        if n - 1 <= self.laps - size:
+            return -1
+
+        return end - self.buf[(n - 2) % size]
+
+
+    def wait(self):
+        """
+        Returns : int
+            ms until the next tenth, 100 when stopped
+        """
+
+        if not self.running:
+            return 100
+
+        return 100 - self.elapsed() % 100
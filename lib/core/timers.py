@@ -0,0 +1,413 @@
+"""
+timers.py
+Independent countdown timers sharing one deadline heap
+
+Every timer has its own duration, remaining time and state. Running
+timers have an entry (deadline, generation, index) in a min-heap, so
+the soonest expiry is found in O(1) and added or removed in O(log n).
+Pausing or resetting a timer bumps its generation instead of searching
+the heap; stale entries are dropped when they reach the top.
+
+Deadlines are kept on a private millisecond clock that never wraps,
+fed from utime.ticks_ms() (or any other `clock` callable, for tests).
+Every REBASE_MS (about 3 days) the clock and every deadline are moved
+back by as much, so that they stay small ints on the Pico (no heap
+allocation per tick) and fit the 32 bit slots of array('l').
+"""
+
+from heapq import heappush, heappop
+from array import array
+
+from config import TIMER_RUNNING, TIMER_PAUSED, TIMER_FINISHED
+from utime import ticks_ms, ticks_diff
+
+
+REBASE_MS = 1 << 28                          # ms; small ints go up to 2**30 on rp2
+
+
+class TimerManager:
+    """
+    N countdown timers
+
+    Attributes
+    --------------
+    count : int
+        number of timers
+    changes : int
+        bumped on every set, start, pause or expiry
+    order : bytearray
+        timers listed by others()
+    """
+
+    def __init__(self, count, duration, clock = ticks_ms):
+        """
+        Parameters
+        ----------
+        count : int
+            number of timers
+        duration : int
+            initial duration of every timer, in seconds
+        clock : callable, optional
+            returns ticks in ms. Default utime.ticks_ms
+        """
+
+        self.count     = count
+        self.clock     = clock
+        self.last      = clock()
+        self.ms        = 0                   # monotonic ms since creation or the last rebase
+        self.durations = array('l', [duration] * count)
+        self.left_ms   = array('l', [duration * 1000] * count)
+        self.deadlines = array('l', [0] * count)
+        self.gens      = array('l', [0] * count)
+        self.states    = bytearray([TIMER_PAUSED] * count)
+        self.order     = bytearray(count)
+        self.heap      = []
+        self.ringing   = 0                   # timers in TIMER_FINISHED
+        self.changes   = 0
+
+
+    def now(self):
+        """
+        Returns : int
+            monotonic ms since the manager was created, or last rebased
+        """
+
+        t = self.clock()
+        self.ms += ticks_diff(t, self.last)
+        self.last = t
+
+        if self.ms >= REBASE_MS:
+            self._rebase()
+
+        return self.ms
+
+
+    def _rebase(self):
+        """Move the clock back to 0, and every deadline by as much"""
+
+        shift = self.ms
+
+        for i in range(self.count):
+            d = self.deadlines[i] - shift        # past ones only matter to follow(), just after
+            self.deadlines[i] = d if d > -REBASE_MS else -REBASE_MS
+
+        self.heap = [(d - shift, gen, i) for d, gen, i in self.heap]     # still a heap
+        self.ms   = 0
+
+
+    def state(self, i):
+        return self.states[i]
+
+
+    def left(self, i):
+        """
+        Seconds left on timer `i`, rounded up
+
+        Returns : int
+        """
+
+        if self.states[i] == TIMER_RUNNING:
+            now = self.now()                 # first: it may rebase the deadlines
+            ms  = self.deadlines[i] - now
+
+            return (ms + 999) // 1000 if ms > 0 else 0
+
+        return (self.left_ms[i] + 999) // 1000
+
+
+    def remaining_ms(self, i):
+        """
+        Milliseconds left on timer `i`
+
+        Returns : int
+        """
+
+        if self.states[i] == TIMER_RUNNING:
+            now = self.now()
+
+            return max(self.deadlines[i] - now, 0)
+
+        return self.left_ms[i]
+
+
+    def set(self, i, seconds):
+        """
+        Stop timer `i` and give it a new duration
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        seconds : int
+            duration
+        """
+
+        self._stop(i)
+        self.durations[i] = seconds
+        self.left_ms[i]   = seconds * 1000
+        self.states[i]    = TIMER_PAUSED
+        self.changes     += 1
+
+
+    def reset(self, i):
+        """Stop timer `i` and rewind it to its duration"""
+
+        self.set(i, self.durations[i])
+
+
+    def start(self, i):
+        """Start or resume timer `i`"""
+
+        if self.states[i] == TIMER_RUNNING:
+            return
+
+        self._stop(i)
+
+        deadline = self.now() + self.left_ms[i]
+
+        self.gens[i] += 1
+        self.deadlines[i] = deadline
+        self.states[i] = TIMER_RUNNING
+        self.changes += 1
+
+        heappush(self.heap, (deadline, self.gens[i], i))
+
+
+    def follow(self, i, seconds):
+        """
+        Run finished timer `i` again for `seconds`, counted from its last
+        deadline, so that timers run back to back do not drift by how
+        late each end was noticed
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        seconds : int
+            duration
+        """
+
+        self._stop(i)
+
+        deadline = self.deadlines[i] + seconds * 1000
+
+        self.durations[i] = seconds
+        self.gens[i]     += 1
+        self.deadlines[i] = deadline
+        self.states[i]    = TIMER_RUNNING
+        self.changes     += 1
+
+        heappush(self.heap, (deadline, self.gens[i], i))
+
+
+    def extend(self, i, seconds):
+        """
+        Run timer `i` for `seconds` more from now (snooze). Its duration
+        is kept, so that a reset still rewinds to the time it was set to
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        seconds : int
+            time to add
+        """
+
+        self._stop(i)
+
+        self.left_ms[i] = seconds * 1000
+        self.states[i]  = TIMER_PAUSED
+
+        self.start(i)
+
+
+    def retarget(self, i, ms):
+        """
+        Move the deadline of running timer `i` to `ms` from now
+
+        Parameters
+        ----------
+        i : int
+            timer index
+        ms : int
+            time left
+        """
+
+        if self.states[i] != TIMER_RUNNING:
+            return
+
+        deadline = self.now() + ms
+
+        self.gens[i] += 1
+        self.deadlines[i] = deadline
+        self.changes += 1
+
+        heappush(self.heap, (deadline, self.gens[i], i))
+
+
+    def pause(self, i):
+        """Pause timer `i`, keeping what is left. One already past its deadline rings instead"""
+
+        if self.states[i] != TIMER_RUNNING:
+            return
+
+        now = self.now()
+
+        if self.deadlines[i] <= now:
+            return
+
+        self.left_ms[i] = self.deadlines[i] - now
+        self.gens[i] += 1
+        self.states[i] = TIMER_PAUSED
+        self.changes += 1
+
+
+    def _stop(self, i):
+        if self.states[i] == TIMER_RUNNING:
+            self.gens[i] += 1
+        elif self.states[i] == TIMER_FINISHED:
+            self.ringing -= 1
+
+
+    def _top(self):
+        """Soonest valid heap entry, dropping stale ones"""
+
+        heap = self.heap
+
+        while heap:
+            deadline, gen, i = heap[0]
+
+            if gen == self.gens[i] and self.states[i] == TIMER_RUNNING:
+                return heap[0]
+
+            heappop(heap)
+
+        return None
+
+
+    def poll(self):
+        """
+        Mark every timer past its deadline as finished
+
+        Returns : int
+            index of a finished timer, -1 if none is ringing
+        """
+
+        now = self.now()
+        top = self._top()
+
+        if top is not None and top[0] <= now:
+            while top is not None and top[0] <= now:
+                i = top[2]
+                heappop(self.heap)
+
+                self.left_ms[i] = 0
+                self.states[i]  = TIMER_FINISHED
+                self.ringing   += 1
+                self.changes   += 1
+
+                top = self._top()
+
+        if not self.ringing:
+            return -1
+
+        for i in range(self.count):
+            if self.states[i] == TIMER_FINISHED:
+                return i
+
+        return -1
+
+
+    def wait(self, i, cap = 1000, step = 1000):
+        """
+        How long the main loop may sleep
+
+        Parameters
+        ----------
+        i : int
+            timer on display, -1 for none
+        cap : int, optional
+            longest sleep in ms
+        step : int, optional
+            display resolution of timer `i` in ms
+
+        Returns : int
+            ms until timer `i` shows a new step or the next deadline
+        """
+
+        now  = self.now()
+        wait = cap
+
+        if i >= 0 and self.states[i] == TIMER_RUNNING:
+            ms = self.deadlines[i] - now
+            wait = min(wait, ms % step or step)
+
+        top = self._top()
+
+        if top is not None:
+            wait = min(wait, top[0] - now)
+
+        return max(wait, 1)
+
+
+    def running(self):
+        """
+        Returns : bool
+            some timer is running
+        """
+
+        return self._top() is not None
+
+
+    def in_use(self, i):
+        """
+        Returns : bool
+            timer `i` is running, ringing or paused part way
+        """
+
+        return (self.states[i] != TIMER_PAUSED or
+                self.left_ms[i] != self.durations[i] * 1000)
+
+
+    def others(self, i):
+        """
+        List the timers in use other than `i` in `order`, soonest first:
+        running ones by deadline, then ringing ones, then paused ones.
+        Allocates nothing
+
+        Returns : int
+            how many, at the start of `order`
+        """
+
+        order = self.order
+        n     = 0
+
+        for j in range(self.count):
+            if j == i or not self.in_use(j):
+                continue
+
+            k = n                            # insertion sort, ties in index order
+
+            while k and self._after(order[k - 1], j):
+                order[k] = order[k - 1]
+                k       -= 1
+
+            order[k] = j
+            n       += 1
+
+        return n
+
+
+    def _after(self, a, b):
+        """
+        Returns : bool
+            timer `a` comes after timer `b` in others()
+        """
+
+        sa = self.states[a]
+        sb = self.states[b]
+
+        if sa == TIMER_RUNNING:
+            return sb == TIMER_RUNNING and self.deadlines[a] > self.deadlines[b]
+
+        return sb == TIMER_RUNNING or (sb == TIMER_FINISHED and sa != TIMER_FINISHED)
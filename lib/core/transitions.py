@@ -0,0 +1,127 @@
+"""
+transitions.py
+Transition table for the rotary events
+
+Every (event, mode, state) has one entry: the action to call, the mode
+to go to after it and the screen regions it leaves dirty. Entries sit in
+flat arrays indexed by
+
+    (event * modes + mode) * states + state
+
+so dispatching an event is one index whatever the number of transitions,
+and the whole table can be walked on the host. An entry not set on()
+does nothing.
+"""
+
+from array import array
+
+
+EV_CW      = 0                               # rotary turned clockwise
+EV_CCW     = 1                               # rotary turned counter-clockwise
+EV_SHORT   = 2                               # switch released before the long press
+EV_LONG    = 3                               # switch held for the long press
+EVENTS     = 4
+
+SAME       = -1                              # mode left as the action put it
+
+DIRTY_TIME = 1                               # the big digits
+DIRTY_AUX  = 2                               # the aux line
+DIRTY_BAR  = 4                               # the setup underline
+
+
+class Transitions:
+    """
+    State machine table
+
+    Attributes
+    --------------
+    actions : list
+        callable per entry, None for nothing
+    args : list
+        argument for the action, None to call it without one
+    to : array
+        mode after the action, SAME to keep it
+    dirty : bytearray
+        DIRTY_* flags of the regions to redraw
+    """
+
+    def __init__(self, modes, states):
+        """
+        Parameters
+        ----------
+        modes : int
+            number of app modes
+        states : int
+            number of timer states
+        """
+
+        size = EVENTS * modes * states
+
+        self.modes   = modes
+        self.states  = states
+        self.actions = [None] * size
+        self.args    = [None] * size
+        self.to      = array('b', [SAME] * size)
+        self.dirty   = bytearray(size)
+
+
+    def index(self, event, mode, state):
+        """
+        Returns : int
+            entry for `event` in `mode` and `state`
+        """
+
+        return (event * self.modes + mode) * self.states + state
+
+
+    def on(self, event, modes, states, action, arg = None, to = SAME, dirty = 0):
+        """
+        Set the entries for `event` in every mode and state given,
+        replacing what was set before
+
+        Parameters
+        ----------
+        event : int
+            EV_*
+        modes : tuple
+            app modes
+        states : tuple
+            timer states
+        action : callable
+            what to do, None for nothing
+        arg : any, optional
+            passed to `action`. Default: called without one
+        to : int, optional
+            mode afterwards. Default SAME
+        dirty : int, optional
+            DIRTY_* flags. Default 0
+        """
+
+        for mode in modes:
+            for state in states:
+                i = self.index(event, mode, state)
+
+                self.actions[i] = action
+                self.args[i]    = arg
+                self.to[i]      = to
+                self.dirty[i]   = dirty
+
+
+    def fire(self, event, mode, state):
+        """
+        Call the action for `event` in `mode` and `state`
+
+        Returns : int
+            the entry, for its `to` and `dirty`
+        """
+
+        i      = (event * self.modes + mode) * self.states + state
+        action = self.actions[i]
+
+        if action is not None:
+            if self.args[i] is None:
+                action()
+            else:
+                action(self.args[i])
+
+        return i
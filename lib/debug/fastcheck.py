@@ -0,0 +1,171 @@
+"""
+fastcheck.py
+Fast paths against their Python versions
+
+Runs every function of lib/oled/fastpath.py on every glyph of the font
+(and on a few time strings), checks that the bound version and the py_
+one both give what a plain pixel-by-pixel reference gives, and times
+them. From the REPL on the Pico:
+
+    from lib.debug.fastcheck import run
+    run()
+
+On the host (`python -m tools.fastcheck`) both sides are Python: the
+check covers the algorithms, the timings say nothing of the Pico.
+"""
+
+from utime import ticks_us, ticks_diff
+
+import lib.oled.seven_segment_48 as font
+import lib.oled.seven_segment_48_rle as packed
+
+from lib.oled import fastpath
+
+
+STRINGS = (b'00:00', b'08:00', b'12:34', b'59:59', b'99:59', b'59.9', b'00.0', b'11:11')
+
+
+def ref_truelen(glyph, ht, wd):
+    gbytes = (wd + 7) // 8
+    right  = 0
+
+    for row in range(ht):
+        for col in range(wd):
+            if glyph[row * gbytes + col // 8] & (0x80 >> (col % 8)):
+                right = max(right, col)
+
+    return right + 1
+
+
+def ref_invert(buf):
+    for i, v in enumerate(buf):
+        buf[i] = 0xFF & ~ v
+
+
+def glyphs():
+    return [font.get_ch(chr(c)) for c in range(32, 127)]
+
+
+def cases():
+    """
+    Returns : list of (str, list, callable)
+        function name, the argument tuples to call it with (for invert:
+        a glyph and a scratch copy of it) and the check of a result,
+        check(args, result) -> bool
+    """
+
+    widths = bytearray(128)
+
+    for c in range(32, 127):
+        widths[c] = font.get_ch(chr(c))[2]
+
+    digits = [font.get_ch(c) for c in '0123456789:.']
+    index  = font._index
+    data   = font._font
+
+    u16s = [(index, off) for off in range(0, len(index) - 1, 2)]
+    u16s += [(data, index[off] | index[off + 1] << 8) for off in range(0, len(index) - 2, 2)]
+
+    def u16_ok(args, got):
+        return got == int.from_bytes(bytes(args[0][args[1]:args[1] + 2]), 'little')
+
+    def truelen_ok(args, got):
+        return got == ref_truelen(*args)
+
+    def invert_ok(args, got):
+        buf = bytearray(args[0])
+        ref_invert(buf)
+
+        return got == buf
+
+    def width_ok(args, got):
+        return got == sum(font.get_ch(chr(c))[2] for c in args[0])
+
+    unpacks = []
+    want    = {}                             # packed offset -> the font's glyph
+
+    for c in range(32, 127):
+        glyph, ht, wd = font.get_ch(chr(c))
+        off           = packed._index[2 * (c - 31)] | packed._index[2 * (c - 31) + 1] << 8
+
+        want[off] = bytes(glyph)
+        unpacks.append((packed._font, off + 1, bytearray(len(glyph)), (wd + 7) // 8, ht))
+
+    def unpack_ok(args, got):
+        return bytes(got) == want[args[1] - 1]
+
+    return [
+        ('u16', u16s, u16_ok),
+        ('truelen', glyphs(), truelen_ok),
+        ('invert', [(g, bytearray(g)) for g, _, _ in digits], invert_ok),
+        ('text_width', [(s, len(s), widths) for s in STRINGS], width_ok),
+        ('unpack', unpacks, unpack_ok),
+    ]
+
+
+def call(name, func, args):
+    if name == 'invert':                     # in place, on a copy of the glyph
+        buf = bytearray(args[0])
+        func(buf)
+
+        return buf
+
+    if name == 'unpack':                     # into a fresh buffer
+        buf = bytearray(len(args[2]))
+        func(args[0], args[1], buf, args[3], args[4])
+
+        return buf
+
+    return func(*args)
+
+
+def timed(name, func, calls, repeat):
+    t0 = ticks_us()
+
+    for _ in range(repeat):
+        for args in calls:
+            if name == 'invert':             # on the scratch copy, inverted back and forth
+                func(args[1])
+            else:
+                func(*args)
+
+    return ticks_diff(ticks_us(), t0)
+
+
+def run(repeat = 10):
+    """
+    Check and time every function, and print the results
+
+    Parameters
+    ----------
+    repeat : int, optional
+        times every case is run for the timings. Default 10
+
+    Returns : bool
+        every version agreed with the reference
+    """
+
+    ok = True
+
+    print('fast paths: {}'.format('viper' if fastpath.VIPER else 'Python (no viper here)'))
+    print('{:<11} {:>5} {:>10} {:>10} {:>6}  check'.format('function', 'cases', 'py us', 'fast us', 'gain'))
+
+    for name, calls, check in cases():
+        fast  = getattr(fastpath, name)
+        py    = getattr(fastpath, 'py_' + name)
+        wrong = 0
+
+        for args in calls:
+            for func in (py, fast):
+                if not check(args, call(name, func, args)):
+                    wrong += 1
+
+        t_py   = timed(name, py, calls, repeat)
+        t_fast = timed(name, fast, calls, repeat)
+
+        print('{:<11} {:>5} {:>10} {:>10} {:>6.1f}  {}'.format(
+              name, len(calls), t_py, t_fast, t_py / max(t_fast, 1), 'ok' if not wrong else '{} WRONG'.format(wrong)))
+
+        ok = ok and not wrong
+
+    return ok
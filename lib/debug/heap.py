@@ -0,0 +1,319 @@
+"""
+heap.py
+Heap allocation profiler for the main loop
+
+Wraps the functions the loop goes through and records, for each one,
+the bytes it allocated itself (children excluded), how often it ran
+and how many garbage collections happened while it was on the stack.
+Functions are grouped in phases: power check, time update, render,
+flush and journal. A tick is one call of main.loop().
+
+The heap is read on every call and every return. Between two reads it
+only grows, unless a collection ran: then the reading drops, the
+collection is counted and the bytes of that one interval are lost.
+Where the gc module can be patched (not on the Pico), gc.collect()
+calls are counted as they happen instead. Targets missing from the
+build (no journal, say) are skipped.
+
+Enable with PROFILE_HEAP in config.py, or from the REPL / host:
+
+    from lib.debug.heap import profiler
+    profiler.instrument(vars(main))
+    ...
+    profiler.report()
+
+The wrappers themselves cost a small allocation per call (the argument
+tuple, and a dict for keywords), which lands on the caller.
+"""
+
+import gc
+
+from array import array
+
+
+# (name in main's globals, attribute or None, label, phase). Private
+# names as written: CPython mangles them, MicroPython does not
+TARGETS = (
+    ('loop',   None,                    'loop',                   'time'),
+    ('check_pwr', None,                 'check_pwr',              'power'),
+    ('timers', 'poll',                  'TimerManager.poll',      'time'),
+    ('timers', 'wait',                  'TimerManager.wait',      'time'),
+    ('timers', 'left',                  'TimerManager.left',      'time'),
+    ('timers', 'remaining_ms',          'TimerManager.remaining_ms', 'time'),
+    ('timers', 'others',                'TimerManager.others',    'time'),
+    ('programs', 'poll',                'ProgramEngine.poll',     'time'),
+    ('readyat', 'poll',                 'ReadyAt.poll',           'time'),
+    ('update_time', None,               'update_time',            'render'),
+    ('update_others', None,             'update_others',          'render'),
+    ('endloop', None,                   'endloop',                'render'),
+    ('screen', 'print_timer',           'Screen.print_timer',     'render'),
+    ('screen', '__format_time',         'Screen.__format_time',   'render'),
+    ('screen', '__get_time_len',        'Screen.__get_time_len',  'render'),
+    ('screen', 'print_others',          'Screen.print_others',    'render'),
+    ('screen', 'print_voltage',         'Screen.print_voltage',   'power'),
+    ('writer', 'printstring',           'Writer.printstring',     'render'),
+    ('writer', 'printbytes',            'Writer.printbytes',      'render'),
+    ('writer', '_printchar',            'Writer._printchar',      'render'),
+    ('writer', '_blit',                 'Writer._blit',           'render'),
+    ('ssd',    'show',                  'SSD1306.show',           'flush'),
+    ('ssd',    'show_region',           'SSD1306.show_region',    'flush'),
+    ('journal', 'poll',                 'Journal.poll',           'journal'),
+)
+
+PHASES = ('power', 'time', 'render', 'flush', 'journal')
+
+MAX_DEPTH = 16
+
+
+def _mem_alloc():
+    return gc.mem_alloc()
+
+
+def _attr(obj, name):
+    """
+    Returns : str
+        `name` as `obj` holds it, mangled on CPython, None if missing
+    """
+
+    if name.startswith('__'):
+        mangled = '_' + type(obj).__name__ + name
+
+        if hasattr(obj, mangled):
+            return mangled
+
+    return name if hasattr(obj, name) else None
+
+
+class HeapProfiler:
+    """
+    Exclusive per-function allocation counters
+
+    Attributes
+    --------------
+    ticks : int
+        completed ticks
+    warmup : int
+        ticks ignored before counting starts
+    every : int
+        print a report every `every` ticks. 0 to disable
+    collections : int
+        collections seen since the profiler was instrumented
+    """
+
+    def __init__(self, warmup = 2, every = 0):
+        self.labels      = []
+        self.phases      = []
+        self.bytes       = array('l')
+        self.calls       = array('l')
+        self.gcs         = array('l')
+        self.start       = array('l', [0] * MAX_DEPTH)   # `allocated` at every call
+        self.gc_at       = array('l', [0] * MAX_DEPTH)   # and `collections`
+        self.child       = array('l', [0] * MAX_DEPTH)
+        self.depth       = 0
+        self.last        = 0                 # heap at the last reading
+        self.allocated   = 0                 # bytes allocated, over all readings
+        self.collections = 0
+        self.ticks       = 0
+        self.warmup      = warmup
+        self.every       = every
+        self.tick_id     = -1
+
+
+    def register(self, label, phase):
+        """
+        Allocate counters for a label
+
+        Returns : int
+            the label id
+        """
+
+        self.labels.append(label)
+        self.phases.append(phase)
+        self.bytes.append(0)
+        self.calls.append(0)
+        self.gcs.append(0)
+
+        return len(self.labels) - 1
+
+
+    def read(self):
+        """
+        Read the heap and move the running counters on
+
+        Returns : int
+            bytes allocated so far
+        """
+
+        now = _mem_alloc()
+
+        if now < self.last:                  # a collection ran since the last reading
+            self.collections += 1
+        else:
+            self.allocated += now - self.last
+
+        self.last = now
+
+        return self.allocated
+
+
+    def enter(self):
+        d = self.depth
+
+        if d < MAX_DEPTH:
+            self.child[d] = 0
+            self.start[d] = self.read()
+            self.gc_at[d] = self.collections
+
+        self.depth = d + 1
+
+
+    def leave(self, id):
+        self.depth -= 1
+        d = self.depth
+
+        if d >= MAX_DEPTH:
+            return
+
+        total = self.read() - self.start[d]
+
+        self.gcs[id] += self.collections - self.gc_at[d]
+
+        if d > 0:
+            self.child[d - 1] += total
+
+        if self.ticks >= self.warmup:
+            self.bytes[id] += total - self.child[d]
+            self.calls[id] += 1
+
+        if id == self.tick_id:
+            self.ticks += 1
+
+            if self.every and self.ticks % self.every == 0:
+                self.report()
+
+
+    def wrap(self, func, label, phase):
+        """
+        Wrap a callable so its allocations are counted under `label`
+
+        Parameters
+        ----------
+        func : callable
+            function or bound method
+        label : str
+            name shown in the report
+        phase : str
+            loop phase the function belongs to
+
+        Returns : callable
+        """
+
+        id = self.register(label, phase)
+
+        if label == 'loop':
+            self.tick_id = id
+
+        def wrapped(*args, **kwargs):
+            self.enter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.leave(id)
+
+        return wrapped
+
+
+    def instrument(self, ns):
+        """
+        Wrap the main loop and the display pipeline
+
+        Parameters
+        ----------
+        ns : dict
+            main's globals (globals() from main.py, vars(main) on the host)
+        """
+
+        for name, attr, label, phase in TARGETS:
+            obj = ns.get(name)
+
+            if obj is None:
+                continue
+
+            if attr is None:
+                ns[name] = self.wrap(obj, label, phase)
+                continue
+
+            attr = _attr(obj, attr)
+
+            if attr is not None:
+                setattr(obj, attr, self.wrap(getattr(obj, attr), label, phase))
+
+        self.count_collect()
+        self.last = _mem_alloc()
+
+
+    def count_collect(self):
+        """Count gc.collect() calls, where the gc module can be patched"""
+
+        collect = getattr(gc.collect, 'collect', gc.collect)    # not a counter on a counter
+
+        def counted():
+            self.read()                      # what was allocated up to here
+            collect()
+            self.collections += 1
+            self.last = _mem_alloc()
+
+        try:
+            counted.collect = collect
+            gc.collect      = counted
+        except AttributeError:               # MicroPython: built-in, read only
+            pass
+
+
+    def reset(self):
+        """Zero every counter"""
+
+        for i in range(len(self.labels)):
+            self.bytes[i] = 0
+            self.calls[i] = 0
+            self.gcs[i]   = 0
+
+        self.ticks = 0
+
+
+    def stats(self):
+        """
+        Returns : dict
+            label -> (phase, bytes, calls, gcs)
+        """
+
+        return {
+            self.labels[i]: (self.phases[i], self.bytes[i], self.calls[i], self.gcs[i])
+            for i in range(len(self.labels))
+        }
+
+
+    def report(self):
+        """Print allocations per tick, by function and by phase"""
+
+        ticks = max(self.ticks - self.warmup, 1)
+        phases = {}
+
+        print('heap: {} ticks'.format(ticks))
+        print('{:<28}{:>8}{:>10}{:>8}{:>6}'.format('function', 'phase', 'B/tick', 'calls', 'gc'))
+
+        for i in range(len(self.labels)):
+            phase = self.phases[i]
+            phases[phase] = phases.get(phase, 0) + self.bytes[i]
+
+            print('{:<28}{:>8}{:>10}{:>8}{:>6}'.format(
+                self.labels[i], phase, self.bytes[i] // ticks, self.calls[i], self.gcs[i]))
+
+        for phase in PHASES:
+            print('{:<28}{:>18}'.format('[' + phase + ']', phases.get(phase, 0) // ticks))
+
+        print('{:<28}{:>18}'.format('[total]', sum(phases.values()) // ticks))
+
+
+profiler = HeapProfiler()
@@ -0,0 +1,199 @@
+"""
+latency.py
+Event-to-pixel latency tracing
+
+Each rotary event is stamped in the IRQ handler, then followed through
+main.rotary_changed(), the state update, the next render in Screen and
+the end of the SSD1306.show() that puts it on the panel. Latencies go
+into a fixed log2 histogram in RAM; the stages of the oldest event of
+each burst are summed separately.
+
+Enable with TRACE_LATENCY in config.py. Every hook is a single
+`is not None` test when tracing is off. To read the numbers, send 'd'
+over serial while the timer runs, or from the REPL:
+
+    from lib.debug.latency import tracer
+    tracer.dump()
+"""
+
+import sys
+
+from array import array
+from utime import ticks_us, ticks_diff
+
+
+BUCKETS = 16                                 # last bucket: 16 s and up
+STAGES  = ('irq>handler', 'handler>state', 'state>render', 'render>shown')
+
+
+class LatencyTracer:
+    """
+    Fixed-size latency histogram
+
+    Attributes
+    --------------
+    count : int
+        events measured
+    dropped : int
+        events not stamped because `depth` were already in flight
+    """
+
+    def __init__(self, depth = 8):
+        self.irqs      = array('l', [0] * depth)
+        self.pending   = 0
+        self.dropped   = 0
+        self.count     = 0
+        self.hist      = array('L', [0] * BUCKETS)
+        self.stage_sum = array('L', [0] * len(STAGES))
+        self.stage_max = array('L', [0] * len(STAGES))
+        self.bursts    = 0
+        self.poller    = None
+        self._clear()
+
+
+    def _clear(self):
+        self.pending   = 0
+        self.t_handled = -1
+        self.t_updated = -1
+        self.t_render  = -1
+
+
+    def irq(self):
+        """Rotary IRQ: an event was queued"""
+
+        if self.pending < len(self.irqs):
+            self.irqs[self.pending] = ticks_us()
+            self.pending += 1
+        else:
+            self.dropped += 1
+
+
+    def handled(self):
+        """main.rotary_changed() was entered"""
+
+        if self.pending and self.t_handled < 0:
+            self.t_handled = ticks_us()
+
+
+    def updated(self):
+        """main.rotary_changed() is done with the state"""
+
+        if self.t_handled >= 0 and self.t_updated < 0:
+            self.t_updated = ticks_us()
+
+
+    def render(self):
+        """Screen started drawing state"""
+
+        if self.t_updated >= 0 and self.t_render < 0:
+            self.t_render = ticks_us()
+
+
+    def shown(self):
+        """SSD1306.show() finished"""
+
+        if self.t_render < 0:
+            return
+
+        now = ticks_us()
+
+        for i in range(self.pending):
+            ms = ticks_diff(now, self.irqs[i]) // 1000
+            b  = 0
+
+            while ms and b < BUCKETS - 1:
+                ms >>= 1
+                b += 1
+
+            self.hist[b] += 1
+
+        self.count  += self.pending
+        self.bursts += 1
+
+        stamps = (self.irqs[0], self.t_handled, self.t_updated, self.t_render, now)
+
+        for i in range(len(STAGES)):
+            us = ticks_diff(stamps[i + 1], stamps[i])
+            self.stage_sum[i] += us
+
+            if us > self.stage_max[i]:
+                self.stage_max[i] = us
+
+        self._clear()
+
+
+    def attach(self, ns):
+        """
+        Hook the tracer into the firmware
+
+        Parameters
+        ----------
+        ns : dict
+            main's globals (globals() from main.py, vars(main) on the host)
+        """
+
+        ns['tracer'] = self
+        ns['rotary'].tracer = self
+        ns['screen'].tracer = self
+        ns['ssd'].tracer = self
+
+
+    def poll(self):
+        """Dump the histogram when 'd' arrives on serial. Call from the main loop"""
+
+        if self.poller is None:
+            try:
+                import select
+                self.poller = select.poll()
+                self.poller.register(sys.stdin, select.POLLIN)
+            except (ImportError, AttributeError, OSError, ValueError):
+                self.poller = False
+
+        if self.poller and self.poller.poll(0) and sys.stdin.read(1) == 'd':
+            self.dump()
+
+
+    def reset(self):
+        """Forget everything measured so far"""
+
+        for i in range(BUCKETS):
+            self.hist[i] = 0
+
+        for i in range(len(STAGES)):
+            self.stage_sum[i] = 0
+            self.stage_max[i] = 0
+
+        self.count   = 0
+        self.bursts  = 0
+        self.dropped = 0
+        self._clear()
+
+
+    def dump(self):
+        """Print the histogram and the stage breakdown"""
+
+        print('latency: {} events, {} dropped'.format(self.count, self.dropped))
+
+        lo = 0
+
+        for b in range(BUCKETS):
+            hi = 1 << b
+
+            if self.hist[b]:
+                if b == BUCKETS - 1:
+                    label = '>= {} ms'.format(lo)
+                else:
+                    label = '{}-{} ms'.format(lo, hi - 1) if hi - 1 > lo else '{} ms'.format(lo)
+
+                print('{:>16} {}'.format(label, self.hist[b]))
+
+            lo = hi
+
+        bursts = max(self.bursts, 1)
+
+        for i in range(len(STAGES)):
+            print('{:>16} mean {} us, max {} us'.format(
+                STAGES[i], self.stage_sum[i] // bursts, self.stage_max[i]))
+
+
+tracer = LatencyTracer()
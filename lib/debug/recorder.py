@@ -0,0 +1,185 @@
+"""
+recorder.py
+Record rotary events and ADC readings to a compact binary log
+
+Log layout: the 4-byte magic b'KTR1', then 5-byte records
+
+    <H dt> <B kind> <H value>        little endian
+
+dt is the number of ms since the previous record (since the recorder
+was created, for the first one). kind is one of the
+Rotary event constants (value 0), KIND_VIN / KIND_VSYS for a battery
+or Vsys reading (value is the raw u16), or KIND_WAIT to carry gaps
+longer than 65535 ms. ADC readings are only written when they move by
+more than `adc_delta`.
+
+Records collect in a RAM buffer and are appended to the file when it
+fills up or on flush(). Enable with RECORD_INPUT in config.py, then
+call recorder.flush() from the REPL before pulling the file.
+"""
+
+import struct
+
+from utime import ticks_ms, ticks_diff
+
+
+MAGIC     = b'KTR1'
+RECORD    = 5
+
+KIND_WAIT = 0
+KIND_VIN  = 0x20
+KIND_VSYS = 0x21
+
+MAX_DT    = 0xFFFF
+
+
+class RecordedADC:
+    """
+    ADC proxy that logs readings through the recorder
+
+    Parameters
+    ----------
+    adc : machine.ADC
+        the real converter
+    kind : int
+        KIND_VIN or KIND_VSYS
+    recorder : Recorder
+        where readings go
+    """
+
+    def __init__(self, adc, kind, recorder):
+        self.adc      = adc
+        self.kind     = kind
+        self.recorder = recorder
+        self.last     = -0x10000
+
+
+    def read_u16(self):
+        raw = self.adc.read_u16()
+
+        if abs(raw - self.last) > self.recorder.adc_delta:
+            self.last = raw
+            self.recorder.record(self.kind, raw)
+
+        return raw
+
+
+class Recorder:
+    """
+    Timestamped input log
+
+    Attributes
+    --------------
+    path : str
+        log file on the Pico filesystem
+    adc_delta : int
+        smallest raw ADC change worth a record
+    """
+
+    def __init__(self, path = 'input.log', size = 256, adc_delta = 64):
+        self.path      = path
+        self.adc_delta = adc_delta
+        self.buf       = bytearray(size * RECORD)
+        self.pos       = 0
+        self.last      = ticks_ms()          # first record is stamped from here
+        self.started   = False
+
+
+    def record(self, kind, value = 0):
+        """
+        Append a record stamped with the current ticks_ms()
+
+        Parameters
+        ----------
+        kind : int
+            record kind
+        value : int, optional
+            payload (raw ADC reading)
+        """
+
+        now = ticks_ms()
+        dt  = ticks_diff(now, self.last)
+
+        self.last = now
+
+        while dt > MAX_DT:
+            self._put(MAX_DT, KIND_WAIT, 0)
+            dt -= MAX_DT
+
+        self._put(dt, kind, value)
+
+
+    def on_event(self, event):
+        """Rotary handler"""
+
+        self.record(event)
+
+
+    def _put(self, dt, kind, value):
+        if self.pos + RECORD > len(self.buf):
+            self.flush()
+
+        struct.pack_into('<HBH', self.buf, self.pos, dt, kind, value)
+        self.pos += RECORD
+
+
+    def flush(self):
+        """Append buffered records to the log file"""
+
+        mode = 'ab' if self.started else 'wb'
+
+        with open(self.path, mode) as f:
+            if not self.started:
+                f.write(MAGIC)
+
+            f.write(memoryview(self.buf)[:self.pos])
+
+        self.started = True
+        self.pos = 0
+
+
+    def instrument(self, ns):
+        """
+        Hook the rotary encoder and the power ADCs
+
+        Parameters
+        ----------
+        ns : dict
+            main's globals (globals() from main.py, vars(main) on the host)
+        """
+
+        ns['rotary'].handlers.insert(0, self.on_event)
+        ns['Vin']  = RecordedADC(ns['Vin'], KIND_VIN, self)
+        ns['Vsys'] = RecordedADC(ns['Vsys'], KIND_VSYS, self)
+
+
+def read_log(data):
+    """
+    Decode a log
+
+    Parameters
+    ----------
+    data : bytes
+        file contents
+
+    Returns : list of (ms, kind, value)
+        times relative to when the recorder started
+    """
+
+    if data[:4] != MAGIC:
+        raise ValueError('not an input log')
+
+    events = []
+    t = 0
+
+    for pos in range(4, len(data) - RECORD + 1, RECORD):
+        dt, kind, value = struct.unpack_from('<HBH', data, pos)
+        t += dt
+
+        if kind != KIND_WAIT:
+            events.append((t, kind, value))
+
+    return events
+
+
+recorder = Recorder()
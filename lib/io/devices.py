@@ -0,0 +1,78 @@
+"""
+devices.py
+Lazy registry of the board's peripherals
+
+A peripheral is registered with the function that sets it up, and set
+up the first time it is looked up on the registry. It then becomes a
+plain attribute, so later lookups cost no more than any other. Every
+set-up is logged with the time it took, along with the marks the boot
+path leaves on the way, for a boot-time breakdown.
+"""
+
+from utime import ticks_us, ticks_diff
+
+
+class Devices:
+    """
+    Peripherals, set up on first use
+
+    Attributes
+    --------------
+    log : list of (str, int, int)
+        set-ups and marks in order: label, us since the registry was
+        created when it was done, us it took (-1 for a mark)
+    """
+
+    def __init__(self):
+        self.makers = {}
+        self.start  = ticks_us()
+        self.log    = []
+
+
+    def add(self, name, maker):
+        """
+        Register a peripheral
+
+        Parameters
+        ----------
+        name : str
+            attribute it is looked up as
+        maker : callable
+            sets it up and returns it
+        """
+
+        self.makers[name] = maker
+
+
+    def __getattr__(self, name):
+        maker = self.makers.get(name)
+
+        if maker is None:
+            raise AttributeError(name)
+
+        t0     = ticks_us()
+        device = maker()                     # another device it needs is logged, and counted, first
+
+        setattr(self, name, device)
+        self._log(name, ticks_diff(ticks_us(), t0))
+
+        return device
+
+
+    def mark(self, label):
+        """Log a point on the boot path"""
+
+        self._log(label, -1)
+
+
+    def _log(self, label, took):
+        self.log.append((label, ticks_diff(ticks_us(), self.start), took))
+
+
+    def report(self):
+        """Print the boot-time breakdown"""
+
+        print('boot        at us    took us')
+
+        for label, at, took in self.log:
+            print('{:<10} {:>8} {:>10}'.format(label, at, took if took >= 0 else ''))
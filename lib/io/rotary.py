@@ -18,6 +18,8 @@ class Rotary:
         state for switch pressed
     SW_RELEASE : int
         state for switch released
+    tracer : LatencyTracer
+        stamps events when latency tracing is on. Default None
 
     Methods
     --------------
@@ -36,6 +38,8 @@ class Rotary:
     SW_PRESS    = 4
     SW_RELEASE  = 8
 
+    tracer      = None
+
     def __init__(self, dt, clk, sw):
         """
         Instantiate class; Register IRQ handlers
@@ -87,8 +91,14 @@ class Rotary:
         transition = (self.last_status << 2) | new_status
 
         if transition == 0b1110:
+            if self.tracer is not None:
+                self.tracer.irq()
+
             micropython.schedule(self.call_handlers, Rotary.ROT_CW)
         elif transition == 0b1101:
+            if self.tracer is not None:
+                self.tracer.irq()
+
             micropython.schedule(self.call_handlers, Rotary.ROT_CCW)
 
         self.last_status = new_status
@@ -114,6 +124,9 @@ class Rotary:
 
         self.last_button_status = self.sw_pin.value()
 
+        if self.tracer is not None:
+            self.tracer.irq()
+
         if self.sw_pin.value():
             micropython.schedule(self.call_handlers, Rotary.SW_RELEASE)
         else:
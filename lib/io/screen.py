@@ -1,27 +1,13 @@
-from config import WIDTH, BAR_WIDTH, BAR_THICKNESS
-from utime import sleep_ms
+from config import WIDTH, BAR_WIDTH, BAR_THICKNESS, BLINK_MS
+from utime import ticks_ms, ticks_add, ticks_diff
+from lib.oled.fastpath import text_width
+from lib.io.timefmt import mmss, sst
 
 class Screen:
     """
     A handy class to unclutter main from display stuff
     """
 
-    # most used characters lengths in pixels
-    char_lens = {
-        ':': 3,
-        '0': 9,
-        '1': 3,
-        '2': 9,
-        '3': 8,
-        '4': 9,
-        '5': 9,
-        '6': 9,
-        '7': 8,
-        '8': 9,
-        '9': 9
-    }
-
-
     def __init__(self, ssd, writer, rotate = False):
         """
         Init class
@@ -41,6 +27,26 @@ class Screen:
         self.timer_y      = 16               # default Y position for timer
         self.set_y        = 0                # default Y position for setup
         self.pwr_scr_line = 0                # ssd Y pos power supply indicator
+        self.blinking     = False            # finished message is blinking
+        self.blink_on     = False            # display is currently on
+        self.blink_at     = 0                # ticks_ms of the next blink toggle
+        self.tracer       = None             # latency tracer, if tracing
+        self.digits       = bytearray(5)     # time to draw, ASCII, from __format_time()
+        self.shown        = bytearray(5)     # time drawn by __print_diff()
+        self.shown_len    = 0                # and its length, 0 if anything else was drawn
+        self.shown_x      = 0                # x of its first glyph
+        self.shown_end    = 0                # x after its last glyph
+        self.shown_pwr    = None             # power text in the aux line, None if anything else
+        self.synced       = False            # the panel shows the whole buffer
+
+        self.widths, self.blank = writer.metrics()   # by character code: advance, blank columns on the right
+
+        x             = self.__centre_x(b"00:00", 5)
+        pair          = self.__get_time_len(b"00", 2)
+        self.mmss_x   = x                    # MM:SS drawn in place, by __print_diff()
+        self.sst_x    = self.__centre_x(b"00.0", 4)
+        self.bar_x    = (x + (pair - BAR_WIDTH) // 2,        # setup bars centred under the digit pairs
+                         x + text_width(b"00:", 3, self.widths) + (pair - BAR_WIDTH) // 2)
 
         if rotate:
             self.rotate()
@@ -64,7 +70,8 @@ class Screen:
         """
 
         self.ssd.fill_rect(0, self.timer_y, WIDTH, self.set_y, 0)
-        self.ssd.show()
+        self.__show()
+        self.shown_len = 0
 
 
     def clear_all(self):
@@ -73,6 +80,9 @@ class Screen:
         """
 
         self.ssd.fill(0)
+        self.shown_len = 0
+        self.shown_pwr = None
+        self.synced    = False
 
 
     def clear_underline(self):
@@ -80,11 +90,14 @@ class Screen:
         Clear auxiliary (yellow) area
         """
 
+        if self.tracer is not None:
+            self.tracer.render()
+
         self.ssd.fill_rect(0, self.set_y, WIDTH, BAR_THICKNESS, 0)
-        self.ssd.show()
+        self.__show()
 
 
-    def print_timer(self, el_timo):
+    def print_timer(self, el_timo, tenths = -1, clear = False):
         """
         Print the actual timer
 
@@ -92,16 +105,30 @@ class Screen:
         ----------
         el_timo : int
             the time to print in seconds
+        tenths : int, optional
+            tenths of a second, for a time that counts: SS.t under a
+            minute, then MM:SS, either one redrawn where it changed
+        clear : bool, optional
+            clear the timer area first
         """
 
-        ms           = self.__get_str_time(el_timo)
-        str_time     = ms[0] + ":" + ms[1]
-        str_time_len = self.__get_time_len(str_time)
-        x_pos        = (64 - str_time_len) / 2
+        if self.tracer is not None:
+            self.tracer.render()
 
-        self.writer.set_textpos(self.ssd, self.timer_y, int(x_pos))
-        self.writer.printstring(str_time)
-        self.ssd.show()
+        n = self.__format_time(el_timo, tenths)
+
+        if tenths >= 0:
+            self.__print_diff(n, self.sst_x if n == 4 else self.mmss_x)
+            return
+
+        self.shown_len = 0
+
+        if clear:
+            self.ssd.fill_rect(0, self.timer_y, WIDTH, self.writer.height, 0)
+
+        self.writer.set_textpos(self.ssd, self.timer_y, self.__centre_x(self.digits, n))
+        self.writer.printbytes(self.digits, 0, n)
+        self.__show()
 
 
     def set_minutes(self):
@@ -109,9 +136,12 @@ class Screen:
         Draw a bar under(if rotated)/above minutes in aux display area
         """
 
+        if self.tracer is not None:
+            self.tracer.render()
+
         self.clear_underline()
-        self.ssd.fill_rect(14, self.set_y, BAR_WIDTH, BAR_THICKNESS, 1)
-        self.ssd.show()
+        self.ssd.fill_rect(self.bar_x[0], self.set_y, BAR_WIDTH, BAR_THICKNESS, 1)
+        self.__show()
 
 
     def set_seconds(self):
@@ -119,9 +149,12 @@ class Screen:
         Draw a bar under(if rotated)/above seconds in aux display area
         """
 
+        if self.tracer is not None:
+            self.tracer.render()
+
         self.clear_underline()
-        self.ssd.fill_rect(74, self.set_y, BAR_WIDTH, BAR_THICKNESS, 1)
-        self.ssd.show()
+        self.ssd.fill_rect(self.bar_x[1], self.set_y, BAR_WIDTH, BAR_THICKNESS, 1)
+        self.__show()
 
 
     def print_voltage(self, v, is_usb = False, percentile = 0):
@@ -148,30 +181,339 @@ class Screen:
                     percentile = 100
                 txt += " (" + str("{:d}".format(percentile)) + "%)"
 
+        if txt == self.shown_pwr:
+            return
+
         self.__clear_aux()
         self.ssd.text(txt, 0, self.pwr_scr_line)
-        self.ssd.show()
+        self.__show_aux()
+        self.shown_pwr = txt
+
+
+    def print_others(self, selected, times, count):
+        """
+        Print the selected timer number and the other timers, compact
+
+        Parameters
+        ----------
+        selected : int
+            index of the timer on display
+        times : array
+            seconds left on the other timers, soonest first. Two fit
+        count : int
+            other timers, at the start of `times`
+        """
+
+        txt = str(selected + 1) + "|"
+
+        for k in range(min(count, 2)):
+            ms = self.__get_str_time(times[k])
+            txt += ms[0] + ":" + ms[1] + " "
+
+        if count > 2:
+            txt += "+" + str(count - 2)
+
+        self.__clear_aux()
+        self.ssd.text(txt, 0, self.pwr_scr_line)
+        self.__show_aux()
+
+
+    def print_program(self, name, stage, stages):
+        """
+        Print the program on the timer in the aux line
+
+        Parameters
+        ----------
+        name : str
+            program name, None for a plain timer
+        stage : int
+            stage running, counting from 0. -1 while picking
+        stages : int
+            number of stages
+        """
+
+        if name is None:
+            name = "MANUAL"
+
+        if stage < 0:
+            txt = "< " + name + " >"
+        else:
+            txt = name + " " + str(stage + 1) + "/" + str(stages)
+
+        self.__clear_aux()
+        self.ssd.text(txt, 0, self.pwr_scr_line)
+        self.__show_aux()
+
+
+    def print_preset(self, name):
+        """
+        Print the preset menu entry in the aux line
+
+        Parameters
+        ----------
+        name : str
+            preset name, None for the save entry
+        """
+
+        if name is None:
+            name = "SAVE"
+
+        self.__clear_aux()
+        self.ssd.text("< " + name + " >", 0, self.pwr_scr_line)
+        self.__show_aux()
+
+
+    def print_ready(self, target, minutes = -1):
+        """
+        Print a "ready at" time in the aux line
+
+        Parameters
+        ----------
+        target : int
+            minutes since midnight
+        minutes : int, optional
+            minutes from now, while setting it. Default: not shown
+        """
+
+        if minutes < 0:
+            ms  = self.__get_str_time(target)
+            txt = "READY AT " + ms[0] + ":" + ms[1]
+        else:
+            txt = "READY AT +" + str(minutes) + "MIN"
+
+        self.__clear_aux()
+        self.ssd.text(txt, 0, self.pwr_scr_line)
+        self.__show_aux()
+
+
+    def print_lap(self, lap, split):
+        """
+        Print the last stopwatch lap in the aux line
+
+        Parameters
+        ----------
+        lap : int
+            lap number, 0 for none yet
+        split : int
+            lap time in tenths of a second
+        """
+
+        if lap:
+            ms  = self.__get_str_time(split // 10)
+            txt = "LAP " + str(lap) + " " + ms[0] + ":" + ms[1] + "." + str(split % 10)
+        else:
+            txt = "STOPWATCH"
+
+        self.__clear_aux()
+        self.ssd.text(txt, 0, self.pwr_scr_line)
+        self.__show_aux()
 
 
     def end_msg(self):
         """
         Print a flashy message when timer is done
+
+        The message is drawn once; after that the blink is done by switching
+        the panel on and off, which costs a single command instead of a
+        full frame transfer. Does not wait for the next blink: the main
+        loop calls it and sleeps blink_wait() in between. The alarm the
+        caller plays when it returns True does block, for the length of
+        the tone.
+
+        Returns : bool
+            True when the message has just (re)appeared
         """
 
-        self.writer.set_textpos(self.ssd, self.timer_y, 9)
-        self.writer.printstring("00:00")
-        self.ssd.show()
+        now = ticks_ms()
+
+        if not self.blinking:
+            if self.tracer is not None:
+                self.tracer.render()
+
+            self.clear_all()
+            self.writer.set_textpos(self.ssd, self.timer_y, self.mmss_x)
+            self.writer.printbytes(self.digits, 0, self.__format_time(0))
+            self.__show()
+            self.__keep(5, self.mmss_x)
+
+            self.blinking = True
+            self.blink_on = True
+            self.blink_at = ticks_add(now, BLINK_MS)
+
+            return True
+
+        if ticks_diff(now, self.blink_at) < 0:
+            return False
+
+        self.blink_on = not self.blink_on
+        self.blink_at = ticks_add(self.blink_at, BLINK_MS)
+
+        if self.blink_on:
+            self.ssd.poweron()
+        else:
+            self.ssd.poweroff()
+
+        return self.blink_on
+
+
+    def blink_wait(self):
+        """
+        Returns : int
+            ms until end_msg() has a blink to do, 0 if it is due
+        """
+
+        return max(ticks_diff(self.blink_at, ticks_ms()), 0)
+
+
+    def restart(self, el_timo):
+        """
+        Leave the finished message for a new countdown: the panel is
+        turned back on and only the digits that differ from 00:00 are
+        redrawn and sent
 
-        sleep_ms(500)
+        Parameters
+        ----------
+        el_timo : int
+            the time to print in seconds
+        """
 
+        if self.tracer is not None:
+            self.tracer.render()
+
+        self.blinking = False
+        self.blink_on = False
+        self.ssd.poweron()
+
+        self.__print_diff(self.__format_time(el_timo), self.mmss_x)
+
+
+    def stop_blink(self):
+        """
+        Stop blinking the finished message and turn the panel back on
+        """
+
+        if not self.blinking:
+            return
+
+        self.blinking = False
+        self.blink_on = False
+        self.ssd.poweron()
         self.clear_all()
+
+
+    def __show(self):
+        """Send the whole buffer to the panel"""
+
         self.ssd.show()
+        self.synced = True
+
+
+    def __show_aux(self):
+        """Send the aux line, or the whole buffer if more than that changed"""
+
+        if not self.synced:
+            self.__show()
+            return
+
+        self.ssd.show_region(
+            0,
+            self.ssd.width - 1,
+            self.pwr_scr_line // 8,
+            (self.pwr_scr_line + 16 - BAR_THICKNESS - 1) // 8)
 
 
     def __clear_aux(self):
         """Clear Auxiliary (yellow) area"""
 
         self.ssd.fill_rect(0, self.pwr_scr_line, WIDTH, 16 - BAR_THICKNESS, 0)
+        self.shown_pwr = None
+
+
+    def __print_diff(self, n, x):
+        """
+        Print the time in `digits` at a fixed position, redrawing and
+        sending only the glyphs that changed since the last call
+
+        Parameters
+        ----------
+        n : int
+            length of the time in `digits`
+        x : int
+            where its first glyph goes
+        """
+
+        new    = self.digits
+        old    = self.shown
+        height = self.writer.height
+        left   = x
+        i      = 0
+
+        if self.shown_len == 0 or x != self.shown_x:
+            x0, old_end = 0, WIDTH           # clear and send the whole band
+            cut         = 0
+        else:
+            while i < n and i < self.shown_len and new[i] == old[i]:
+                x += self.widths[new[i]]
+                i += 1
+
+            if i == n and n == self.shown_len:
+                return
+
+            x0, old_end = x, self.shown_end
+
+            self.writer.set_textpos(self.ssd, self.timer_y, x)
+
+            while i < n and n == self.shown_len and self.writer.redraw(old[i], new[i]):
+                x += self.widths[new[i]]     # changed bar by bar, where the renderer can
+                i += 1
+
+            cut = x
+
+        self.ssd.fill_rect(cut, self.timer_y, old_end - cut, height, 0)
+        self.writer.set_textpos(self.ssd, self.timer_y, x)
+        self.writer.printbytes(new, i, n)
+        self.__keep(n, left)
+
+        self.ssd.show_region(
+            x0,
+            max(old_end, self.shown_end) - 1,
+            self.timer_y // 8,
+            (self.timer_y + height - 1) // 8)
+
+
+    def __keep(self, n, x):
+        """
+        Remember the time in `digits`, just drawn at `x`, as the one on
+        display for __print_diff()
+        """
+
+        self.digits, self.shown = self.shown, self.digits
+
+        self.shown_len = n
+        self.shown_x   = x
+        self.shown_end = self.writer.set_textpos(self.ssd)[1]
+
+
+    def __format_time(self, el_timo, tenths = -1):
+        """
+        Write the time into `digits`, as MM:SS or, under a minute with
+        tenths, SS.t. Nothing is allocated
+
+        Parameters
+        ----------
+        el_timo : int
+            the time in seconds
+        tenths : int, optional
+            tenths of a second. Default: MM:SS whatever the time
+
+        Returns : int
+            length of the time written
+        """
+
+        if 0 <= tenths and el_timo < 60:
+            return sst(self.digits, el_timo, tenths)
+
+        return mmss(self.digits, el_timo)
 
 
     def __get_str_time(self, el_timo):
@@ -190,7 +532,7 @@ class Screen:
         if seconds < 10:
             str_sec = '0' + str_sec
 
-        minutes = int((el_timo - seconds) / 60)
+        minutes = el_timo // 60
         str_min = str(minutes)
 
         if minutes < 10:
@@ -199,19 +541,26 @@ class Screen:
         return str_min, str_sec
 
 
-    def __get_time_len(self, el_timo_stringo):
+    def __get_time_len(self, el_timo_stringo, n):
         """
-        Calculate the length in pixels of a given string
+        Calculate the length in pixels of a given string, up to the last
+        lit column of its last glyph
 
         Parameters
         ----------
-        el_timo_stringo : str
-            the string to analyse
+        el_timo_stringo : bytes
+            the string to analyse, ASCII
+        n : int
+            its length
         """
 
-        len = 0
+        return text_width(el_timo_stringo, n, self.widths) - self.blank[el_timo_stringo[n - 1]]
+
 
-        for c in el_timo_stringo:
-            len += Screen.char_lens[c]
+    def __centre_x(self, el_timo_stringo, n):
+        """
+        Returns : int
+            x of the first glyph to centre the string on the display
+        """
 
-        return len
+        return (WIDTH - self.__get_time_len(el_timo_stringo, n)) // 2
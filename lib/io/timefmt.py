@@ -0,0 +1,69 @@
+"""
+timefmt.py
+Times as ASCII digits in a caller's buffer, without allocating
+
+PAIRS holds the two digits of 00 to 99. A time is an integer division,
+a modulo and byte stores from the table into a bytearray the caller
+keeps, which Writer.printbytes() draws as it is: no str is made and
+nothing lands on the heap.
+"""
+
+PAIRS = bytearray(200)                       # "00" .. "99", two ASCII digits each
+
+for _n in range(100):
+    PAIRS[2 * _n]     = 48 + _n // 10
+    PAIRS[2 * _n + 1] = 48 + _n % 10
+
+
+def mmss(buf, seconds):
+    """
+    Write MM:SS
+
+    Parameters
+    ----------
+    buf : bytearray
+        5 bytes at least
+    seconds : int
+        0 to 99 * 60 + 59
+
+    Returns : int
+        5, the bytes written
+    """
+
+    m = 2 * (seconds // 60)
+    s = 2 * (seconds % 60)
+
+    buf[0] = PAIRS[m]
+    buf[1] = PAIRS[m + 1]
+    buf[2] = 58                              # ':'
+    buf[3] = PAIRS[s]
+    buf[4] = PAIRS[s + 1]
+
+    return 5
+
+
+def sst(buf, seconds, tenths):
+    """
+    Write SS.t
+
+    Parameters
+    ----------
+    buf : bytearray
+        4 bytes at least
+    seconds : int
+        0 to 59
+    tenths : int
+        0 to 9
+
+    Returns : int
+        4, the bytes written
+    """
+
+    s = 2 * seconds
+
+    buf[0] = PAIRS[s]
+    buf[1] = PAIRS[s + 1]
+    buf[2] = 46                              # '.'
+    buf[3] = 48 + tenths
+
+    return 4
@@ -0,0 +1,133 @@
+"""
+capture.py
+Encode an SSD1306 frame (MONO_VLSB buffer) as PBM or PNG
+
+By default images are oriented as the buffer is drawn, which is how
+the reader sees them: Screen(rotate = True) is for a panel mounted
+upside down, turned back by the controller. `flipped` applies that
+180º turn to get the panel's native orientation instead. Lit pixels
+come out white on black. The PNG encoder is plain Python: a 1-bit greyscale
+image in stored (uncompressed) deflate blocks.
+"""
+
+import struct
+
+
+def _rows(buf, width, height, flipped, lit):
+    """
+    Yield each image row packed 8 pixels per byte, MSB on the left
+
+    Parameters
+    ----------
+    buf : bytes
+        MONO_VLSB frame
+    width : int
+        frame width
+    height : int
+        frame height
+    flipped : bool
+        turn the frame by 180º
+    lit : int
+        bit value for a lit pixel
+    """
+
+    stride = (width + 7) // 8
+
+    for y in range(height):
+        sy = height - 1 - y if flipped else y
+        base = (sy >> 3) * width
+        bit = 1 << (sy & 7)
+        row = bytearray(stride)
+
+        for x in range(width):
+            sx = width - 1 - x if flipped else x
+            on = 1 if buf[base + sx] & bit else 0
+
+            if on == lit:
+                row[x >> 3] |= 0x80 >> (x & 7)
+
+        yield row
+
+
+def pbm(buf, width, height, flipped = False):
+    """
+    Returns : bytes
+        binary PBM (P4) image
+    """
+
+    out = bytearray('P4\n{} {}\n'.format(width, height).encode())
+
+    # PBM: 1 is black
+    for row in _rows(buf, width, height, flipped, 0):
+        out += row
+
+    return bytes(out)
+
+
+_CRC_TABLE = (
+    0x00000000, 0x1DB71064, 0x3B6E20C8, 0x26D930AC,
+    0x76DC4190, 0x6B6B51F4, 0x4DB26158, 0x5005713C,
+    0xEDB88320, 0xF00F9344, 0xD6D6A3E8, 0xCB61B38C,
+    0x9B64C2B0, 0x86D3D2D4, 0xA00AE278, 0xBDBDF21C,
+)
+
+
+def _crc32(data, crc = 0):
+    crc ^= 0xFFFFFFFF
+
+    for b in data:
+        crc ^= b
+        crc = (crc >> 4) ^ _CRC_TABLE[crc & 0x0F]
+        crc = (crc >> 4) ^ _CRC_TABLE[crc & 0x0F]
+
+    return crc ^ 0xFFFFFFFF
+
+
+def _adler32(data):
+    a, b = 1, 0
+
+    for c in data:
+        a = (a + c) % 65521
+        b = (b + a) % 65521
+
+    return (b << 16) | a
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data +
+            struct.pack('>I', _crc32(data, _crc32(kind))))
+
+
+def png(buf, width, height, flipped = False):
+    """
+    Returns : bytes
+        PNG image, 1-bit greyscale
+    """
+
+    raw = bytearray()
+
+    for row in _rows(buf, width, height, flipped, 1):
+        raw.append(0)                        # filter: none
+        raw += row
+
+    z = bytearray(b'\x78\x01')
+    pos = 0
+
+    while True:
+        block = raw[pos:pos + 0xFFFF]
+        pos += len(block)
+        final = 1 if pos >= len(raw) else 0
+
+        z.append(final)
+        z += struct.pack('<HH', len(block), len(block) ^ 0xFFFF)
+        z += block
+
+        if final:
+            break
+
+    z += struct.pack('>I', _adler32(raw))
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)) +
+            _chunk(b'IDAT', bytes(z)) +
+            _chunk(b'IEND', b''))
@@ -0,0 +1,155 @@
+"""
+fastpath.py
+Byte loops of the rendering path, with a machine-code version on the Pico
+
+Every function below has a plain Python version, py_<name>, and is
+bound to the viper one from fastpath_viper.py when that can be imported:
+on MicroPython with the native emitter. On the host, or a port built
+without it, the Python versions are used. Both give the same results;
+lib/debug/fastcheck.py checks it on every glyph of the font, and times
+them.
+"""
+
+
+def py_u16(buf, off):
+    """
+    Returns : int
+        little-endian 16 bit word at `off` in `buf`
+    """
+
+    return buf[off] | (buf[off + 1] << 8)
+
+
+def py_truelen(glyph, ht, wd):
+    """
+    Printable width of a horizontally mapped glyph, less the blank
+    columns on its right
+
+    Parameters
+    ----------
+    glyph : buffer
+        rows of (wd + 7) // 8 bytes, leftmost column in the MSB
+    ht : int
+        rows
+    wd : int
+        columns
+
+    Returns : int
+        rightmost lit column + 1, 1 for a blank glyph
+    """
+
+    gbytes = (wd + 7) >> 3
+    end    = ht * gbytes
+    gbyte  = gbytes - 1
+    mask   = (0xFF00 >> (wd - (gbyte << 3))) & 0xFF   # padding columns of the last byte
+
+    while gbyte >= 0:                        # a byte column at a time, from the right
+        bits = 0
+
+        for i in range(gbyte, end, gbytes):
+            bits |= glyph[i]
+
+        bits &= mask
+
+        if bits:
+            col = (gbyte << 3) + 7
+
+            while not bits & 1:
+                bits >>= 1
+                col  -= 1
+
+            return col + 1
+
+        gbyte -= 1
+        mask   = 0xFF
+
+    return 1
+
+
+def py_invert(buf):
+    """Invert every byte of `buf`, in place"""
+
+    for i in range(len(buf)):
+        buf[i] ^= 0xFF
+
+
+def py_text_width(text, n, widths):
+    """
+    Parameters
+    ----------
+    text : bytes
+        ASCII codes
+    n : int
+        codes of `text` to measure, from the first
+    widths : bytearray
+        width in pixels of every character code
+
+    Returns : int
+        width of text[:n] in pixels
+    """
+
+    width = 0
+
+    for i in range(n):
+        width += widths[text[i]]
+
+    return width
+
+
+def py_unpack(src, off, dst, gbytes, rows):
+    """
+    Decode the row runs of a packed glyph (lib/oled/packedfont.py)
+
+    Parameters
+    ----------
+    src : buffer
+        packed font
+    off : int
+        first run of the glyph in `src`
+    dst : bytearray
+        rows * gbytes bytes at least, overwritten
+    gbytes : int
+        bytes per row
+    rows : int
+        rows of the glyph
+
+    Returns : int
+        offset in `src` after the glyph
+    """
+
+    o   = 0
+    end = rows * gbytes
+
+    while o < end:
+        n    = src[off]
+        off += 1
+
+        if n & 0x80:                         # n & 0x7F blank rows, no row bytes
+            for i in range(o, o + (n & 0x7F) * gbytes):
+                dst[i] = 0
+
+            o += (n & 0x7F) * gbytes
+        else:                                # the row that follows, n times
+            for _ in range(n):
+                for k in range(gbytes):
+                    dst[o + k] = src[off + k]
+
+                o += gbytes
+
+            off += gbytes
+
+    return off
+
+
+try:
+    from lib.oled.fastpath_viper import u16, truelen, invert, text_width, unpack
+
+    VIPER = True
+except (ImportError, SyntaxError, ValueError):  # host, no native emitter, or a .mpy for another arch
+    u16        = py_u16
+    truelen    = py_truelen
+    invert     = py_invert
+    text_width = py_text_width
+    unpack     = py_unpack
+
+    VIPER = False
@@ -0,0 +1,112 @@
+"""
+fastpath_viper.py
+Viper versions of the fastpath.py functions
+
+Imported by fastpath.py only. Same arguments and results as the py_
+versions there; the loops run on raw pointers, as machine code.
+"""
+
+import sys
+
+if sys.implementation.name != 'micropython':
+    raise ImportError('viper needs MicroPython')
+
+import micropython
+
+
+@micropython.viper
+def u16(buf, off: int) -> int:
+    p = ptr8(buf)
+
+    return p[off] | (p[off + 1] << 8)
+
+
+@micropython.viper
+def truelen(glyph, ht: int, wd: int) -> int:
+    g      = ptr8(glyph)
+    gbytes = (wd + 7) >> 3
+    end    = ht * gbytes
+    gbyte  = gbytes - 1
+    mask   = (0xFF00 >> (wd - (gbyte << 3))) & 0xFF
+
+    while gbyte >= 0:
+        bits = 0
+        i    = gbyte
+
+        while i < end:
+            bits |= g[i]
+            i    += gbytes
+
+        bits &= mask
+
+        if bits:
+            col = (gbyte << 3) + 7
+
+            while (bits & 1) == 0:
+                bits >>= 1
+                col  -= 1
+
+            return col + 1
+
+        gbyte -= 1
+        mask   = 0xFF
+
+    return 1
+
+
+@micropython.viper
+def invert(buf):
+    p = ptr8(buf)
+    n = int(len(buf))
+    i = 0
+
+    while i < n:
+        p[i] = p[i] ^ 0xFF
+        i   += 1
+
+
+@micropython.viper
+def text_width(text, n: int, widths) -> int:
+    s     = ptr8(text)
+    w     = ptr8(widths)
+    width = 0
+    i     = 0
+
+    while i < n:
+        width += w[s[i]]
+        i     += 1
+
+    return width
+
+
+@micropython.viper
+def unpack(src, off: int, dst, gbytes: int, rows: int) -> int:
+    s   = ptr8(src)
+    d   = ptr8(dst)
+    o   = 0
+    end = rows * gbytes
+
+    while o < end:
+        n    = s[off]
+        off += 1
+
+        if n & 0x80:
+            stop = o + (n & 0x7F) * gbytes
+
+            while o < stop:
+                d[o] = 0
+                o   += 1
+        else:
+            while n > 0:
+                k = 0
+
+                while k < gbytes:
+                    d[o + k] = s[off + k]
+                    k       += 1
+
+                o += gbytes
+                n -= 1
+
+            off += gbytes
+
+    return off
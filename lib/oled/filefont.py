@@ -0,0 +1,163 @@
+"""
+filefont.py
+Font read from a binary file, a glyph at a time
+
+A font_to_py module puts all its glyphs on the heap as soon as it is
+imported (unless frozen). A font file stays in flash: FileFont reads
+its header and index once, and every glyph from the file when it is
+needed, into the glyph cache of lib/oled/packedfont.py. Several sizes
+can be shipped, each costing only its index and cache once opened.
+
+File layout, little endian:
+
+    <4s magic b'KFN1'> <B height> <B baseline> <B max_width> <B flags>
+    <B min_ch> <B max_ch>
+    (max_ch - min_ch + 2) * (<H offset> <B width>)   the default glyph first
+    glyphs: height rows of (width + 7) // 8 bytes each, as font_to_py's
+
+flags: 1 hmap, 2 reverse, 4 monospaced. offset is from the first glyph.
+tools/fontfile.py writes one from a font_to_py module.
+"""
+
+import struct
+
+from lib.oled.fastpath import u16
+from lib.oled.packedfont import PackedFont
+
+
+MAGIC  = b'KFN1'
+HEADER = 10                                  # bytes before the index
+ENTRY  = 3                                   # bytes per index entry
+
+HMAP       = 1
+REVERSE    = 2
+MONOSPACED = 4
+
+
+def pack(font):
+    """
+    Build a font file
+
+    Parameters
+    ----------
+    font : module
+        font_to_py font, horizontally mapped
+
+    Returns : bytes
+    """
+
+    index = bytearray()
+    data  = bytearray()
+    flags = ((HMAP if font.hmap() else 0) | (REVERSE if font.reverse() else 0) |
+             (MONOSPACED if font.monospaced() else 0))
+
+    for code in [0] + list(range(font.min_ch(), font.max_ch() + 1)):
+        glyph, _, width = font.get_ch(chr(code))    # 0: out of range, the default glyph
+
+        if len(data) > 0xFFFF or width > 0xFF:
+            raise ValueError('font too large for 16 bit offsets and 8 bit widths')
+
+        index += struct.pack('<HB', len(data), width)
+        data  += glyph
+
+    header = struct.pack('<4sBBBBBB', MAGIC, font.height(), font.baseline(), font.max_width(),
+                         flags, font.min_ch(), font.max_ch())
+
+    return header + index + data
+
+
+class FileFont(PackedFont):
+    """
+    Font file, with the functions of a font_to_py module as methods
+
+    Attributes
+    --------------
+    file : file
+        the font file, kept open
+    base : int
+        file offset of the first glyph
+    """
+
+    def __init__(self, path, cache = 12):
+        """
+        Parameters
+        ----------
+        path : str
+            font file
+        cache : int, optional
+            glyphs kept in RAM. Default 12: 0-9, ':' and '.'
+
+        Raises
+        ------
+        OSError
+            no such file
+        ValueError
+            not a font file
+        """
+
+        self.file = open(path, 'rb')
+        head      = self.file.read(HEADER)
+
+        if len(head) < HEADER or head[:4] != MAGIC:
+            self.file.close()
+            raise ValueError('not a font file')
+
+        self._height, self._baseline, self._max_width, self.flags, first, last = head[4:]
+
+        count     = last - first + 2
+        index     = self.file.read(count * ENTRY)
+        self.base = HEADER + count * ENTRY
+
+        super().__init__(None, index, self._height, first, last, cache)
+
+
+    def height(self):
+        return self._height
+
+
+    def baseline(self):
+        return self._baseline
+
+
+    def max_width(self):
+        return self._max_width
+
+
+    def hmap(self):
+        return bool(self.flags & HMAP)
+
+
+    def reverse(self):
+        return bool(self.flags & REVERSE)
+
+
+    def monospaced(self):
+        return bool(self.flags & MONOSPACED)
+
+
+    def min_ch(self):
+        return self.first
+
+
+    def max_ch(self):
+        return self.last
+
+
+    def _load(self, slot, key):
+        """Read a glyph from the file into a slot"""
+
+        off   = u16(self.index, ENTRY * key)
+        width = self.index[ENTRY * key + 2]
+        size  = self.ht * ((width + 7) >> 3)
+        view  = memoryview(self._buffer(slot, size))[:size]
+
+        self.file.seek(self.base + off)
+        self.file.readinto(view)
+
+        self.keys[slot]   = key
+        self.widths[slot] = width
+        self.views[slot]  = view
+
+
+    def close(self):
+        self.file.close()
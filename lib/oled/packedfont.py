@@ -0,0 +1,166 @@
+"""
+packedfont.py
+Glyphs stored as row runs, decoded on demand into a small cache
+
+A font_to_py font keeps every glyph as its bitmap: rows of
+(width + 7) // 8 bytes, most of them blank or repeating the row above
+(a bar is the same row 15 times). A packed font keeps, per glyph, its
+width in a byte and then runs:
+
+    n        0 < n < 128: the row that follows, n times
+    0x80 | n n blank rows, nothing follows
+
+The index is font_to_py's: a little-endian offset per character, the
+default glyph first. tools/packfont.py converts a font_to_py module into
+a packed one, which behaves as the original module for the Writer.
+
+get_ch() decodes a glyph into one of `cache` buffers and keeps it
+there, least recently used first out. A hit costs a scan of the cache;
+a miss, _load(): the decode of the runs (fastpath.unpack) and a
+memoryview. lib/oled/filefont.py loads from a file instead. A buffer
+is allocated the first time it is needed and only grows, to the
+largest glyph it has held. Keep `cache` at least the characters drawn
+in turn: LRU drops a cycle of 10 digits from 8 slots at every step.
+"""
+
+from lib.oled.fastpath import u16, unpack
+
+
+class PackedFont:
+    """
+    Decoder and glyph cache of a packed font
+
+    Attributes
+    --------------
+    keys : list
+        index entry held by every slot, -1 if empty
+    order : bytearray
+        slots, most recently used first
+    hits, misses : int
+        get_ch() calls served from the cache, and decoded
+    """
+
+    def __init__(self, data, index, height, min_ch, max_ch, cache = 12):
+        """
+        Parameters
+        ----------
+        data : bytes
+            glyph records
+        index : bytes
+            offset of every record, as font_to_py's
+        height : int
+            rows of every glyph
+        min_ch, max_ch : int
+            character codes in the font
+        cache : int, optional
+            glyphs kept decoded. Default 12: 0-9, ':' and '.'
+        """
+
+        self.data   = data
+        self.index  = index
+        self.ht     = height
+        self.first  = min_ch
+        self.last   = max_ch
+        self.keys   = [-1] * cache
+        self.order  = bytearray(range(cache))
+        self.bufs   = [None] * cache
+        self.views  = [None] * cache             # decoded part of every buffer
+        self.widths = bytearray(cache)
+        self.hits   = 0
+        self.misses = 0
+
+
+    def get_ch(self, ch):
+        """
+        As the get_ch() of a font_to_py module
+
+        Returns : (memoryview, int, int)
+            glyph, height, width. The glyph stays valid until `cache`
+            other characters are decoded
+        """
+
+        return self.get_code(ord(ch))
+
+
+    def get_code(self, oc):
+        """
+        get_ch() by character code, as tools/fontpy.py writes it
+
+        Returns : (memoryview, int, int)
+        """
+
+        key   = oc - self.first + 1 if self.first <= oc <= self.last else 0
+        order = self.order
+        last  = len(order) - 1
+
+        for i in range(last + 1):
+            slot = order[i]
+
+            if self.keys[slot] == key:
+                self.hits += 1
+                break
+        else:
+            i    = last                          # evict the least recently used
+            slot = order[i]
+
+            self._load(slot, key)
+            self.misses += 1
+
+        while i:                                 # to the front
+            order[i] = order[i - 1]
+            i       -= 1
+
+        order[0] = slot
+
+        return self.views[slot], self.ht, self.widths[slot]
+
+
+    def _buffer(self, slot, size):
+        """
+        Returns : bytearray
+            buffer of `slot`, `size` bytes at least
+        """
+
+        buf = self.bufs[slot]
+
+        if buf is None or len(buf) < size:       # grown, never shrunk
+            buf             = bytearray(size)
+            self.bufs[slot] = buf
+
+        return buf
+
+
+    def _load(self, slot, key):
+        """
+        Decode a glyph into a slot
+
+        Parameters
+        ----------
+        slot : int
+            cache slot, overwritten
+        key : int
+            index entry: 0 the default glyph, then min_ch onwards
+        """
+
+        off    = u16(self.index, 2 * key)
+        width  = self.data[off]
+        gbytes = (width + 7) >> 3
+        size   = self.ht * gbytes
+        buf    = self._buffer(slot, size)
+
+        unpack(self.data, off + 1, buf, gbytes, self.ht)
+
+        self.keys[slot]   = key
+        self.widths[slot] = width
+        self.views[slot]  = memoryview(buf)[:size]
+
+
+    def clear(self):
+        """Forget every decoded glyph and the hit counts. Buffers are kept"""
+
+        for slot in range(len(self.keys)):
+            self.keys[slot]  = -1
+            self.views[slot] = None
+
+        self.hits   = 0
+        self.misses = 0
@@ -0,0 +1,223 @@
+"""
+segments.py
+Seven-segment digits drawn as bars, without a bitmap font
+
+Draws the time in place of the Writer: same set_textpos(), printbytes()
+and metrics(), for 0-9, ':' and '.' only. Bars are hline/vline runs
+with bevelled ends, in the proportions of the 48 px Seven Segment font
+at any height and bar thickness; at 48 px and 3 px they are the font's
+glyphs, pixel for pixel (python -m tools.segments checks it).
+
+     aaa
+    f   b
+     ggg
+    e   c
+     ddd
+
+As on the font, a vertical bar runs on where the horizontal one it
+would meet is off, and the lower ones start a row higher under a lit g.
+The bars of every character are worked out once: a few hundred bytes,
+against 17 KB for the bitmap font. redraw() turns a digit into another
+one by clearing the bars it loses and drawing the ones it gains; bars
+may share pixels (all of their ends, at thickness 1), so after a clear
+the bars kept are drawn again.
+"""
+
+SEG_A = 1
+SEG_B = 2
+SEG_C = 4
+SEG_D = 8
+SEG_E = 16
+SEG_F = 32
+SEG_G = 64
+
+DIGITS = b'\x3f\x06\x5b\x4f\x66\x6d\x7d\x07\x7f\x6f'   # segments lit for 0-9
+
+COLON  = 58
+POINT  = 46
+
+
+class Segments:
+    """
+    Seven-segment renderer
+
+    Attributes
+    --------------
+    height : int
+        character cell height in pixels
+    bars : dict
+        character code -> tuple of bars, each (vertical, fixed, start, end):
+        the centre line of the bar, from start to end, at x (vertical)
+        or y `fixed`, relative to the cell's top left corner
+    """
+
+    def __init__(self, device, height = 48, thickness = 3):
+        """
+        Parameters
+        ----------
+        device : FrameBuffer
+            display to draw on
+        height : int, optional
+            character cell height. Default 48, the bitmap font's
+        thickness : int, optional
+            bar thickness, odd. Default 3
+        """
+
+        self.device    = device
+        self.height    = height
+        self.half      = thickness // 2
+        self.row       = 0
+        self.col       = 0
+        self.bars      = {}
+        self.advances  = {}
+        self.shifts    = {}
+
+        t    = thickness
+        h    = self.half
+        top  = height * 7 // 48              # blank rows above the digits
+        dh   = height * 3 // 4               # digit height
+        dw   = dh * 19 // 36                 # digit width
+        y_a  = top + h
+        y_g  = top + (dh - 1) // 2
+        y_d  = top + dh - 1 - h
+        x0   = t                             # left margin
+
+        for d in range(10):
+            segs  = DIGITS[d]
+            shift = 0 if segs & (SEG_E | SEG_F) else -(t - 1) if segs & (SEG_A | SEG_G | SEG_D) else -(dw - t)
+            left  = x0 + shift + h
+            right = x0 + shift + dw - 1 - h
+            up    = y_a + h if segs & SEG_A else y_a - h
+            mid   = y_g + h if segs & SEG_G else y_g + h + 1
+            down  = y_d - h if segs & SEG_D else y_d + h
+            bars  = []
+
+            for seg, bar in ((SEG_A, (False, y_a, x0 + shift + t - 1, x0 + shift + dw - t)),
+                             (SEG_G, (False, y_g, x0 + shift + t - 1, x0 + shift + dw - t)),
+                             (SEG_D, (False, y_d, x0 + shift + t - 1, x0 + shift + dw - t)),
+                             (SEG_F, (True, left, up, y_g - h)),
+                             (SEG_B, (True, right, up, y_g - h)),
+                             (SEG_E, (True, left, mid, down)),
+                             (SEG_C, (True, right, mid, down))):
+                if segs & seg:
+                    bars.append(bar)
+
+            code = 48 + d
+
+            self.bars[code]     = tuple(bars)
+            self.shifts[code]   = shift
+            self.advances[code] = x0 + dw + shift + t + (1 if segs & (SEG_E | SEG_F) else 0)
+
+        dot = (True, x0 + h, top + dh - t - 2, top + dh - 1)
+        gap = dh * 5 // 18                   # colon: upper dot above the point
+
+        self.bars[POINT]     = (dot,)
+        self.bars[COLON]     = ((True, x0 + h, dot[2] - gap, dot[3] - gap), dot)
+        self.advances[POINT] = self.advances[COLON] = 3 * t
+        self.shifts[POINT]   = self.shifts[COLON]   = 0
+
+
+    def metrics(self):
+        """
+        Width tables, by character code
+
+        Returns : (bytearray, bytearray)
+            advance of every character, and the blank columns on its right
+        """
+
+        widths = bytearray(128)
+        blank  = bytearray(128)
+        h      = self.half
+
+        for code, bars in self.bars.items():
+            widths[code] = self.advances[code]
+            blank[code]  = widths[code] - 1 - max(b[1] + h if b[0] else b[3] for b in bars)
+
+        return widths, blank
+
+
+    def set_textpos(self, device, row = None, col = None):
+        """As Writer.set_textpos(), for this renderer"""
+
+        if row is not None:
+            self.row = row
+
+        if col is not None:
+            self.col = col
+
+        return self.row, self.col
+
+
+    def _bar(self, bar, x, y, c):
+        """Draw one bar with its bevelled ends, in colour `c`"""
+
+        vertical, fixed, start, end = bar
+
+        for k in range(-self.half, self.half + 1):
+            a = k if k >= 0 else -k
+
+            if vertical:
+                self.device.vline(x + fixed + k, y + start + a, end - start + 1 - 2 * a, c)
+            else:
+                self.device.hline(x + start + a, y + fixed + k, end - start + 1 - 2 * a, c)
+
+
+    def _printchar(self, code):
+        bars = self.bars.get(code)
+
+        if bars is not None:
+            for bar in bars:
+                self._bar(bar, self.col, self.row, 1)
+
+        self.col += self.advances.get(code, 0)
+
+
+    def printbytes(self, buf, start, end, invert = False):
+        """
+        Print a run of character codes at the text position, as
+        Writer.printbytes(). Invert is not supported
+        """
+
+        for i in range(start, end):
+            self._printchar(buf[i])
+
+
+    def redraw(self, old, new):
+        """
+        Turn the character `old`, drawn at the text position, into `new`
+        and move past it. Only the cell's bars are touched
+
+        Parameters
+        ----------
+        old : int
+            character code drawn
+        new : int
+            character code to draw
+
+        Returns : bool
+            done; False if the two are laid out differently and `new`
+            needs the cell cleared and drawn whole
+        """
+
+        if old not in self.bars or new not in self.bars:
+            return False
+
+        if self.shifts[old] != self.shifts[new] or self.advances[old] != self.advances[new]:
+            return False
+
+        was     = self.bars[old]
+        now     = self.bars[new]
+        cleared = False
+
+        for bar in was:
+            if bar not in now:
+                self._bar(bar, self.col, self.row, 0)
+                cleared = True
+
+        for bar in now:
+            if cleared or bar not in was:    # a bar kept may have lost pixels it shares
+                self._bar(bar, self.col, self.row, 1)
+
+        self.col += self.advances[new]
+
+        return True
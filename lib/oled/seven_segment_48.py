@@ -3,6 +3,8 @@
 # Cmd: font_to_py.py --xmap fonts\Seven_Segment.ttf 48 py-fonts\seven_segment_48.py
 version = '0.33'
 
+from lib.oled.fastpath import u16
+
 def height():
     return 48
 
@@ -1113,7 +1115,7 @@ b'\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03'\
 b'\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00'\
 b'\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x30'\
 b'\x03\x00\x30\x03\x00\x30\x03\x00\x30\x03\x00\x3f\xff\x00\x3f\xff'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
 
 _index =\
 b'\x00\x00\xc2\x00\x24\x01\x86\x01\xe8\x01\xaa\x02\x6c\x03\x5e\x04'\
@@ -1131,15 +1133,15 @@ b'\x90\x3e\x82\x3f\x44\x40\x06\x41\xc8\x41\x5a\x42\xbc\x42\x4e\x43'\
 b'\xe0\x43'
 
 _mvfont = memoryview(_font)
-_mvi = memoryview(_index)
-ifb = lambda l : l[0] | (l[1] << 8)
 
-def get_ch(ch):
-    oc = ord(ch)
+# get_code() and get_ch() written by tools/fontpy.py
+def get_code(oc):
     ioff = 2 * (oc - 32 + 1) if oc >= 32 and oc <= 126 else 0
-    doff = ifb(_mvi[ioff : ])
-    width = ifb(_mvfont[doff : ])
+    doff = u16(_index, ioff)
+    width = u16(_font, doff)
 
     next_offs = doff + 2 + ((width - 1)//8 + 1) * 48
     return _mvfont[doff + 2:next_offs], 48, width
 
+def get_ch(ch):
+    return get_code(ord(ch))
@@ -0,0 +1,288 @@
+# Code generated by tools/packfont.py from lib/oled/seven_segment_48.py.
+# Font: Seven_Segment.ttf
+# Cmd: font_to_py.py --xmap fonts\Seven_Segment.ttf 48 py-fonts\seven_segment_48.py
+# Glyphs stored as row runs: see lib/oled/packedfont.py
+version = '0.33'
+
+from lib.oled.packedfont import PackedFont
+
+def height():
+    return 48
+
+def baseline():
+    return 43
+
+def max_width():
+    return 121
+
+def hmap():
+    return True
+
+def reverse():
+    return False
+
+def monospaced():
+    return False
+
+def min_ch():
+    return 32
+
+def max_ch():
+    return 126
+
+_font =\
+b'\x1a\x87\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe8'\
+b'\x00\x0e\x00\x00\x1c\x00\x01\x03\xff\xe8\x00\x01\x07\xff\xf0\x00'\
+b'\x01\x0b\xff\xe0\x00\x09\x1c\x00\x00\x00\x01\x08\x00\x00\x00\x81'\
+b'\x01\x08\x00\x00\x00\x03\x1c\x00\x00\x00\x01\x08\x00\x00\x00\x85'\
+b'\x0f\xb0\x09\x87\x01\x08\x00\x1c\x1c\x00\x01\x08\x00\x81\x01\x08'\
+b'\x00\x03\x1c\x00\x01\x08\x00\x85\x0e\x87\x01\x08\x40\x03\x1c\xe0'\
+b'\x01\x08\x40\xa4\x1c\x93\x01\x00\x02\x04\x00\x01\x00\x07\x1c\x00'\
+b'\x01\x00\x0f\x1c\x00\x01\x00\x0f\x3c\x00\x01\x00\x0e\x3c\x00\x01'\
+b'\x00\x1e\x38\x00\x01\x00\x1c\x78\x00\x01\x0f\xff\xff\x00\x01\x1f'\
+b'\xff\xff\x80\x01\x0f\xff\xff\x00\x02\x00\x78\xe0\x00\x01\x00\x71'\
+b'\xe0\x00\x01\x00\xf1\xc0\x00\x01\x0f\xff\xff\x00\x01\x1f\xff\xff'\
+b'\x80\x01\x0f\xff\xff\x00\x01\x01\xc7\x80\x00\x01\x01\xc7\x00\x00'\
+b'\x01\x03\xc7\x00\x00\x01\x03\x8f\x00\x00\x02\x03\x8e\x00\x00\x01'\
+b'\x02\x04\x00\x00\x85\x1a\x82\x01\x00\x08\x00\x00\x04\x00\x1c\x00'\
+b'\x00\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe0\x00'\
+b'\x0d\x1c\x00\x00\x00\x01\x0b\xff\xe0\x00\x01\x07\xff\xf0\x00\x01'\
+b'\x03\xff\xe8\x00\x0e\x00\x00\x1c\x00\x01\x03\xff\xe8\x00\x01\x07'\
+b'\xff\xf0\x00\x01\x03\xff\xe0\x00\x04\x00\x1c\x00\x00\x01\x00\x08'\
+b'\x00\x00\x24\x87\x01\x00\x00\x00\x30\x00\x02\x00\x00\x00\x78\x00'\
+b'\x01\x00\x00\x00\xf0\x00\x01\x00\x00\x00\xe0\x00\x01\x07\xf0\x01'\
+b'\xe0\x00\x01\x07\xf0\x01\xc0\x00\x01\x18\x0c\x03\xc0\x00\x01\x18'\
+b'\x0c\x03\x80\x00\x01\x18\x0c\x07\x80\x00\x02\x18\x0c\x0f\x00\x00'\
+b'\x01\x18\x0c\x1e\x00\x00\x01\x18\x0c\x1c\x00\x00\x01\x18\x0c\x3c'\
+b'\x00\x00\x01\x18\x0c\x38\x00\x00\x01\x07\xf0\x78\x00\x00\x01\x07'\
+b'\xf0\xf0\x00\x00\x01\x00\x00\xf0\xfe\x00\x01\x00\x01\xe0\xfe\x00'\
+b'\x01\x00\x01\xc3\x01\x80\x01\x00\x03\xc3\x01\x80\x01\x00\x03\x83'\
+b'\x01\x80\x01\x00\x07\x83\x01\x80\x01\x00\x07\x03\x01\x80\x01\x00'\
+b'\x0f\x03\x01\x80\x01\x00\x1e\x03\x01\x80\x01\x00\x1c\x03\x01\x80'\
+b'\x01\x00\x3c\x03\x01\x80\x01\x00\x38\x00\xfe\x00\x01\x00\x78\x00'\
+b'\xfe\x00\x01\x00\x70\x00\x00\x00\x01\x00\xf0\x00\x00\x00\x02\x01'\
+b'\xe0\x00\x00\x00\x01\x00\xc0\x00\x00\x00\x85\x79\x87\x01\x03\xff'\
+b'\xe0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x07'\
+b'\xff\xf0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01'\
+b'\x0b\xff\xe0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x0d\x1c\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x01\x0b\xff\xe0\x03\xff\xe0\x03\xff\xc0\x07\xff\xe0\x01\xff'\
+b'\xf0\x00\x01\x07\xff\xf0\x07\xff\xf0\x07\xff\xe0\x0f\xff\xf0\x03'\
+b'\xff\xf8\x00\x01\x0b\xff\xe0\x0b\xff\xe0\x0b\xff\xc0\x17\xff\xe8'\
+b'\x05\xff\xf0\x00\x0e\x1c\x00\x00\x1c\x00\x00\x1c\x00\x00\x38\x00'\
+b'\x1c\x0e\x00\x00\x00\x01\x0b\xff\xe0\x1c\x00\x00\x1c\x00\x00\x17'\
+b'\xff\xe8\x0e\x00\x00\x00\x01\x07\xff\xf0\x1c\x00\x00\x1c\x00\x00'\
+b'\x0f\xff\xf0\x0e\x00\x00\x00\x01\x03\xff\xe0\x08\x00\x00\x08\x00'\
+b'\x00\x07\xff\xe0\x04\x00\x00\x00\x85\x13\x89\x02\x3f\xff\x00\x1e'\
+b'\x30\x03\x00\x02\x3f\xff\x00\x85\x13\x87\x01\x03\xfe\x00\x01\x07'\
+b'\xff\x00\x01\x0b\xfe\x00\x0d\x1c\x00\x00\x01\x08\x00\x00\x82\x01'\
+b'\x08\x00\x00\x0d\x1c\x00\x00\x01\x0b\xfe\x00\x01\x07\xff\x00\x01'\
+b'\x03\xfe\x00\x85\x13\x87\x01\x0f\xf8\x00\x01\x1f\xfc\x00\x01\x0f'\
+b'\xfa\x00\x0d\x00\x07\x00\x01\x00\x02\x00\x82\x01\x00\x02\x00\x0d'\
+b'\x00\x07\x00\x01\x0f\xfa\x00\x01\x1f\xfc\x00\x01\x0f\xf8\x00\x85'\
+b'\x15\x01\x00\x20\x00\x03\x00\x70\x00\x01\x1c\x71\xc0\x01\x1f\x77'\
+b'\xc0\x01\x0f\xff\x80\x01\x07\xff\x00\x01\x01\xfc\x00\x01\x03\xfe'\
+b'\x00\x01\x07\xff\x00\x01\x0f\xff\x80\x01\x1f\x77\xc0\x01\x0c\x71'\
+b'\x80\x02\x00\x70\x00\x02\x00\x20\x00\x9e\x22\x8d\x01\x00\x00\x80'\
+b'\x00\x00\x0b\x00\x01\xc0\x00\x00\x01\x0f\xfe\xbf\xf8\x00\x01\x1f'\
+b'\xff\x7f\xfc\x00\x01\x0f\xfe\xbf\xf8\x00\x0b\x00\x01\xc0\x00\x00'\
+b'\x01\x00\x00\x80\x00\x00\x88\x0c\xa5\x01\x03\x00\x01\x07\x00\x01'\
+b'\x0f\x00\x01\x1e\x00\x01\x1c\x00\x01\x18\x00\x85\x15\x98\x01\x0f'\
+b'\xff\x00\x01\x1f\xff\x80\x01\x0f\xff\x00\x95\x09\xa6\x01\x08\x00'\
+b'\x03\x1c\x00\x01\x08\x00\x85\x1c\x88\x01\x00\x00\x03\x00\x02\x00'\
+b'\x00\x07\x00\x01\x00\x00\x0f\x00\x02\x00\x00\x1e\x00\x01\x00\x00'\
+b'\x3c\x00\x01\x00\x00\x38\x00\x01\x00\x00\x78\x00\x02\x00\x00\xf0'\
+b'\x00\x02\x00\x01\xe0\x00\x01\x00\x03\xc0\x00\x02\x00\x03\x80\x00'\
+b'\x01\x00\x02\x00\x00\x81\x01\x00\x0c\x00\x00\x01\x00\x1c\x00\x00'\
+b'\x01\x00\x3c\x00\x00\x01\x00\x38\x00\x00\x01\x00\x78\x00\x00\x02'\
+b'\x00\xf0\x00\x00\x01\x01\xe0\x00\x00\x01\x01\xc0\x00\x00\x01\x03'\
+b'\xc0\x00\x00\x01\x03\x80\x00\x00\x01\x07\x80\x00\x00\x02\x0f\x00'\
+b'\x00\x00\x01\x1e\x00\x00\x00\x01\x1c\x00\x00\x00\x01\x0c\x00\x00'\
+b'\x00\x85\x1a\x87\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b'\
+b'\xff\xe8\x00\x0d\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x82\x01\x08'\
+b'\x00\x08\x00\x0d\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff'\
+b'\xf0\x00\x01\x03\xff\xe0\x00\x85\x09\x87\x01\x08\x00\x0f\x1c\x00'\
+b'\x01\x08\x00\x82\x01\x08\x00\x0f\x1c\x00\x01\x08\x00\x85\x1a\x87'\
+b'\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe8\x00\x0d'\
+b'\x00\x00\x1c\x00\x01\x03\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x0b'\
+b'\xff\xe0\x00\x0e\x1c\x00\x00\x00\x01\x0b\xff\xe0\x00\x01\x07\xff'\
+b'\xf0\x00\x01\x03\xff\xe0\x00\x85\x17\x87\x01\x0f\xff\x80\x01\x1f'\
+b'\xff\xc0\x01\x0f\xff\xa0\x0d\x00\x00\x70\x01\x0f\xff\xa0\x01\x1f'\
+b'\xff\xc0\x01\x0f\xff\xa0\x0e\x00\x00\x70\x01\x0f\xff\xa0\x01\x1f'\
+b'\xff\xc0\x01\x0f\xff\x80\x85\x1a\x87\x01\x08\x00\x08\x00\x0f\x1c'\
+b'\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x03\xff'\
+b'\xe8\x00\x10\x00\x00\x1c\x00\x01\x00\x00\x08\x00\x85\x1a\x87\x01'\
+b'\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe0\x00\x0d\x1c'\
+b'\x00\x00\x00\x01\x0b\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x03\xff'\
+b'\xe8\x00\x0e\x00\x00\x1c\x00\x01\x03\xff\xe8\x00\x01\x07\xff\xf0'\
+b'\x00\x01\x03\xff\xe0\x00\x85\x1a\x87\x01\x03\xff\xe0\x00\x01\x07'\
+b'\xff\xf0\x00\x01\x0b\xff\xe0\x00\x0d\x1c\x00\x00\x00\x01\x0b\xff'\
+b'\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0e\x1c\x00\x1c'\
+b'\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe0\x00'\
+b'\x85\x17\x87\x01\x0f\xff\x80\x01\x1f\xff\xc0\x01\x0f\xff\xa0\x0d'\
+b'\x00\x00\x70\x01\x00\x00\x20\x82\x01\x00\x00\x20\x0f\x00\x00\x70'\
+b'\x01\x00\x00\x20\x85\x1a\x87\x01\x03\xff\xe0\x00\x01\x07\xff\xf0'\
+b'\x00\x01\x0b\xff\xe8\x00\x0d\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00'\
+b'\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0e\x1c\x00\x1c\x00\x01'\
+b'\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe0\x00\x85\x1a'\
+b'\x87\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00'\
+b'\x0d\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01'\
+b'\x03\xff\xe8\x00\x0e\x00\x00\x1c\x00\x01\x03\xff\xe8\x00\x01\x07'\
+b'\xff\xf0\x00\x01\x03\xff\xe0\x00\x85\x09\x9c\x01\x08\x00\x03\x1c'\
+b'\x00\x01\x08\x00\x85\x01\x08\x00\x03\x1c\x00\x01\x08\x00\x85\x0f'\
+b'\x87\x01\x00\x40\x02\x00\xe0\x01\x01\xe0\x02\x01\xc0\x02\x03\x80'\
+b'\x01\x07\x80\x02\x07\x00\x01\x0f\x00\x02\x0e\x00\x01\x1e\x00\x02'\
+b'\x1c\x00\x82\x02\x1c\x00\x01\x1e\x00\x02\x0e\x00\x01\x0f\x00\x02'\
+b'\x07\x00\x01\x07\x80\x02\x03\x80\x02\x01\xc0\x01\x01\xe0\x02\x00'\
+b'\xe0\x01\x00\x40\x85\x1c\x97\x01\x0f\xff\xff\x00\x01\x1f\xff\xff'\
+b'\x80\x01\x0f\xff\xff\x00\x86\x01\x0f\xff\xff\x00\x01\x1f\xff\xff'\
+b'\x80\x01\x0f\xff\xff\x00\x8d\x0f\x87\x01\x08\x00\x02\x1c\x00\x03'\
+b'\x0e\x00\x02\x07\x00\x01\x07\x80\x02\x03\x80\x01\x03\xc0\x02\x01'\
+b'\xc0\x01\x01\xe0\x02\x00\xe0\x82\x02\x00\xe0\x01\x01\xe0\x02\x01'\
+b'\xc0\x01\x03\xc0\x02\x03\x80\x01\x07\x80\x02\x07\x00\x02\x0e\x00'\
+b'\x01\x1e\x00\x02\x1c\x00\x01\x08\x00\x85\x1a\x87\x01\x03\xff\xe0'\
+b'\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x06\x1c\x00\x1c\x00'\
+b'\x01\x1c\x0f\xdc\x00\x01\x1c\x1f\xdc\x00\x01\x1c\x2f\xdc\x00\x04'\
+b'\x1c\x70\x1c\x00\x02\x08\x70\x08\x00\x01\x00\x70\x00\x00\x01\x08'\
+b'\x70\x08\x00\x05\x1c\x70\x1c\x00\x01\x1c\x2f\xe8\x00\x01\x1c\x1f'\
+b'\xf0\x00\x01\x1c\x0f\xe0\x00\x05\x1c\x00\x00\x00\x01\x0b\xff\xe0'\
+b'\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe0\x00\x85\x1a\x87\x01\x03'\
+b'\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0e\x1c\x00'\
+b'\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8'\
+b'\x00\x0f\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x85\x1a\x87\x01\x0f'\
+b'\xff\xe0\x00\x01\x17\xff\xf0\x00\x01\x1b\xff\xe8\x00\x0d\x1c\x00'\
+b'\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8'\
+b'\x00\x0e\x1c\x00\x1c\x00\x01\x1b\xff\xe8\x00\x01\x17\xff\xf0\x00'\
+b'\x01\x0f\xff\xe0\x00\x85\x17\x87\x01\x03\xff\xe0\x01\x07\xff\xf0'\
+b'\x01\x0b\xff\xe0\x0d\x1c\x00\x00\x01\x08\x00\x00\x82\x01\x08\x00'\
+b'\x00\x0d\x1c\x00\x00\x01\x0b\xff\xe0\x01\x07\xff\xf0\x01\x03\xff'\
+b'\xe0\x85\x1a\x87\x01\x0f\xff\xe0\x00\x01\x17\xff\xf0\x00\x01\x1b'\
+b'\xff\xe8\x00\x0d\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x82\x01\x08'\
+b'\x00\x08\x00\x0d\x1c\x00\x1c\x00\x01\x1b\xff\xe8\x00\x01\x17\xff'\
+b'\xf0\x00\x01\x0f\xff\xe0\x00\x85\x17\x87\x01\x03\xff\xe0\x01\x07'\
+b'\xff\xf0\x01\x0b\xff\xe0\x0d\x1c\x00\x00\x01\x0b\xff\xe0\x01\x07'\
+b'\xff\xf0\x01\x0b\xff\xe0\x0e\x1c\x00\x00\x01\x0b\xff\xe0\x01\x07'\
+b'\xff\xf0\x01\x03\xff\xe0\x85\x17\x87\x01\x03\xff\xe0\x01\x07\xff'\
+b'\xf0\x01\x0b\xff\xe0\x0d\x1c\x00\x00\x01\x0b\xff\xe0\x01\x07\xff'\
+b'\xf0\x01\x0b\xff\xe0\x10\x1c\x00\x00\x01\x08\x00\x00\x85\x1a\x87'\
+b'\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe0\x00\x0d'\
+b'\x1c\x00\x00\x00\x01\x08\x3f\xe0\x00\x01\x00\x7f\xf0\x00\x01\x08'\
+b'\x3f\xe8\x00\x0e\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff'\
+b'\xf0\x00\x01\x03\xff\xe0\x00\x85\x1a\x87\x01\x08\x00\x08\x00\x10'\
+b'\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x0b'\
+b'\xff\xe8\x00\x0f\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x85\x1a\x87'\
+b'\x01\x00\x00\x08\x00\x0f\x00\x00\x1c\x00\x01\x00\x00\x08\x00\x82'\
+b'\x01\x08\x00\x08\x00\x0d\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01'\
+b'\x07\xff\xf0\x00\x01\x03\xff\xe0\x00\x85\x1a\x87\x01\x08\x00\x1c'\
+b'\x00\x01\x1c\x00\x3c\x00\x01\x1c\x00\x7c\x00\x01\x1c\x00\xf8\x00'\
+b'\x01\x1c\x01\xf0\x00\x01\x1c\x03\xe0\x00\x01\x1c\x07\xc0\x00\x01'\
+b'\x1c\x0f\x80\x00\x01\x1c\x1f\x00\x00\x01\x1c\x3e\x00\x00\x01\x1c'\
+b'\x7c\x00\x00\x01\x1c\xf8\x00\x00\x01\x1d\xf0\x00\x00\x01\x1d\xe0'\
+b'\x00\x00\x01\x1d\xc0\x00\x00\x01\x1c\x00\x00\x00\x01\x0b\xff\xe0'\
+b'\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x10\x1c\x00\x1c\x00'\
+b'\x01\x08\x00\x08\x00\x85\x17\x87\x01\x08\x00\x00\x0f\x1c\x00\x00'\
+b'\x01\x08\x00\x00\x82\x01\x08\x00\x00\x0d\x1c\x00\x00\x01\x0b\xff'\
+b'\xe0\x01\x07\xff\xf0\x01\x03\xff\xe0\x85\x23\x87\x01\x03\xff\x1f'\
+b'\xf8\x00\x01\x07\xff\xbf\xfc\x00\x01\x0b\xff\x5f\xfa\x00\x0d\x1c'\
+b'\x00\xe0\x07\x00\x01\x08\x00\x40\x02\x00\x82\x01\x08\x00\x00\x02'\
+b'\x00\x0f\x1c\x00\x00\x07\x00\x01\x08\x00\x00\x02\x00\x85\x1a\x87'\
+b'\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0d'\
+b'\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x82\x01\x08\x00\x08\x00\x0f'\
+b'\x1c\x00\x1c\x00\x01\x08\x00\x08\x00\x85\x1a\x87\x01\x03\xff\xe0'\
+b'\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0d\x1c\x00\x1c\x00'\
+b'\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe0\x00\x10'\
+b'\x1c\x00\x00\x00\x01\x08\x00\x00\x00\x85\x1a\x87\x01\x03\xff\xe0'\
+b'\x00\x01\x07\xff\xf0\x00\x01\x0b\xff\xe8\x00\x0d\x1c\x00\x1c\x00'\
+b'\x01\x08\x00\x08\x00\x82\x01\x08\x00\x08\x00\x09\x1c\x00\x1c\x00'\
+b'\x01\x1c\x00\x08\x00\x01\x1c\x00\x70\x00\x01\x1c\x00\x78\x00\x01'\
+b'\x1c\x00\x7c\x00\x01\x0b\xff\xbc\x00\x01\x07\xff\xdc\x00\x01\x03'\
+b'\xff\x80\x00\x85\x1a\x87\x01\x03\xff\xe0\x00\x01\x07\xff\xf0\x00'\
+b'\x01\x0b\xff\xe8\x00\x0d\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01'\
+b'\x07\xff\xf0\x00\x01\x0b\xff\xe0\x00\x01\x1c\x00\x00\x00\x01\x1d'\
+b'\xc0\x00\x00\x01\x1d\xe0\x00\x00\x01\x1d\xf0\x00\x00\x01\x1c\xf8'\
+b'\x00\x00\x01\x1c\x78\x00\x00\x01\x1c\x3c\x00\x00\x01\x1c\x1e\x00'\
+b'\x00\x01\x1c\x0f\x00\x00\x01\x1c\x07\x80\x00\x01\x1c\x03\xc0\x00'\
+b'\x01\x1c\x01\xe0\x00\x01\x1c\x00\xf0\x00\x01\x1c\x00\x78\x00\x02'\
+b'\x1c\x00\x3c\x00\x01\x08\x00\x1c\x00\x85\x1e\x87\x01\x0f\xf8\xff'\
+b'\x80\x01\x1f\xfd\xff\xc0\x01\x0f\xfa\xff\x80\x0d\x00\x07\x00\x00'\
+b'\x01\x00\x02\x00\x00\x82\x01\x00\x02\x00\x00\x0f\x00\x07\x00\x00'\
+b'\x01\x00\x02\x00\x00\x85\x1a\x87\x01\x08\x00\x08\x00\x0f\x1c\x00'\
+b'\x1c\x00\x01\x08\x00\x08\x00\x82\x01\x08\x00\x08\x00\x0d\x1c\x00'\
+b'\x1c\x00\x01\x0b\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe0'\
+b'\x00\x85\x1a\x87\x01\x08\x00\x08\x00\x0f\x1c\x00\x1c\x00\x01\x08'\
+b'\x00\x08\x00\x82\x02\x1c\x00\x1c\x00\x01\x1e\x00\x3c\x00\x02\x0e'\
+b'\x00\x38\x00\x01\x0f\x00\x78\x00\x01\x07\x00\x70\x00\x01\x07\x80'\
+b'\xf0\x00\x02\x03\x80\xe0\x00\x01\x03\xc1\xe0\x00\x02\x01\xc1\xc0'\
+b'\x00\x01\x01\xe3\xc0\x00\x02\x00\xe3\x80\x00\x01\x00\x63\x00\x00'\
+b'\x85\x23\x87\x01\x08\x00\x00\x02\x00\x0f\x1c\x00\x00\x07\x00\x01'\
+b'\x08\x00\x00\x02\x00\x82\x01\x08\x00\x40\x02\x00\x0d\x1c\x00\xe0'\
+b'\x07\x00\x01\x0b\xff\x5f\xfa\x00\x01\x07\xff\xbf\xfc\x00\x01\x03'\
+b'\xff\x1f\xf8\x00\x85\x1a\x87\x01\x08\x00\x0c\x00\x01\x1c\x00\x1c'\
+b'\x00\x01\x1e\x00\x1c\x00\x02\x0e\x00\x3c\x00\x01\x0f\x00\x38\x00'\
+b'\x01\x07\x00\x78\x00\x01\x07\x80\x70\x00\x01\x03\x80\x70\x00\x01'\
+b'\x03\x80\xf0\x00\x01\x03\xc0\xe0\x00\x01\x01\xc1\xe0\x00\x01\x01'\
+b'\xe1\xc0\x00\x01\x00\xe1\xc0\x00\x01\x00\xe3\xc0\x00\x01\x00\xf3'\
+b'\x80\x00\x01\x00\x63\x80\x00\x82\x01\x00\x63\x80\x00\x01\x00\xf3'\
+b'\x80\x00\x01\x00\xe3\xc0\x00\x01\x00\xe1\xc0\x00\x01\x01\xe1\xc0'\
+b'\x00\x01\x01\xc1\xe0\x00\x01\x03\xc0\xe0\x00\x01\x03\x80\xf0\x00'\
+b'\x01\x03\x80\x70\x00\x01\x07\x80\x70\x00\x01\x07\x00\x78\x00\x01'\
+b'\x0f\x00\x38\x00\x01\x0f\x00\x3c\x00\x01\x0e\x00\x3c\x00\x01\x1e'\
+b'\x00\x1c\x00\x01\x1c\x00\x1c\x00\x01\x08\x00\x0c\x00\x85\x1a\x87'\
+b'\x01\x08\x00\x08\x00\x0f\x1c\x00\x1c\x00\x01\x0b\xff\xe8\x00\x01'\
+b'\x07\xff\xf0\x00\x01\x03\xff\xe8\x00\x0e\x00\x00\x1c\x00\x01\x03'\
+b'\xff\xe8\x00\x01\x07\xff\xf0\x00\x01\x03\xff\xe0\x00\x85\x1a\x87'\
+b'\x01\x0f\xff\xc0\x00\x01\x1f\xff\xf0\x00\x01\x0f\xff\xc0\x00\x01'\
+b'\x00\x00\x08\x00\x01\x00\x00\x38\x00\x01\x00\x00\x3c\x00\x01\x00'\
+b'\x00\x78\x00\x01\x00\x00\x70\x00\x01\x00\x00\xf0\x00\x01\x00\x00'\
+b'\xe0\x00\x01\x00\x01\xe0\x00\x02\x00\x03\xc0\x00\x02\x00\x07\x80'\
+b'\x00\x01\x00\x07\x00\x00\x01\x00\x06\x00\x00\x82\x01\x00\x30\x00'\
+b'\x00\x02\x00\x78\x00\x00\x01\x00\xf0\x00\x00\x01\x00\xe0\x00\x00'\
+b'\x01\x01\xe0\x00\x00\x01\x01\xc0\x00\x00\x01\x03\xc0\x00\x00\x02'\
+b'\x07\x80\x00\x00\x02\x0f\x00\x00\x00\x01\x0e\x00\x00\x00\x01\x08'\
+b'\x00\x00\x00\x01\x01\xff\xf8\x00\x01\x03\xff\xfe\x00\x01\x01\xff'\
+b'\xf8\x00\x85\x13\x87\x01\x0f\xfe\x00\x01\x17\xff\x00\x01\x1b\xfe'\
+b'\x00\x0d\x1c\x00\x00\x01\x08\x00\x00\x82\x01\x08\x00\x00\x0d\x1c'\
+b'\x00\x00\x01\x1b\xfe\x00\x01\x17\xff\x00\x01\x0f\xfe\x00\x85\x1c'\
+b'\x88\x02\x1c\x00\x00\x00\x01\x1e\x00\x00\x00\x02\x0f\x00\x00\x00'\
+b'\x01\x07\x80\x00\x00\x01\x03\x80\x00\x00\x01\x03\xc0\x00\x00\x02'\
+b'\x01\xe0\x00\x00\x01\x00\xf0\x00\x00\x01\x00\x70\x00\x00\x01\x00'\
+b'\x78\x00\x00\x01\x00\x38\x00\x00\x01\x00\x3c\x00\x00\x01\x00\x1c'\
+b'\x00\x00\x82\x01\x00\x03\x00\x00\x02\x00\x03\x80\x00\x01\x00\x03'\
+b'\xc0\x00\x02\x00\x01\xe0\x00\x01\x00\x00\xf0\x00\x01\x00\x00\x70'\
+b'\x00\x01\x00\x00\x78\x00\x02\x00\x00\x3c\x00\x02\x00\x00\x1e\x00'\
+b'\x01\x00\x00\x0f\x00\x02\x00\x00\x07\x00\x01\x00\x00\x03\x00\x85'\
+b'\x13\x87\x01\x0f\xfe\x00\x01\x1f\xfd\x00\x01\x0f\xfb\x00\x0d\x00'\
+b'\x07\x00\x01\x00\x02\x00\x82\x01\x00\x02\x00\x0d\x00\x07\x00\x01'\
+b'\x0f\xfb\x00\x01\x1f\xfd\x00\x01\x0f\xfe\x00\x85\x2a\x93\x01\x00'\
+b'\x00\x61\x80\x00\x00\x01\x00\x01\xf3\xe0\x00\x00\x01\x00\x0f\xf3'\
+b'\xfc\x00\x00\x01\x00\x3f\xe1\xff\x00\x00\x01\x01\xff\x00\x3f\xe0'\
+b'\x00\x01\x07\xfc\x00\x0f\xf8\x00\x01\x0f\xe0\x00\x01\xfc\x00\x01'\
+b'\x1f\x80\x00\x00\x7e\x00\x01\x0c\x00\x00\x00\x1c\x00\x94\x20\xa8'\
+b'\x01\x0f\xff\xff\xf0\x01\x1f\xff\xff\xf8\x01\x0f\xff\xff\xf0\x85'\
+b'\x18\x87\x01\x00\x1f\xf0\x01\x00\x3f\xf8\x01\x00\x5f\xf0\x0e\x00'\
+b'\xe0\x00\x01\x0f\x40\x00\x01\x1f\x80\x00\x01\x0f\x40\x00\x0d\x00'\
+b'\xe0\x00\x01\x00\x5f\xf0\x01\x00\x3f\xf8\x01\x00\x1f\xf0\x85\x09'\
+b'\x83\x02\x08\x00\x25\x1c\x00\x01\x08\x00\x85\x18\x87\x01\x0f\xf8'\
+b'\x00\x01\x1f\xfc\x00\x01\x0f\xfa\x00\x0e\x00\x07\x00\x01\x00\x02'\
+b'\xf0\x01\x00\x01\xf8\x01\x00\x02\xf0\x0d\x00\x07\x00\x01\x0f\xfa'\
+b'\x00\x01\x1f\xfc\x00\x01\x0f\xf8\x00\x85'
+
+_index =\
+b'\x00\x00\x40\x00\x42\x00\x58\x00\x64\x00\xd5\x00\x22\x01\xeb\x01'\
+b'\xa9\x02\xb8\x02\xe4\x02\x10\x03\x4a\x03\x77\x03\x8c\x03\x9b\x03'\
+b'\xa7\x03\x32\x04\x68\x04\x7e\x04\xb8\x04\xe7\x04\x0d\x05\x47\x05'\
+b'\x81\x05\xa5\x05\xdf\x05\x19\x06\xa9\x02\x2f\x06\x75\x06\x97\x06'\
+b'\x00\x00\xda\x06\x3c\x07\x6c\x07\xa6\x07\xd2\x07\x08\x08\x37\x08'\
+b'\x5e\x08\x98\x08\x68\x04\xbe\x08\xea\x08\x56\x09\x7a\x09\xae\x09'\
+b'\x32\x04\xda\x09\x0a\x0a\x54\x0a\x0d\x05\xca\x0a\xf6\x0a\x22\x0b'\
+b'\x71\x0b\xa5\x0b\x4e\x0c\x7e\x0c\x13\x0d\x3f\x0d\xc0\x0d\xec\x0d'\
+b'\x2e\x0e\xa9\x02\x3c\x07\x6c\x07\xa6\x07\xd2\x07\x08\x08\x37\x08'\
+b'\x5e\x08\x98\x08\x68\x04\xbe\x08\xea\x08\x56\x09\x7a\x09\xae\x09'\
+b'\x32\x04\xda\x09\x0a\x0a\x54\x0a\x0d\x05\xca\x0a\xf6\x0a\x22\x0b'\
+b'\x71\x0b\xa5\x0b\x4e\x0c\x7e\x0c\x40\x0e\x6f\x0e\x7b\x0e\xa9\x02'\
+b'\xaa\x0e'
+
+_packed = PackedFont(_font, _index, 48, 32, 126, 12)
+
+get_ch = _packed.get_ch
+get_code = _packed.get_code
@@ -52,6 +52,9 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages        = self.height // 8
         self.buffer       = bytearray(self.pages * self.width)
+        self.flipped      = False            # panel shows the buffer turned 180º
+        self.fresh        = True             # panel RAM not written yet
+        self.tracer       = None             # latency tracer, if tracing
 
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
 
@@ -100,12 +103,10 @@ class SSD1306(framebuf.FrameBuffer):
             # charge pump
             SET_CHARGE_PUMP,
             0x10 if self.external_vcc else 0x14,
-            SET_DISP | 0x01,                 # display on
-        ):  # on
+        ):  # the display goes on with the first frame, see show()
             self.write_cmd(cmd)
 
         self.fill(0)
-        self.show()
 
 
     def poweroff(self):
@@ -166,6 +167,64 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
+        # init_display() scans COM[N]..COM0 with SEG remap: odd = upright
+        self.flipped = not (rotate & 1)
+
+
+    def capture(self):
+        """
+        Snapshot the frame buffer
+
+        Returns : bytes
+            copy of the buffer, MONO_VLSB
+        """
+
+        return bytes(self.buffer)
+
+
+    def save_pbm(self, path, frame = None, native = False):
+        """
+        Write a frame as a PBM image, upright as drawn
+
+        Parameters
+        ----------
+        path : str
+            file to write
+        frame : bytes, optional
+            a capture() snapshot. Default: the current buffer
+        native : bool, optional
+            apply the controller's rotation, i.e. the panel's own orientation
+        """
+
+        from lib.oled.capture import pbm
+
+        flipped = native and self.flipped
+
+        with open(path, 'wb') as f:
+            f.write(pbm(self.buffer if frame is None else frame, self.width, self.height, flipped))
+
+
+    def save_png(self, path, frame = None, native = False):
+        """
+        Write a frame as a PNG image, upright as drawn
+
+        Parameters
+        ----------
+        path : str
+            file to write
+        frame : bytes, optional
+            a capture() snapshot. Default: the current buffer
+        native : bool, optional
+            apply the controller's rotation, i.e. the panel's own orientation
+        """
+
+        from lib.oled.capture import png
+
+        flipped = native and self.flipped
+
+        with open(path, 'wb') as f:
+            f.write(png(self.buffer if frame is None else frame, self.width, self.height, flipped))
+
 
     def show(self):
         """
@@ -190,6 +249,56 @@ class SSD1306(framebuf.FrameBuffer):
 
         self.write_data(self.buffer)
 
+        if self.fresh:                       # no clearing frame at boot: the first one is real
+            self.fresh = False
+            self.poweron()
+
+        if self.tracer is not None:
+            self.tracer.shown()
+
+
+    def show_region(self, x0, x1, page0, page1):
+        """
+        Display part of the buffer content: a window of columns and pages
+
+        Parameters
+        ----------
+        x0 : int
+            first column
+        x1 : int
+            last column
+        page0 : int
+            first page (8 pixel rows)
+        page1 : int
+            last page
+        """
+
+        if self.fresh:                       # the rest of the panel RAM is noise
+            self.show()
+            return
+
+        col_offset = (128 - self.width) // 2 if self.width != 128 else 0
+
+        self.write_cmd(SET_COL_ADDR)
+        self.write_cmd(x0 + col_offset)
+        self.write_cmd(x1 + col_offset)
+        self.write_cmd(SET_PAGE_ADDR)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+
+        mv = memoryview(self.buffer)
+
+        if x0 == 0 and x1 == self.width - 1:
+            self.write_data(mv[page0 * self.width:(page1 + 1) * self.width])
+        else:
+            # the controller keeps its address pointer between transfers
+            for page in range(page0, page1 + 1):
+                start = page * self.width
+                self.write_data(mv[start + x0:start + x1 + 1])
+
+        if self.tracer is not None:
+            self.tracer.shown()
+
 
 class SSD1306_I2C(SSD1306):
     """
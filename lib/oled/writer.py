@@ -25,6 +25,8 @@ and averaging over multiple characters. Proportional fonts were used.
 import os
 import framebuf
 
+from lib.oled.fastpath import truelen, invert as invert_buf
+
 
 __version__ = (0, 5, 1)
 
@@ -81,6 +83,7 @@ class Writer():
             Writer.state[self.devid] = DisplayState()
 
         self.font = font
+        self.get_code = getattr(font, 'get_code', None)    # by byte value, if the font has it
 
         if font.height() >= device.height or font.max_width() >= device.width:
             raise ValueError('Font too large for screen')
@@ -164,6 +167,73 @@ class Writer():
                 self._printchar('\n')
 
 
+    def metrics(self):
+        """
+        Width tables of the font, by character code
+
+        Returns : (bytearray, bytearray)
+            advance of every glyph, and the blank columns on its right
+        """
+
+        font   = self.font
+        widths = bytearray(font.max_ch() + 1)
+        blank  = bytearray(font.max_ch() + 1)
+
+        for code in range(font.min_ch(), font.max_ch() + 1):
+            glyph, ht, wd = font.get_ch(chr(code))
+
+            widths[code] = wd
+            blank[code]  = wd - truelen(glyph, ht, wd)
+
+        return widths, blank
+
+
+    def redraw(self, old, new):
+        """
+        Returns : bool
+            False: a glyph is drawn whole, see Segments.redraw()
+        """
+
+        return False
+
+
+    def printbytes(self, buf, start, end, invert = False):
+        """
+        Print a run of ASCII codes from a buffer, with nothing allocated
+        for the text: glyphs are looked up by code, with the font's
+        get_code() (see tools/fontpy.py), no str made per character.
+        No word wrap, tabs or newlines: for a line known to fit
+
+        Parameters
+        ----------
+        buf : bytes
+            character codes
+        start : int
+            first code printed
+        end : int
+            code after the last one printed
+        invert : bool, optional
+            invert foreground-background colors
+            Default : False
+        """
+
+        get_code = self.get_code
+
+        if get_code is None:                 # a font_to_py module as written
+            for i in range(start, end):
+                self._printchar(chr(buf[i]), invert)
+
+            return
+
+        for i in range(start, end):
+            glyph, char_height, char_width = get_code(buf[i])
+
+            self._fit(glyph, char_height, char_width)
+
+            if self.glyph is not None:
+                self._blit(invert)
+
+
     def _printline(self, string, invert):
         rstr = None
 
@@ -227,30 +297,8 @@ class Writer():
         """
 
         glyph, ht, wd = self.font.get_ch(char)
-        div, mod      = divmod(wd, 8)
-
-        gbytes = div + 1 if mod else div     # No. of bytes per row of glyph
-        mc     = 0                           # Max non-blank column
-        data   = glyph[(wd - 1) // 8]        # Last byte of row 0
-
-        for row in range(ht):  # Glyph row
-            for col in range(wd -1, -1, -1): # Glyph column
-                gbyte, gbit = divmod(col, 8)
 
-                if gbit == 0:                # Next glyph byte
-                    data = glyph[row * gbytes + gbyte]
-
-                if col <= mc:
-                    break
-
-                if data & (1 << (7 - gbit)): # Pixel is lit (1)
-                    mc = col                 # Eventually gives rightmost lit pixel
-                    break
-
-            if mc + 1 == wd:
-                break                        # All done: no trailing space
-
-        return mc + 1
+        return truelen(glyph, ht, wd)        # see lib/oled/fastpath.py
 
 
     def _get_char(self, char, recurse):
@@ -280,6 +328,13 @@ class Writer():
 
         glyph, char_height, char_width = self.font.get_ch(char)
 
+        self._fit(glyph, char_height, char_width)
+
+
+    def _fit(self, glyph, char_height, char_width):
+        """Place a glyph at the text position: self.glyph is None if it is clipped"""
+
+        self.glyph = None
         s  = self._getstate()
         np = None                            # Allow restriction on printable columns
 
@@ -324,18 +379,22 @@ class Writer():
             Default : False
         """
 
-        s = self._getstate()
-
         self._get_char(char, recurse)
 
         if self.glyph is None:
             return  # All done
 
+        self._blit(invert)
+
+
+    def _blit(self, invert):
+        """Draw the glyph placed by _fit() and move the text position on"""
+
+        s   = self._getstate()
         buf = bytearray(self.glyph)
 
         if invert:
-            for i, v in enumerate(buf):
-                buf[i] = 0xFF & ~ v
+            invert_buf(buf)
 
         fbc = framebuf.FrameBuffer(buf, self.clip_width, self.char_height, self.map)
 
@@ -12,12 +12,19 @@ class BUZZER:
     doubleBeep()
     errorBeep()
     halfSecondBeep()
+    play(tone)
     """
 
     duty_cycle  = 50000
     normal_freq = 3000
     error_freq  = 500
 
+    # tones by number, as stored in program tables
+    TONE_SHORT  = 0
+    TONE_DOUBLE = 1
+    TONE_ERROR  = 2
+    TONE_HALF   = 3
+
     def __init__(self, buzzer_pin = 15):
         """
         Initialize the buzzer
@@ -64,3 +71,23 @@ class BUZZER:
         self.buzz.duty_u16(BUZZER.duty_cycle)
         sleep_ms(500)
         self.buzz.duty_u16(0)
+
+
+    def play(self, tone):
+        """
+        Sound a tone by number
+
+        Parameters
+        ----------
+        tone : int
+            one of the TONE_* constants
+        """
+
+        if tone == BUZZER.TONE_DOUBLE:
+            self.doubleBeep()
+        elif tone == BUZZER.TONE_ERROR:
+            self.errorBeep()
+        elif tone == BUZZER.TONE_HALF:
+            self.halfSecondBeep()
+        else:
+            self.shortBeep()
@@ -1,50 +1,276 @@
 from config        import *
 from lib.io.screen import Screen
+from lib.core.timers import TimerManager
+from lib.core.stopwatch import Stopwatch
+from lib.core.programs import ProgramEngine, load_table
+from lib.core.presets import Presets
+from lib.core.journal import Journal
+from lib.core.readyat import ReadyAt
+from lib.core.transitions import *
 
 from utime         import sleep_ms
+from array         import array
 
-import oled.seven_segment_48 as font
 
-
-# init classes
+# init classes. Only the display is set up before the first frame, see the end
+ssd     = devices.ssd
+writer  = devices.writer
 screen  = Screen(ssd, writer, rotate = True) # set rotate to False if you don't need to rotate screen
+timers  = TimerManager(MAX_TIMERS, DEFAULT_TIMER)
+watch   = Stopwatch(MAX_LAPS)
+programs = ProgramEngine(load_table(PROGRAMS_FILE), timers, BUZZER.TONE_DOUBLE)
+presets = Presets(PRESETS_FILE, MAX_PRESETS)
+journal = Journal(JOURNAL_FILE, JOURNAL_SLOTS, JOURNAL_MS, timers, programs) if JOURNAL_MS else None
+
+OTHERS         = 'others'                    # old_aux: the aux line lists the other timers
+TENTHS_MS      = 59900                       # SS.t from here: a tenth more would read 60.0
 
 # globals
 state          = TIMER_PAUSED                # initial state
 mode           = RUN_MODE                    # initial mode
 current_time   = DEFAULT_TIMER               # time in seconds
 old_time       = 0                           # a holder to watch for time changes
+old_tenths     = -1                          # same, in tenths (SHOW_TENTHS)
+selected       = 0                           # timer on display
+old_aux        = None                        # last text in the aux line, OTHERS for the other timers
+others_times   = array('l', [0] * MAX_TIMERS) # seconds left on the timers listed there
+others_of      = -1                          # the timer on display then
+others_count   = 0                           # and how many were listed
+old_bar        = -1                          # mode whose setup underline is drawn, -1 for none
 sw_pressed     = False                       # flag for rotary switch pressed
 is_lng_press   = False                       # flag for long press
 bat_chrg       = 0                           # battery charge (percentage)
-
-
-buzzer.shortBeep()                           # hello! we are open for business
+tracer         = None                        # latency tracer (TRACE_LATENCY)
+preset         = -1                          # preset menu entry, -1 for save, -2 for "ready at"
+ready_target   = 0                           # "ready at" time being set, minutes since midnight
+menu_time      = 0                           # time on display when the menu opened
 
 
 def endloop():
     """Timer finished. Make some noise."""
 
-    buzzer.doubleBeep()
-    screen.end_msg()
+    if screen.end_msg():
+        buzzer.play(programs.alarm_tone(selected))
 
 
 def update_time():
     """Update the time on screen"""
 
-    global old_time
+    global old_time, old_tenths, old_aux
+
+    if tenths_shown():
+        update_tenths()
+        return
+
+    shown = ready_target if mode == SET_READY else current_time
 
-    if old_time == current_time:
+    if old_time == shown:
         return
 
-    old_time = current_time
+    old_time   = shown
+    old_tenths = -1
 
     if mode == RUN_MODE:
         screen.clear_all()
+        old_aux = None
     else:
         screen.clear_main()
 
-    screen.print_timer(current_time)
+    screen.print_timer(shown)
+
+
+def tenths_shown(ahead = 0):
+    """
+    Whether the timer on display counts in tenths: under a minute once
+    rounded up to a tenth, as update_tenths() shows it
+
+    Parameters
+    ----------
+    ahead : int, optional
+        ms: whether it will within that much. Default 0, now
+
+    Returns : bool
+    """
+
+    return SHOW_TENTHS and mode == RUN_MODE and timers.remaining_ms(selected) - ahead <= TENTHS_MS
+
+
+def update_tenths():
+    """Update the time on screen as SS.t, only the glyphs that changed"""
+
+    global old_time, old_tenths
+
+    tenths = (timers.remaining_ms(selected) + 99) // 100
+
+    if old_tenths == tenths:
+        return
+
+    old_tenths = tenths
+    old_time   = -1
+
+    screen.print_timer(tenths // 10, tenths % 10)
+
+
+def select(i):
+    """
+    Put timer `i` on display; the slot after the last timer is the stopwatch
+
+    Parameters
+    ----------
+    i : int
+        timer index, MAX_TIMERS for the stopwatch
+    """
+
+    global selected, current_time, state, mode
+
+    selected = i
+
+    if i == MAX_TIMERS:
+        mode  = STOPWATCH
+        state = TIMER_RUNNING if watch.running else TIMER_PAUSED
+        invalidate(DIRTY_TIME | DIRTY_AUX | DIRTY_BAR)
+        screen.clear_all()
+        return
+
+    mode         = RUN_MODE
+    current_time = timers.left(i)
+    state        = timers.state(i)
+    invalidate(DIRTY_TIME | DIRTY_AUX | DIRTY_BAR)
+
+
+def restart(seconds):
+    """
+    Action: the alarm was snoozed or the timer repeated. Back to counting
+    down, redrawing over the finished message only what differs
+
+    Parameters
+    ----------
+    seconds : int
+        time on the timer
+    """
+
+    global state, current_time, old_time, old_tenths
+
+    state        = TIMER_RUNNING
+    current_time = seconds
+    old_time     = seconds
+    old_tenths   = -1
+
+    screen.restart(seconds)
+
+
+def snooze():
+    """Action: rotary turned on the alarm, ring again in SNOOZE_TIME"""
+
+    timers.extend(selected, SNOOZE_TIME)
+    restart(SNOOZE_TIME)
+
+
+def repeat():
+    """Action: long press on the alarm, run the timer again for the time it was set to"""
+
+    if programs.active(selected) >= 0:
+        programs.rewind(selected)            # from its first stage
+    else:
+        timers.reset(selected)
+
+    timers.start(selected)
+    restart(timers.left(selected))
+
+
+def select_next(step):
+    """Action: rotary turned in RUN_MODE, show the next/previous timer or the stopwatch"""
+
+    select((selected + step) % (MAX_TIMERS + 1))
+
+
+def update_stopwatch():
+    """Update the stopwatch on screen, SS.t under a minute"""
+
+    global old_time, old_aux
+
+    tenths = watch.tenths()
+    shown  = tenths if tenths < 600 else tenths - tenths % 10   # SS.t, then MM:SS by the second
+
+    if old_time != shown:
+        old_time = shown
+        screen.print_timer(min(shown // 10, MAX_TIME), shown % 10)
+
+    if old_aux != watch.laps:
+        old_aux = watch.laps
+        screen.print_lap(watch.laps, watch.split(watch.laps))
+
+
+def update_others():
+    """Update the compact list of other timers, or the program, in the aux line"""
+
+    global old_aux, others_of, others_count
+
+    if mode == STOPWATCH:
+        return
+
+    if mode == SET_PRESET:
+        key = (selected, preset, mode)
+
+        if key == old_aux:
+            return
+
+        old_aux = key
+
+        if preset == -2:
+            screen.print_preset("READY AT")
+        else:
+            screen.print_preset(presets.name(preset) if preset >= 0 else None)
+        return
+
+    if mode == SET_READY or readyat.slot == selected:
+        minutes = readyat.left(ready_target) // 60 if mode == SET_READY else -1
+        key     = (selected, readyat.target, ready_target, minutes, mode)
+
+        if key == old_aux:
+            return
+
+        old_aux = key
+        screen.print_ready(ready_target if mode == SET_READY else readyat.target, minutes)
+        return
+
+    p = programs.active(selected)
+
+    if mode == SET_PROGRAM or p >= 0:
+        key = (selected, p, programs.stage[selected], mode)
+
+        if key == old_aux:
+            return
+
+        old_aux = key
+        screen.print_program(
+            programs.table.name(p) if p >= 0 else None,
+            -1 if mode == SET_PROGRAM else programs.stage[selected],
+            programs.table.stages(p) if p >= 0 else 0)
+        return
+
+    n = timers.others(selected)
+
+    if not n and selected == 0:
+        old_aux = None
+        return
+
+    same = old_aux == OTHERS and others_of == selected and others_count == n
+
+    for k in range(n):                       # compared in place: nothing allocated per pass
+        t = timers.left(timers.order[k])
+
+        if others_times[k] != t:
+            others_times[k] = t
+            same            = False
+
+    if same:
+        return
+
+    old_aux      = OTHERS
+    others_of    = selected
+    others_count = n
+    screen.print_others(selected, others_times, n)
 
 
 def seconds_up():
@@ -54,7 +280,7 @@ def seconds_up():
 
     current_time += 1
 
-    if current_time == MAX_TIME:
+    if current_time > MAX_TIME:
         current_time = MAX_TIME
 
 
@@ -76,7 +302,7 @@ def minutes_up():
 
     current_time += 60
 
-    if current_time == MAX_TIME:
+    if current_time > MAX_TIME:
         current_time = MAX_TIME
 
 
@@ -87,91 +313,292 @@ def minutes_down():
 
     current_time -= 60
 
-    if current_time < 0:
+    if current_time < 1:
         current_time = 1
 
 
-def manage_mode():
-    """Manage App Mode"""
+def pick_program(step):
+    """Action: rotary turned in SET_PROGRAM, put the next/previous program on the timer"""
 
-    global mode
+    global current_time
 
-    if mode == SET_MINUTES:
-        mode = SET_SECONDS
-        screen.set_seconds()
+    p = (programs.active(selected) + 1 + step) % (programs.table.count + 1) - 1
 
-    elif mode == SET_SECONDS:
-        mode = RUN_MODE
-        screen.clear_underline()
+    programs.load(selected, p)
+    current_time = timers.left(selected)
+
+
+def open_presets():
+    """Action: long press in RUN_MODE, open the preset menu on its save entry"""
+
+    global preset, menu_time
+
+    preset    = -1
+    menu_time = current_time
+
+
+def pick_preset(step):
+    """Action: rotary turned in SET_PRESET, put the next/previous preset on the timer"""
+
+    global preset, current_time
+
+    preset = (preset + 2 + step) % (presets.count() + 2) - 2
+
+    current_time = presets.seconds(preset) if preset >= 0 else menu_time
+    programs.clear(selected)
+    timers.set(selected, current_time)
 
+
+def save_preset():
+    """Action: short press on the save entry, keep the time on display as a preset"""
+
+    name = "{:02d}:{:02d}".format(current_time // 60, current_time % 60)
+
+    if presets.save(name, current_time):
+        buzzer.shortBeep()
     else:
-        mode = SET_MINUTES
-        screen.set_minutes()
+        buzzer.errorBeep()                   # store is full
 
 
-def manage_cw():
-    """Action: Rotary was turned clockwise"""
+def open_ready():
+    """Action: short press on the "ready at" entry, set a time of day, at first when the timer on display would end"""
 
-    if mode == SET_MINUTES:
-        minutes_up()
+    global mode, ready_target
 
-    elif mode == SET_SECONDS:
-        seconds_up()
+    mode         = SET_READY
+    ready_target = (readyat.now() + current_time + 59) // 60 % (24 * 60)
+
+
+def ready_step(step):
+    """Action: rotary turned in SET_READY, one minute later/earlier, up to MAX_TIME from now"""
 
+    global ready_target
 
-def manage_ccw():
-    """Action: Rotary was turned counter-clockwise"""
+    target = (ready_target + step) % (24 * 60)
 
-    if mode == SET_MINUTES:
+    if 0 < readyat.left(target) <= MAX_TIME:
+        ready_target = target
+
+
+def turn_minutes(step):
+    """Action: rotary turned in SET_MINUTES, a minute more/less on the timer"""
+
+    if step > 0:
+        minutes_up()
+    else:
         minutes_down()
 
-    elif mode == SET_SECONDS:
+    programs.clear(selected)
+    timers.set(selected, current_time)
+
+
+def turn_seconds(step):
+    """Action: rotary turned in SET_SECONDS, a second more/less on the timer"""
+
+    if step > 0:
+        seconds_up()
+    else:
         seconds_down()
 
+    programs.clear(selected)
+    timers.set(selected, current_time)
 
-def short_press():
-    """Action: Rotary button was shortly pressed"""
 
-    global state, mode, current_time
+def toggle_watch():
+    """Action: short press on the stopwatch, start/stop it"""
 
-    if state == TIMER_RUNNING:
+    global state
+
+    if watch.running:
+        watch.stop()
         state = TIMER_PAUSED
+    else:
+        watch.start()
+        state = TIMER_RUNNING
 
-    elif state == TIMER_PAUSED:
-        if mode == SET_MINUTES or mode == SET_SECONDS:
-            mode = RUN_MODE
-            screen.clear_underline()
 
-        state = TIMER_RUNNING
+def pause():
+    """Action: short press on a running timer"""
 
-    elif state == TIMER_FINISHED:
-        current_time = DEFAULT_TIMER
-        state = TIMER_PAUSED
+    global state, current_time
 
+    timers.pause(selected)
+    current_time = timers.left(selected)     # it may have ticked since the last pass
+    state        = timers.state(selected)    # still running if it is due to ring
 
-def long_press():
-    """Action: Rotary button was long pressed"""
 
-    global mode, is_lng_press
+def start():
+    """Action: short press on a paused timer"""
 
-    if state == TIMER_RUNNING:
+    global state
+
+    timers.start(selected)
+    state = TIMER_RUNNING
+
+
+def choose_preset():
+    """Action: short press in SET_PRESET, on "ready at", save or a preset"""
+
+    global mode
+
+    if preset == -2:
+        open_ready()
         return
 
-    is_lng_press = True
+    if preset == -1:
+        save_preset()
+    else:
+        start()
 
-    tim.deinit()
+    mode = RUN_MODE
 
-    if mode == SET_MINUTES:
-        mode = SET_SECONDS
-        screen.set_seconds()
 
-    elif mode == SET_SECONDS:
-        mode = RUN_MODE
-        screen.clear_underline()
+def arm_ready():
+    """Action: short press in SET_READY, count down to the time of day set"""
+
+    global current_time, state, mode, ready_target
+
+    if not 0 < readyat.left(ready_target) <= MAX_TIME:
+        buzzer.errorBeep()                   # the time went by while it was being set
+        ready_target = (readyat.now() + 60 + 59) // 60 % (24 * 60)
+        return
+
+    programs.clear(selected)
+    readyat.arm(selected, ready_target)
+    current_time = readyat.seconds()
+    state        = TIMER_RUNNING
+    mode         = RUN_MODE
+
+
+def dismiss():
+    """Action: short press on the alarm, rewind the program or back to the default time"""
 
+    global current_time, state
+
+    screen.stop_blink()
+
+    if programs.active(selected) >= 0:
+        programs.rewind(selected)            # ready to run the program again
     else:
-        mode = SET_MINUTES
+        timers.set(selected, DEFAULT_TIMER)
+
+    current_time = timers.left(selected)
+    state = TIMER_PAUSED
+
+
+# transitions. Later ones win over earlier ones for the same entry
+ANY   = tuple(range(SET_READY + 1))
+SHOWN = (TIMER_RUNNING, TIMER_PAUSED)        # what a timer on display can be, bar ringing
+IDLE  = (TIMER_PAUSED,)
+
+ui = Transitions(SET_READY + 1, TIMER_FINISHED + 1)
+
+for ev, step in ((EV_CW, 1), (EV_CCW, -1)):
+    ui.on(ev, (RUN_MODE, STOPWATCH), SHOWN, select_next, step)
+    ui.on(ev, (SET_PRESET,),  SHOWN, pick_preset, step)
+    ui.on(ev, (SET_READY,),   SHOWN, ready_step, step)
+    ui.on(ev, (SET_PROGRAM,), SHOWN, pick_program, step)
+    ui.on(ev, (SET_MINUTES,), SHOWN, turn_minutes, step)
+    ui.on(ev, (SET_SECONDS,), SHOWN, turn_seconds, step)
+    ui.on(ev, ANY, (TIMER_FINISHED,), snooze, dirty = DIRTY_AUX)
+
+ui.on(EV_CW,  (STOPWATCH,), (TIMER_RUNNING,), watch.lap)
+ui.on(EV_CCW, (STOPWATCH,), (TIMER_RUNNING,), None)
+
+ui.on(EV_SHORT, ANY, (TIMER_RUNNING,), pause)
+ui.on(EV_SHORT, (RUN_MODE,), IDLE, start)
+ui.on(EV_SHORT, (SET_PROGRAM, SET_MINUTES, SET_SECONDS), IDLE, start, to = RUN_MODE, dirty = DIRTY_BAR)
+ui.on(EV_SHORT, (SET_PRESET,), IDLE, choose_preset)
+ui.on(EV_SHORT, (SET_READY,), IDLE, arm_ready)
+ui.on(EV_SHORT, (STOPWATCH,), SHOWN, toggle_watch)
+ui.on(EV_SHORT, ANY, (TIMER_FINISHED,), dismiss)
+
+# a long press does nothing while running; programs are loaded once, at boot
+ui.on(EV_LONG, (RUN_MODE,), IDLE, open_presets, to = SET_PRESET)
+ui.on(EV_LONG, (SET_READY, SET_PROGRAM), IDLE, None, to = SET_MINUTES, dirty = DIRTY_BAR)
+ui.on(EV_LONG, (SET_PRESET,), IDLE, None, to = SET_PROGRAM if programs.table.count else SET_MINUTES, dirty = DIRTY_BAR)
+ui.on(EV_LONG, (SET_MINUTES,), IDLE, None, to = SET_SECONDS, dirty = DIRTY_BAR)
+ui.on(EV_LONG, (SET_SECONDS,), IDLE, None, to = RUN_MODE, dirty = DIRTY_BAR)
+ui.on(EV_LONG, (STOPWATCH,), IDLE, watch.reset)
+ui.on(EV_LONG, ANY, (TIMER_FINISHED,), repeat, dirty = DIRTY_AUX)
+
+
+def dispatch(event):
+    """
+    Run the transition for `event` in the current mode and state
+
+    Parameters
+    ----------
+    event : int
+        EV_*
+    """
+
+    global mode
+
+    i = ui.fire(event, mode, state)
+
+    if ui.to[i] != SAME:
+        mode = ui.to[i]
+
+    if ui.dirty[i]:
+        invalidate(ui.dirty[i])
+
+
+def invalidate(dirty):
+    """
+    Have screen regions redrawn
+
+    Parameters
+    ----------
+    dirty : int
+        DIRTY_* flags. The underline is redrawn right away, the rest on the next loop
+    """
+
+    global old_time, old_tenths, old_aux
+
+    if dirty & DIRTY_TIME:
+        old_time   = -1
+        old_tenths = -1
+
+    if dirty & DIRTY_AUX:
+        old_aux = None
+
+    if dirty & DIRTY_BAR:
+        update_bar()
+
+
+def update_bar():
+    """Draw the setup underline under what is being set, if that changed"""
+
+    global old_bar
+
+    bar = mode if mode == SET_MINUTES or mode == SET_SECONDS else -1
+
+    if old_bar == bar:
+        return
+
+    old_bar = bar
+
+    if bar == SET_MINUTES:
         screen.set_minutes()
+    elif bar == SET_SECONDS:
+        screen.set_seconds()
+    else:
+        screen.clear_underline()
+
+
+def long_press():
+    """Action: Rotary button was long pressed"""
+
+    global is_lng_press
+
+    if state == TIMER_RUNNING:
+        return
+
+    is_lng_press = True
+
+    tim.deinit()
+    dispatch(EV_LONG)
 
     sleep_ms(300)
 
@@ -205,11 +632,14 @@ def rotary_changed(change):
 
     global sw_pressed, is_lng_press
 
+    if tracer is not None:
+        tracer.handled()
+
     if change == Rotary.ROT_CW:
-        manage_cw()
+        dispatch(EV_CW)
 
     elif change == Rotary.ROT_CCW:
-        manage_ccw()
+        dispatch(EV_CCW)
 
     elif change == Rotary.SW_PRESS:
         manage_button()
@@ -220,10 +650,13 @@ def rotary_changed(change):
         else:
             tim.deinit()
             is_lng_press = False
-            short_press()
+            dispatch(EV_SHORT)
 
         sw_pressed = False
 
+    if tracer is not None:
+        tracer.updated()
+
 
 def check_pwr():
     """
@@ -242,7 +675,8 @@ def check_pwr():
         vlts = adc0
         chrg = int(((adc0 - BATTERY_MIN)) / (BATTERY_MAX - BATTERY_MIN) * 100)
 
-    screen.print_voltage(str("{:.1f}".format(vlts)), usb, chrg)
+    if old_aux is None:                      # aux line is not showing timers
+        screen.print_voltage(str("{:.1f}".format(vlts)), usb, chrg)
 
     if vlts < BATTERY_MIN:
         screen.clear_all()
@@ -253,28 +687,114 @@ def check_pwr():
             pass
 
 
-rotary.add_handler(rotary_changed)           # Register Rotary encoder ISR
 
+def loop():
+    """One pass of the main loop"""
 
-if __name__ == '__main__':
-    """Main loop"""
+    global current_time, state
 
-    while True:
-        check_pwr()
+    if tracer is not None:
+        tracer.poll()
+
+    ringing = programs.poll()
+
+    if programs.tone >= 0:                   # a program moved on to its next stage
+        buzzer.play(programs.tone)
+        programs.tone = -1
+
+    if state != TIMER_FINISHED and ringing >= 0:
+        select(ringing)
+
+    readyat.poll()
+
+    wait = 0
+
+    if mode == STOPWATCH:
+        update_stopwatch()
 
         if state == TIMER_RUNNING:
-            current_time -= 1
-            # meh! calibrated with my phone. accurate enough for a kitchen timer tho
-            sleep_ms(934)
+            wait = min(watch.wait(), timers.wait(-1))
 
-            if current_time <= 0:
-                state = TIMER_FINISHED
+    elif state == TIMER_RUNNING:
+        if readyat.slot == selected:
+            current_time = readyat.seconds()     # from the RTC, not counted down
+        else:
+            current_time = timers.left(selected)
 
-            else:
-                update_time()
+        update_time()
+        wait = timers.wait(selected, step = 100 if tenths_shown(1000) else 1000)   # wake for 59.9
 
-        elif state == TIMER_PAUSED:
-            update_time()
+    elif state == TIMER_PAUSED:
+        update_time()
 
-        elif state == TIMER_FINISHED:
-            endloop()
+    elif state == TIMER_FINISHED:
+        check_pwr()
+        endloop()
+        wait = min(screen.blink_wait(), timers.wait(-1))
+
+    if state != TIMER_FINISHED:
+        update_others()                      # after the time: a new one clears the aux line
+        check_pwr()
+
+    if journal is not None:
+        journal.poll(selected)
+
+    if wait:
+        sleep_ms(wait)
+
+
+# boot: the time on screen first, then the rest of the hardware
+devices.mark('classes')
+
+if journal is not None and journal.restore():
+    select(journal.selected)                 # back where the power went off
+
+update_time()
+devices.mark('1st frame')
+
+rotary  = devices.rotary
+tim     = devices.tim
+buzzer  = devices.buzzer
+rtc     = devices.rtc
+Vin     = devices.Vin
+Vsys    = devices.Vsys
+readyat = ReadyAt(rtc, timers)
+
+if journal is not None:
+    journal.readyat = readyat
+
+    # a "ready at" timer came back as a countdown: back on the RTC, unless the target went by
+    if (journal.ready >= 0 and timers.state(journal.ready) == TIMER_RUNNING and
+            0 < readyat.left(journal.target) <= MAX_TIME):
+        readyat.arm(journal.ready, journal.target)
+
+rotary.add_handler(rotary_changed)           # Register Rotary encoder ISR
+buzzer.shortBeep()                           # hello! we are open for business
+devices.mark('ready')
+
+if PROFILE_BOOT:
+    devices.report()
+
+
+if PROFILE_HEAP:
+    from lib.debug.heap import profiler
+
+    profiler.every = 60                      # report once a minute
+    profiler.instrument(globals())
+
+if RECORD_INPUT:
+    from lib.debug.recorder import recorder
+
+    recorder.instrument(globals())
+
+if TRACE_LATENCY:
+    from lib.debug.latency import tracer
+
+    tracer.attach(globals())
+
+
+if __name__ == '__main__':
+    """Main loop"""
+
+    while True:
+        loop()
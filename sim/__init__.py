@@ -0,0 +1,163 @@
+"""
+sim
+Host simulation of the MicroPython modules the kitchen timer imports
+
+Call install() before importing config, main or anything under lib/:
+
+    import sim
+    sim.install()
+
+    import main                              # runs on CPython, virtual clock
+
+machine, framebuf, utime, micropython and gc are then served from this
+package, and the repo root and lib/ are on sys.path the same way they
+are on the Pico filesystem. The files the firmware keeps its state in
+(STATE_FILES, the journal) go to a temporary directory of the process,
+STATE_DIR, not the working directory.
+"""
+
+import atexit
+import importlib.abc
+import importlib.machinery
+import os
+import shutil
+import sys
+import tempfile
+
+from sim import micropython
+from sim import utime
+from sim import framebuf
+from sim import machine
+from sim import gc
+
+from sim.utime import Stop
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Raw ADC reading for a 3.9 V battery behind the 1K/2K divider
+BATTERY_RAW = 25816
+
+_MODULES = {
+    'micropython': micropython,
+    'utime': utime,
+    'framebuf': framebuf,
+    'machine': machine,
+    'gc': gc,
+}
+
+_APP = ('config', 'main')
+
+# Files the firmware writes on its own to keep state across power cycles:
+# config name -> file, kept in STATE_DIR rather than the working directory
+STATE_FILES = {'JOURNAL_FILE': 'journal.bin'}
+
+STATE_DIR = None                             # made by install(), removed at exit
+
+
+def install(fresh = True):
+    """
+    Serve the simulated modules and put the app on sys.path
+
+    Parameters
+    ----------
+    fresh : bool, optional
+        see reset()
+    """
+
+    for name, module in _MODULES.items():
+        sys.modules[name] = module
+
+    for path in (os.path.join(ROOT, 'lib'), ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    _state_dir()
+
+    reset(fresh = fresh)
+
+
+def _state_dir():
+    """Make STATE_DIR, and have config point its STATE_FILES there"""
+
+    global STATE_DIR
+
+    if STATE_DIR is not None:
+        return
+
+    STATE_DIR = tempfile.mkdtemp(prefix = 'sim-')
+    atexit.register(shutil.rmtree, STATE_DIR, True)
+    sys.meta_path.insert(0, _ConfigFinder())
+
+
+class _ConfigFinder(importlib.abc.MetaPathFinder):
+    """Finds config.py as usual, with a loader that moves the STATE_FILES"""
+
+    def find_spec(self, name, path, target = None):
+        if name != 'config':
+            return None
+
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+
+        if spec is not None:
+            spec.loader = _ConfigLoader(spec.loader)
+
+        return spec
+
+
+class _ConfigLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self.loader = loader
+
+
+    def create_module(self, spec):
+        return None
+
+
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+
+        for name, file in STATE_FILES.items():
+            setattr(module, name, os.path.join(STATE_DIR, file))
+
+
+def reset(epoch = 0, fresh = True):
+    """
+    Back to power-on: clock at zero, no timers, no pending callbacks,
+    and app modules dropped so the next import starts from scratch
+
+    Parameters
+    ----------
+    epoch : int, optional
+        wall-clock seconds (since 2000-01-01) at virtual time zero
+    fresh : bool, optional
+        a board straight from flashing: the STATE_FILES a previous run
+        left in STATE_DIR are deleted. False for a power cycle.
+        Default True
+    """
+
+    if fresh and STATE_DIR is not None:
+        for file in STATE_FILES.values():
+            path = os.path.join(STATE_DIR, file)
+
+            if os.path.exists(path):
+                os.remove(path)
+
+    utime.reset(epoch)
+    micropython.reset()
+
+    machine.Pin.registry.clear()
+    machine.ADC.preset = {26: BATTERY_RAW, 29: BATTERY_RAW}
+
+    for name in list(sys.modules):
+        if app_module(name):
+            del sys.modules[name]
+
+
+def app_module(name):
+    """
+    Returns : bool
+        module `name` is part of the firmware, imported from the repo
+    """
+
+    return name in _APP or name == 'lib' or name.startswith(('lib.', 'io.', 'oled.', 'sound.'))
@@ -0,0 +1,44 @@
+"""
+Run the firmware on the host
+
+    python -m sim [--seconds N] [--boot]
+
+Executes main.py as __main__ against the simulated hardware until the
+virtual clock reaches N seconds, then prints what went over the bus.
+--boot also prints the boot-time breakdown, in virtual time.
+"""
+
+import argparse
+import os
+import runpy
+
+import sim
+
+
+def run():
+    parser = argparse.ArgumentParser(prog = 'python -m sim')
+    parser.add_argument('--seconds', type = int, default = 10, help = 'virtual seconds to run')
+    parser.add_argument('--boot', action = 'store_true', help = 'print the boot-time breakdown')
+    args = parser.parse_args()
+
+    sim.install()
+    sim.utime.stop_at(args.seconds * 1000)
+
+    try:
+        runpy.run_path(os.path.join(sim.ROOT, 'main.py'), run_name = '__main__')
+    except sim.Stop:
+        pass
+
+    import config
+
+    if args.boot:
+        config.devices.report()
+
+    i2c = config.ssd.i2c
+    print('virtual ms   : {}'.format(sim.utime.now_us() // 1000))
+    print('transactions : {}'.format(i2c.transactions))
+    print('bytes        : {}'.format(i2c.bytes_written))
+
+
+if __name__ == '__main__':
+    run()
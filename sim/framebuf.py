@@ -0,0 +1,445 @@
+"""
+framebuf.py
+Pure-Python FrameBuffer with the same memory layouts as MicroPython's
+
+MONO_VLSB : byte per 8 vertical pixels, LSB on top (SSD1306 native)
+MONO_HLSB : byte per 8 horizontal pixels, MSB on the left (font_to_py)
+MONO_HMSB : byte per 8 horizontal pixels, LSB on the left
+
+text() uses a classic 5x7 font in 8x8 cells. It is close to, but not
+a byte-exact copy of, the font built into the firmware.
+"""
+
+MONO_VLSB = 0
+MVLSB     = MONO_VLSB
+RGB565    = 1
+GS4_HMSB  = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB  = 5
+GS8       = 6
+
+
+class FrameBuffer:
+    """
+    Monochrome frame buffer over a caller supplied bytearray
+    """
+
+    def __init__(self, buffer, width, height, format, stride = None):
+        if format not in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            raise ValueError('invalid format')
+
+        if stride is None:
+            stride = width
+
+        if format != MONO_VLSB:
+            stride = (stride + 7) & ~7
+
+        self._buf    = buffer
+        self._w      = width
+        self._h      = height
+        self._format = format
+        self._stride = stride
+
+
+    def _get(self, x, y):
+        if self._format == MONO_VLSB:
+            return (self._buf[(y >> 3) * self._stride + x] >> (y & 7)) & 1
+
+        offset = x & 7
+
+        if self._format == MONO_HLSB:
+            offset = 7 - offset
+
+        return (self._buf[(x + y * self._stride) >> 3] >> offset) & 1
+
+
+    def _set(self, x, y, c):
+        if self._format == MONO_VLSB:
+            index = (y >> 3) * self._stride + x
+            offset = y & 7
+        else:
+            index = (x + y * self._stride) >> 3
+            offset = x & 7
+
+            if self._format == MONO_HLSB:
+                offset = 7 - offset
+
+        if c & 1:
+            self._buf[index] |= 1 << offset
+        else:
+            self._buf[index] &= ~(1 << offset) & 0xFF
+
+
+    def pixel(self, x, y, c = None):
+        if not (0 <= x < self._w and 0 <= y < self._h):
+            return None
+
+        if c is None:
+            return self._get(x, y)
+
+        self._set(x, y, c)
+
+
+    def fill(self, c):
+        if self._format == MONO_VLSB and self._stride == self._w:
+            value = 0xFF if c & 1 else 0x00
+            size = ((self._h + 7) >> 3) * self._stride
+
+            self._buf[:size] = bytes((value,)) * size
+
+            return
+
+        self.fill_rect(0, 0, self._w, self._h, c)
+
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self._w)
+        y1 = min(y + h, self._h)
+
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        if self._format == MONO_VLSB:        # a byte mask per page, not pixel by pixel
+            buf = self._buf
+
+            for page in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+                top  = max(y0 - page * 8, 0)
+                mask = ((1 << (min(y1 - page * 8, 8))) - 1) & ~((1 << top) - 1)
+                row  = page * self._stride
+
+                if mask == 0xFF:
+                    buf[row + x0:row + x1] = (b'\xff' if c & 1 else b'\x00') * (x1 - x0)
+                elif c & 1:
+                    for i in range(row + x0, row + x1):
+                        buf[i] |= mask
+                else:
+                    for i in range(row + x0, row + x1):
+                        buf[i] &= ~mask & 0xFF
+
+            return
+
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+
+    def rect(self, x, y, w, h, c, f = False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+
+        while True:
+            self.pixel(x1, y1, c)
+
+            if x1 == x2 and y1 == y2:
+                break
+
+            e2 = 2 * err
+
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+
+    def scroll(self, xstep, ystep):
+        if xstep < 0:
+            sx, xend, dx = 0, self._w + xstep, 1
+        else:
+            sx, xend, dx = self._w - 1, xstep - 1, -1
+
+        if ystep < 0:
+            y, yend, dy = 0, self._h + ystep, 1
+        else:
+            y, yend, dy = self._h - 1, ystep - 1, -1
+
+        while y != yend:
+            x = sx
+
+            while x != xend:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+
+            y += dy
+
+
+    def blit(self, fbuf, x, y, key = -1, palette = None):
+        if (x >= self._w or y >= self._h or
+                -x >= fbuf._w or -y >= fbuf._h):
+            return
+
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0end = min(self._w, x + fbuf._w)
+        y0end = min(self._h, y + fbuf._h)
+
+        if self._format == MONO_VLSB and palette is None:
+            self._blit_vlsb(fbuf, x0, y0, x1, y1, x0end, y0end, key)
+            return
+
+        cy1 = y1
+
+        for cy0 in range(y0, y0end):
+            cx1 = x1
+
+            for cx0 in range(x0, x0end):
+                col = fbuf._get(cx1, cy1)
+
+                if palette is not None:
+                    col = palette.pixel(col, 0)
+
+                if col != key:
+                    self._set(cx0, cy0, col)
+
+                cx1 += 1
+
+            cy1 += 1
+
+
+    def _blit_vlsb(self, fbuf, x0, y0, x1, y1, x0end, y0end, key):
+        """blit() onto MONO_VLSB a page at a time, the same mask for every column"""
+
+        buf    = self._buf
+        stride = self._stride
+        rows   = y0end - y0
+        full   = ((1 << rows) - 1) << (y0 & 7)
+        index  = (y0 >> 3) * stride + x0
+
+        for ink in _pages(fbuf, x1, y1, rows, y0 & 7, x0end - x0):
+            mask = full & 0xFF
+
+            if key == -1 and mask == 0xFF:   # whole bytes: a slice
+                buf[index:index + len(ink)] = ink
+            else:
+                for i in range(len(ink)):
+                    b = ink[i]
+
+                    if key == 0:             # only the set pixels land
+                        m = b
+                    elif key == 1:           # only the clear pixels land
+                        m = mask & ~b
+                    else:
+                        m = mask
+
+                    if m:
+                        buf[index + i] = (buf[index + i] & ~m | b & m) & 0xFF
+
+            full  >>= 8
+            index  += stride
+
+
+    def text(self, s, x0, y0, c = 1):
+        if self._format != MONO_VLSB:
+            self._text(s, x0, y0, c)
+            return
+
+        buf   = self._buf
+        page  = y0 >> 3
+        shift = y0 - page * 8
+        spans = ((page, _rows(self._h, page)), (page + 1, _rows(self._h, page + 1)))
+
+        for ch in s:
+            code = ord(ch)
+
+            if code < 32 or code > 126:
+                code = 127
+
+            glyph = _FONT[(code - 32) * 5:(code - 32) * 5 + 5] if code != 127 else b'\x7f' * 5
+
+            for j, vline in enumerate(glyph):
+                x = x0 + 1 + j
+
+                if not 0 <= x < self._w:
+                    continue
+
+                bits = vline << shift        # over two pages at most
+
+                for p, rows in spans:
+                    ink = bits & 0xFF & rows
+                    bits >>= 8
+
+                    if ink:
+                        i = p * self._stride + x
+
+                        if c & 1:
+                            buf[i] |= ink
+                        else:
+                            buf[i] &= ~ink & 0xFF
+
+            x0 += 8
+
+
+    def _text(self, s, x0, y0, c):
+        """text() a pixel at a time, for the horizontal formats"""
+
+        for ch in s:
+            code = ord(ch)
+
+            if code < 32 or code > 126:
+                code = 127
+
+            glyph = _FONT[(code - 32) * 5:(code - 32) * 5 + 5] if code != 127 else b'\x7f' * 5
+
+            for j, vline in enumerate(glyph):
+                x = x0 + 1 + j
+
+                if 0 <= x < self._w:
+                    for yy in range(8):
+                        if vline & (1 << yy) and 0 <= y0 + yy < self._h:
+                            self._set(x, y0 + yy, c)
+
+            x0 += 8
+
+
+def _rows(height, page):
+    """
+    Returns : int
+        mask of the rows of `page` inside a frame buffer `height` high
+    """
+
+    if page < 0 or page * 8 >= height:
+        return 0
+
+    return (1 << min(height - page * 8, 8)) - 1
+
+
+_cache = {}                                  # source contents -> columns, glyphs repeat
+
+
+def _columns(fbuf):
+    """
+    Returns : list of int
+        every column of `fbuf`, bit n for row n
+    """
+
+    key  = (bytes(fbuf._buf), fbuf._w, fbuf._h, fbuf._format, fbuf._stride)
+    cols = _cache.get(key)
+
+    if cols is None:
+        cols = []
+
+        for x in range(fbuf._w):
+            bits = 0
+
+            for y in range(fbuf._h):
+                if fbuf._get(x, y):
+                    bits |= 1 << y
+
+            cols.append(bits)
+
+        _keep(key, cols)
+
+    return cols
+
+
+def _pages(fbuf, x1, y1, rows, shift, width):
+    """
+    Returns : list of bytes
+        the `rows` rows of `fbuf` from row `y1`, `width` columns from
+        column `x1`, `shift` rows down a page: a byte per column, a
+        bytes per page, as a MONO_VLSB frame buffer holds them
+    """
+
+    cols  = _columns(fbuf)
+    key   = (id(cols), x1, y1, rows, shift, width)
+    pages = _cache.get(key)
+
+    if pages is None or pages[0] is not cols:
+        band  = [((cols[x1 + i] >> y1) & ((1 << rows) - 1)) << shift for i in range(width)]
+        pages = [cols]                       # the columns first, so that an id reused is noticed
+
+        for p in range(((rows + shift + 7) >> 3)):
+            pages.append(bytes((b >> (8 * p)) & 0xFF for b in band))
+
+        _keep(key, pages)
+
+    return pages[1:]
+
+
+def _keep(key, value):
+    if len(_cache) >= 1024:
+        _cache.clear()
+
+    _cache[key] = value
+
+
+# ASCII 32..126, 5 columns per glyph, LSB on top
+_FONT = bytes((
+    0x00, 0x00, 0x00, 0x00, 0x00,  0x00, 0x00, 0x5F, 0x00, 0x00,
+    0x00, 0x07, 0x00, 0x07, 0x00,  0x14, 0x7F, 0x14, 0x7F, 0x14,
+    0x24, 0x2A, 0x7F, 0x2A, 0x12,  0x23, 0x13, 0x08, 0x64, 0x62,
+    0x36, 0x49, 0x55, 0x22, 0x50,  0x00, 0x05, 0x03, 0x00, 0x00,
+    0x00, 0x1C, 0x22, 0x41, 0x00,  0x00, 0x41, 0x22, 0x1C, 0x00,
+    0x08, 0x2A, 0x1C, 0x2A, 0x08,  0x08, 0x08, 0x3E, 0x08, 0x08,
+    0x00, 0x50, 0x30, 0x00, 0x00,  0x08, 0x08, 0x08, 0x08, 0x08,
+    0x00, 0x60, 0x60, 0x00, 0x00,  0x20, 0x10, 0x08, 0x04, 0x02,
+    0x3E, 0x51, 0x49, 0x45, 0x3E,  0x00, 0x42, 0x7F, 0x40, 0x00,
+    0x42, 0x61, 0x51, 0x49, 0x46,  0x21, 0x41, 0x45, 0x4B, 0x31,
+    0x18, 0x14, 0x12, 0x7F, 0x10,  0x27, 0x45, 0x45, 0x45, 0x39,
+    0x3C, 0x4A, 0x49, 0x49, 0x30,  0x01, 0x71, 0x09, 0x05, 0x03,
+    0x36, 0x49, 0x49, 0x49, 0x36,  0x06, 0x49, 0x49, 0x29, 0x1E,
+    0x00, 0x36, 0x36, 0x00, 0x00,  0x00, 0x56, 0x36, 0x00, 0x00,
+    0x08, 0x14, 0x22, 0x41, 0x00,  0x14, 0x14, 0x14, 0x14, 0x14,
+    0x00, 0x41, 0x22, 0x14, 0x08,  0x02, 0x01, 0x51, 0x09, 0x06,
+    0x32, 0x49, 0x79, 0x41, 0x3E,  0x7E, 0x11, 0x11, 0x11, 0x7E,
+    0x7F, 0x49, 0x49, 0x49, 0x36,  0x3E, 0x41, 0x41, 0x41, 0x22,
+    0x7F, 0x41, 0x41, 0x22, 0x1C,  0x7F, 0x49, 0x49, 0x49, 0x41,
+    0x7F, 0x09, 0x09, 0x01, 0x01,  0x3E, 0x41, 0x41, 0x51, 0x32,
+    0x7F, 0x08, 0x08, 0x08, 0x7F,  0x00, 0x41, 0x7F, 0x41, 0x00,
+    0x20, 0x40, 0x41, 0x3F, 0x01,  0x7F, 0x08, 0x14, 0x22, 0x41,
+    0x7F, 0x40, 0x40, 0x40, 0x40,  0x7F, 0x02, 0x04, 0x02, 0x7F,
+    0x7F, 0x04, 0x08, 0x10, 0x7F,  0x3E, 0x41, 0x41, 0x41, 0x3E,
+    0x7F, 0x09, 0x09, 0x09, 0x06,  0x3E, 0x41, 0x51, 0x21, 0x5E,
+    0x7F, 0x09, 0x19, 0x29, 0x46,  0x46, 0x49, 0x49, 0x49, 0x31,
+    0x01, 0x01, 0x7F, 0x01, 0x01,  0x3F, 0x40, 0x40, 0x40, 0x3F,
+    0x1F, 0x20, 0x40, 0x20, 0x1F,  0x7F, 0x20, 0x18, 0x20, 0x7F,
+    0x63, 0x14, 0x08, 0x14, 0x63,  0x03, 0x04, 0x78, 0x04, 0x03,
+    0x61, 0x51, 0x49, 0x45, 0x43,  0x00, 0x00, 0x7F, 0x41, 0x41,
+    0x02, 0x04, 0x08, 0x10, 0x20,  0x41, 0x41, 0x7F, 0x00, 0x00,
+    0x04, 0x02, 0x01, 0x02, 0x04,  0x40, 0x40, 0x40, 0x40, 0x40,
+    0x00, 0x01, 0x02, 0x04, 0x00,  0x20, 0x54, 0x54, 0x54, 0x78,
+    0x7F, 0x48, 0x44, 0x44, 0x38,  0x38, 0x44, 0x44, 0x44, 0x20,
+    0x38, 0x44, 0x44, 0x48, 0x7F,  0x38, 0x54, 0x54, 0x54, 0x18,
+    0x08, 0x7E, 0x09, 0x01, 0x02,  0x08, 0x14, 0x54, 0x54, 0x3C,
+    0x7F, 0x08, 0x04, 0x04, 0x78,  0x00, 0x44, 0x7D, 0x40, 0x00,
+    0x20, 0x40, 0x44, 0x3D, 0x00,  0x00, 0x7F, 0x10, 0x28, 0x44,
+    0x00, 0x41, 0x7F, 0x40, 0x00,  0x7C, 0x04, 0x18, 0x04, 0x78,
+    0x7C, 0x08, 0x04, 0x04, 0x78,  0x38, 0x44, 0x44, 0x44, 0x38,
+    0x7C, 0x14, 0x14, 0x14, 0x08,  0x08, 0x14, 0x14, 0x18, 0x7C,
+    0x7C, 0x08, 0x04, 0x04, 0x08,  0x48, 0x54, 0x54, 0x54, 0x20,
+    0x04, 0x3F, 0x44, 0x40, 0x20,  0x3C, 0x40, 0x40, 0x20, 0x7C,
+    0x1C, 0x20, 0x40, 0x20, 0x1C,  0x3C, 0x40, 0x30, 0x40, 0x3C,
+    0x44, 0x28, 0x10, 0x28, 0x44,  0x0C, 0x50, 0x50, 0x50, 0x3C,
+    0x44, 0x64, 0x54, 0x4C, 0x44,  0x00, 0x08, 0x36, 0x41, 0x00,
+    0x00, 0x00, 0x7F, 0x00, 0x00,  0x00, 0x41, 0x36, 0x08, 0x00,
+    0x08, 0x08, 0x2A, 0x1C, 0x08,
+))
@@ -0,0 +1,57 @@
+"""
+gc.py
+Host stand-in for MicroPython's gc module
+
+mem_alloc() and mem_free() are answered by tracemalloc, started on the
+first call, so deltas are CPython allocation sizes rather than Pico
+heap blocks; they still show which code allocates. CPython frees
+temporaries straight away, so mem_alloc() counts the peak growth
+between two calls instead: like the Pico heap, it only goes up until
+collect() is called. Everything else is the real gc module.
+"""
+
+import gc as _gc
+import tracemalloc
+
+
+HEAP_SIZE = 192 * 1024                       # rp2 heap, for mem_free()
+
+_alloc = 0                                   # bytes "allocated" since collect()
+_last  = 0                                   # traced memory at the previous call
+
+
+def mem_alloc():
+    global _alloc, _last
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _last = tracemalloc.get_traced_memory()[0]
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    if peak > _last:
+        _alloc += peak - _last
+
+    _last = current
+
+    return _alloc
+
+
+def collect():
+    global _alloc
+
+    _gc.collect()
+    _alloc = 0
+
+
+def mem_free():
+    return max(HEAP_SIZE - mem_alloc(), 0)
+
+
+def threshold(amount = None):
+    return -1
+
+
+def __getattr__(name):
+    return getattr(_gc, name)
@@ -0,0 +1,74 @@
+"""
+ky040.py
+Host-side gestures for the KY-040 rotary encoder wired as in config.py
+"""
+
+from sim import machine
+from sim import utime
+
+
+DT_PIN  = 2
+CLK_PIN = 3
+SW_PIN  = 4
+
+
+def _pin(id):
+    return machine.Pin.registry[id]
+
+
+def turn(cw = True, steps = 1, gap_ms = 0):
+    """
+    Turn the knob by whole detents
+
+    Parameters
+    ----------
+    cw : bool, optional
+        True for clockwise
+    steps : int, optional
+        number of detents
+    gap_ms : int, optional
+        virtual time between detents
+    """
+
+    dt  = _pin(DT_PIN)
+    clk = _pin(CLK_PIN)
+
+    # Gray sequence from rest (11): CW leads with CLK, CCW with DT
+    first, second = (clk, dt) if cw else (dt, clk)
+
+    for _ in range(steps):
+        first.drive(0)
+        second.drive(0)
+        first.drive(1)
+        second.drive(1)
+
+        if gap_ms:
+            utime.advance(gap_ms)
+
+
+def press():
+    """Push the switch down"""
+
+    _pin(SW_PIN).drive(0)
+
+
+def release():
+    """Let the switch go"""
+
+    _pin(SW_PIN).drive(1)
+
+
+def click(hold_ms = 50):
+    """Short press"""
+
+    press()
+    utime.advance(hold_ms)
+    release()
+
+
+def long_click(hold_ms = 1200):
+    """Press long enough for main.long_press() to fire"""
+
+    press()
+    utime.advance(hold_ms)
+    release()
@@ -0,0 +1,391 @@
+"""
+machine.py
+Host stand-in for the machine module of the rp2 port
+
+Only what the kitchen timer touches is modelled, but each class keeps
+enough state for the host to inspect and drive it:
+
+Pin   : value can be driven from the host; edges fire the registered IRQ
+I2C   : every transaction is logged and costs virtual bus time
+PWM   : frequency and duty changes are logged with their timestamp
+ADC   : read_u16() returns a scripted value or sequence
+Timer : one-shot / periodic timers driven by the virtual clock
+RTC   : wall clock derived from the virtual clock
+"""
+
+from sim import micropython
+from sim import utime
+
+
+class Pin:
+    """
+    GPIO pin
+
+    Attributes
+    --------------
+    registry : dict
+        last Pin instance constructed for each id, for the host to drive
+    """
+
+    IN          = 0
+    OUT         = 1
+    OPEN_DRAIN  = 2
+    PULL_UP     = 1
+    PULL_DOWN   = 2
+    IRQ_FALLING = 4
+    IRQ_RISING  = 8
+
+    registry = {}
+
+    def __init__(self, id, mode = -1, pull = None, value = None):
+        self.id       = id
+        self.mode     = mode
+        self.pull     = pull
+        self.handler  = None
+        self.trigger  = 0
+        self._value   = 1 if pull == Pin.PULL_UP else 0
+
+        if value is not None:
+            self._value = 1 if value else 0
+
+        Pin.registry[id] = self
+
+
+    def init(self, mode = -1, pull = None, value = None):
+        self.mode = mode
+        self.pull = pull
+
+        if value is not None:
+            self._value = 1 if value else 0
+
+
+    def value(self, v = None):
+        if v is None:
+            return self._value
+
+        self._value = 1 if v else 0
+
+
+    def on(self):
+        self._value = 1
+
+
+    def off(self):
+        self._value = 0
+
+
+    def toggle(self):
+        self._value ^= 1
+
+
+    def irq(self, handler = None, trigger = IRQ_FALLING | IRQ_RISING, hard = False):
+        self.handler = handler
+        self.trigger = trigger
+
+
+    def drive(self, v):
+        """
+        Host side: set the pin level as seen by the MCU, firing the IRQ
+        handler on a matching edge. Scheduled callbacks run afterwards,
+        as they would between two bytecodes on the device.
+
+        Parameters
+        ----------
+        v : int
+            new level (0 or 1)
+        """
+
+        v = 1 if v else 0
+
+        if v == self._value:
+            return
+
+        self._value = v
+        edge = Pin.IRQ_RISING if v else Pin.IRQ_FALLING
+
+        if self.handler is not None and self.trigger & edge:
+            self.handler(self)
+
+        micropython.run_scheduled()
+
+
+class I2C:
+    """
+    I2C controller with a transaction log
+
+    Each transaction costs virtual time: 9 clocks per byte (8 data bits
+    plus ACK) and one extra byte for the address, at `freq` Hz.
+
+    Attributes
+    --------------
+    log : list
+        (addr, bytes) per write transaction, when `keep_log` is True
+    transactions : int
+        write transactions since the last clear()
+    bytes_written : int
+        payload bytes written since the last clear()
+    """
+
+    def __init__(self, id, scl = None, sda = None, freq = 400000):
+        self.id            = id
+        self.scl           = scl
+        self.sda           = sda
+        self.freq          = freq
+        self.keep_log      = True
+        self.charge_time   = True
+        self.listeners     = []
+        self.clear()
+
+
+    def clear(self):
+        """Reset the log and the counters"""
+
+        self.log           = []
+        self.transactions  = 0
+        self.bytes_written = 0
+
+
+    def _record(self, addr, parts):
+        size = 0
+
+        for part in parts:
+            size += len(part)
+
+        self.transactions  += 1
+        self.bytes_written += size
+
+        if self.keep_log or self.listeners:
+            data = b''.join(bytes(part) for part in parts)
+
+            if self.keep_log:
+                self.log.append((addr, data))
+
+            for listener in self.listeners:
+                listener(addr, data)
+
+        if self.charge_time:
+            utime.advance_us((size + 1) * 9 * 1000000 // self.freq)
+
+
+    def scan(self):
+        return [0x3C]
+
+
+    def writeto(self, addr, buf, stop = True):
+        self._record(addr, (buf,))
+
+        return len(buf)
+
+
+    def writevto(self, addr, vector, stop = True):
+        self._record(addr, vector)
+
+        return len(vector)
+
+
+    def readfrom(self, addr, nbytes, stop = True):
+        return bytes(nbytes)
+
+
+    def readfrom_into(self, addr, buf, stop = True):
+        for i in range(len(buf)):
+            buf[i] = 0
+
+
+class PWM:
+    """
+    PWM output; every change is logged as (ms, freq, duty_u16)
+    """
+
+    def __init__(self, pin, freq = 0, duty_u16 = 0):
+        self.pin   = pin
+        self._freq = freq
+        self._duty = duty_u16
+        self.log   = []
+
+
+    def _record(self):
+        self.log.append((utime.ticks_ms(), self._freq, self._duty))
+
+
+    def freq(self, value = None):
+        if value is None:
+            return self._freq
+
+        self._freq = value
+        self._record()
+
+
+    def duty_u16(self, value = None):
+        if value is None:
+            return self._duty
+
+        self._duty = value
+        self._record()
+
+
+    def deinit(self):
+        self._duty = 0
+        self._record()
+
+
+class ADC:
+    """
+    Analog input returning scripted raw values
+
+    Attributes
+    --------------
+    preset : dict
+        channel -> raw value used by instances created afterwards
+    """
+
+    preset = {}
+
+    CONVERSION_US = 2                        # 500 ksps
+
+    def __init__(self, channel):
+        if isinstance(channel, Pin):
+            channel = channel.id
+
+        self.channel = channel
+        self.script  = None
+        self.raw     = ADC.preset.get(channel, 0)
+
+
+    def set(self, raw):
+        """
+        Host side: return `raw` from now on
+
+        Parameters
+        ----------
+        raw : int
+            0..65535
+        """
+
+        self.script = None
+        self.raw    = raw
+
+
+    def play(self, values):
+        """
+        Host side: return `values` in turn; the last one sticks
+
+        Parameters
+        ----------
+        values : iterable of int
+            0..65535
+        """
+
+        self.script = iter(values)
+
+
+    def read_u16(self):
+        utime.advance_us(ADC.CONVERSION_US)
+
+        if self.script is not None:
+            for raw in self.script:
+                self.raw = raw
+                break
+            else:
+                self.script = None
+
+        return self.raw
+
+
+class Timer:
+    """
+    Software timer fired by the virtual clock
+    """
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id = -1, mode = PERIODIC, period = -1, callback = None, freq = -1):
+        self.id       = id
+        self.mode     = mode
+        self.period   = 0
+        self.callback = None
+        self.due_us   = 0
+
+        if callback is not None:
+            self.init(mode = mode, period = period, callback = callback, freq = freq)
+
+
+    def init(self, mode = PERIODIC, period = -1, callback = None, freq = -1, tick_hz = 1000):
+        self.deinit()
+
+        if freq > 0:
+            period_us = 1000000 // freq
+        else:
+            period_us = period * 1000000 // tick_hz
+
+        self.mode     = mode
+        self.period   = period_us
+        self.callback = callback
+        self.due_us   = utime.now_us() + period_us
+
+        utime._timers.append(self)
+
+
+    def deinit(self):
+        if self in utime._timers:
+            utime._timers.remove(self)
+
+
+    def fire(self):
+        """Called by the virtual clock when the timer is due"""
+
+        if self.mode == Timer.PERIODIC:
+            self.due_us += max(self.period, 1)
+        else:
+            self.deinit()
+
+        if self.callback is not None:
+            self.callback(self)
+
+
+class RTC:
+    """
+    Real time clock backed by the virtual clock
+    """
+
+    def datetime(self, dt = None):
+        """
+        Get or set (year, month, day, weekday, hours, minutes, seconds, subseconds)
+        """
+
+        if dt is None:
+            t = utime.localtime()
+
+            return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+
+        secs = utime.mktime((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6]))
+        utime._epoch = secs - utime.now_us() // 1000000
+
+
+def freq(hz = None):
+    return 125000000
+
+
+def unique_id():
+    return b'\xe6\x61\x38\x00\x00\x00\x00\x00'
+
+
+def reset():
+    raise SystemExit('machine.reset()')
+
+
+def soft_reset():
+    raise SystemExit('machine.soft_reset()')
+
+
+def idle():
+    utime.advance_us(1)
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state = 0):
+    pass
@@ -0,0 +1,81 @@
+"""
+micropython.py
+Host stand-in for the micropython module
+
+schedule() queues callbacks exactly like the firmware does; they run
+when the virtual clock moves or when the host calls run_scheduled(),
+never nested inside another scheduled callback.
+"""
+
+SCHEDULE_DEPTH = 8                           # rp2 MICROPY_SCHEDULER_DEPTH
+
+_queue   = []
+_running = False
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def schedule(func, arg):
+    if len(_queue) >= SCHEDULE_DEPTH:
+        raise RuntimeError('schedule queue full')
+
+    _queue.append((func, arg))
+
+
+def run_scheduled():
+    """Run queued callbacks in FIFO order. Returns the number run"""
+
+    global _running
+
+    if _running:
+        return 0
+
+    _running = True
+    count = 0
+
+    try:
+        while _queue:
+            func, arg = _queue.pop(0)
+            func(arg)
+            count += 1
+    finally:
+        _running = False
+
+    return count
+
+
+def pending():
+    """Number of queued callbacks"""
+
+    return len(_queue)
+
+
+def reset():
+    """Drop every queued callback"""
+
+    global _running
+
+    del _queue[:]
+    _running = False
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def mem_info(verbose = False):
+    pass
+
+
+def opt_level(level = None):
+    return 0
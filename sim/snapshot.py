@@ -0,0 +1,158 @@
+"""
+snapshot.py
+The state of a booted board, kept and put back in place
+
+A boot imports and runs the whole firmware. Runs that each need a board
+straight after boot can take() one snapshot and restore() it instead:
+
+    snap = snapshot.take()
+    ...                                      # play with the board
+    snap.restore()                           # as it was at take()
+
+take() walks everything reachable from the app modules and from the
+simulated hardware (the modules sim serves but framebuf, whose only
+global state is a cache, and ky040): module globals,
+instances of classes defined there, class attributes, and the lists,
+dicts, sets, bytearrays and arrays they hold. It keeps a shallow copy of
+each. restore() writes the copies back into the same objects, so that
+every reference the firmware holds (the framebuf on the display buffer,
+a handler in a list, a Pin in the registry) stays valid and sees the
+state of take(). App modules imported after take() are dropped, as a
+boot would not have them, and the files named are put back as they were.
+
+Nothing else is copied: strings, functions and code are taken to stay
+as they are, as they do on the Pico.
+"""
+
+import os
+import sys
+
+from array import array
+from types import MethodType, ModuleType
+
+import sim
+
+from sim import gc, ky040, machine, micropython, utime
+
+
+class Snapshot:
+    """
+    Board state at take()
+
+    Attributes
+    --------------
+    saved : list
+        (object, shallow copy) for every mutable object reached
+    modules : set
+        app modules imported at take()
+    files : dict
+        path -> contents, None if the file did not exist
+    """
+
+    def __init__(self, roots, files):
+        self.saved   = []
+        self.modules = {name for name in sys.modules if sim.app_module(name)}
+        self.files   = {}
+        self.seen    = set()
+
+        for root in roots:
+            self._walk(root, True)
+
+        del self.seen
+
+        for path in files:
+            try:
+                with open(path, 'rb') as f:
+                    self.files[path] = f.read()
+            except OSError:
+                self.files[path] = None
+
+
+    def _walk(self, obj, root = False):
+        if id(obj) in self.seen:
+            return
+
+        if isinstance(obj, (list, bytearray, array)):
+            self.saved.append((obj, obj[:]))
+            items = obj if isinstance(obj, list) else ()
+        elif isinstance(obj, (dict, set)):
+            self.saved.append((obj, obj.copy()))
+            items = list(obj.values()) if isinstance(obj, dict) else list(obj)
+        elif isinstance(obj, tuple):
+            items = obj
+        elif isinstance(obj, MethodType):
+            items = (obj.__self__,)
+        elif isinstance(obj, ModuleType):
+            if not root:
+                return                       # walked as a root, or not app state
+
+            items = (vars(obj),)
+        elif isinstance(obj, type):
+            if not _ours(obj):
+                return
+
+            items = list(vars(obj).values())     # class attributes, not the class itself
+        elif hasattr(obj, '__dict__') and (root or _ours(type(obj))):
+            self.saved.append((obj.__dict__, obj.__dict__.copy()))
+            items = list(obj.__dict__.values())
+        else:
+            return                           # not seen: it may come again as a root
+
+        self.seen.add(id(obj))
+
+        for item in items:
+            self._walk(item)
+
+
+    def restore(self):
+        """Put the board back as it was at take()"""
+
+        for obj, copy in self.saved:
+            if isinstance(obj, (dict, set)):
+                obj.clear()
+                obj.update(copy)
+            else:
+                obj[:] = copy
+
+        for name in [name for name in sys.modules if sim.app_module(name) and name not in self.modules]:
+            del sys.modules[name]
+
+        for path, data in self.files.items():
+            if data is None:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                with open(path, 'wb') as f:
+                    f.write(data)
+
+
+def _ours(cls):
+    """
+    Returns : bool
+        `cls` is defined by the app or by sim
+    """
+
+    name = getattr(cls, '__module__', None) or ''
+
+    return sim.app_module(name) or name == 'sim' or name.startswith('sim.')
+
+
+def take(*objects, files = ()):
+    """
+    Snapshot the app modules, the simulated hardware and `objects`
+
+    Parameters
+    ----------
+    objects : object
+        more roots: their attributes are saved whatever their class
+    files : sequence of str, optional
+        files put back by restore()
+
+    Returns : Snapshot
+    """
+
+    roots = [sys.modules[name] for name in sorted(sys.modules) if sim.app_module(name)]
+    roots.extend((utime, micropython, machine, gc, ky040))   # not framebuf: only a glyph cache
+    roots.extend(objects)
+
+    return Snapshot(roots, files)
@@ -0,0 +1,222 @@
+"""
+utime.py
+Virtual clock standing in for MicroPython's utime module
+
+Time only moves when somebody sleeps, when the simulated I2C bus
+spends time on a transfer, or when the host calls advance(). Timers
+registered by machine.Timer fire while the clock moves, in deadline
+order, so a run is fully deterministic.
+"""
+
+from sim import micropython
+
+
+TICKS_PERIOD = 1 << 30                       # same wrap as the rp2 port
+TICKS_MAX    = TICKS_PERIOD - 1
+TICKS_HALF   = TICKS_PERIOD // 2
+
+_now_us   = 0                                # virtual time since reset
+_epoch    = 0                                # seconds since 2000-01-01 at reset
+_timers   = []                               # armed machine.Timer instances
+_stop_us  = None                             # halt the simulation here
+
+
+class Stop(Exception):
+    """Raised when the virtual clock reaches the deadline set by stop_at()"""
+
+
+def reset(epoch = 0):
+    """
+    Reset the clock to zero and drop all armed timers
+
+    Parameters
+    ----------
+    epoch : int, optional
+        wall-clock seconds (since 2000-01-01) at virtual time zero
+    """
+
+    global _now_us, _epoch, _stop_us
+
+    _now_us  = 0
+    _epoch   = epoch
+    _stop_us = None
+    del _timers[:]
+
+
+def stop_at(ms):
+    """
+    Raise Stop once the virtual clock reaches `ms`
+
+    Parameters
+    ----------
+    ms : int or None
+        absolute virtual time in milliseconds. None disables the deadline
+    """
+
+    global _stop_us
+
+    _stop_us = None if ms is None else ms * 1000
+
+
+def now_us():
+    """Virtual time in microseconds, never wraps"""
+
+    return _now_us
+
+
+def advance_us(us):
+    """
+    Move the clock forward, firing due timers and scheduled callbacks
+
+    Parameters
+    ----------
+    us : int
+        microseconds to advance
+    """
+
+    global _now_us
+
+    target = _now_us + us
+
+    while True:
+        due = None
+
+        for t in _timers:
+            if t.due_us <= target and (due is None or t.due_us < due.due_us):
+                due = t
+
+        if due is None:
+            break
+
+        if due.due_us > _now_us:
+            _now_us = due.due_us
+
+        _check_stop()
+        due.fire()
+        micropython.run_scheduled()
+
+    # a timer callback may have slept past target
+    if _now_us < target:
+        _now_us = target
+
+    _check_stop()
+    micropython.run_scheduled()
+
+
+def advance(ms):
+    """Move the clock forward by `ms` milliseconds"""
+
+    advance_us(ms * 1000)
+
+
+def _check_stop():
+    if _stop_us is not None and _now_us >= _stop_us:
+        raise Stop(_now_us // 1000)
+
+
+# utime API
+
+def ticks_ms():
+    return (_now_us // 1000) & TICKS_MAX
+
+
+def ticks_us():
+    return _now_us & TICKS_MAX
+
+
+def ticks_cpu():
+    return _now_us & TICKS_MAX
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
+
+
+def sleep_ms(ms):
+    advance_us(int(ms) * 1000)
+
+
+def sleep_us(us):
+    advance_us(int(us))
+
+
+def sleep(seconds):
+    advance_us(int(seconds * 1000000))
+
+
+def time():
+    return _epoch + _now_us // 1000000
+
+
+def time_ns():
+    return (_epoch * 1000000 + _now_us) * 1000
+
+
+def localtime(secs = None):
+    """Broken-down time as (year, month, mday, hour, minute, second, weekday, yearday)"""
+
+    if secs is None:
+        secs = time()
+
+    days, secs = divmod(secs, 86400)
+    hour, secs = divmod(secs, 3600)
+    minute, second = divmod(secs, 60)
+    weekday = (days + 5) % 7                 # 2000-01-01 was a Saturday
+
+    year = 2000
+
+    while True:
+        ylen = 366 if _leap(year) else 365
+
+        if days < ylen:
+            break
+
+        days -= ylen
+        year += 1
+
+    yearday = days + 1
+    month = 1
+
+    while True:
+        mlen = _mdays(year, month)
+
+        if days < mlen:
+            break
+
+        days -= mlen
+        month += 1
+
+    return (year, month, days + 1, hour, minute, second, weekday, yearday)
+
+
+def mktime(t):
+    """Inverse of localtime()"""
+
+    year, month, mday, hour, minute, second = t[:6]
+
+    days = 0
+
+    for y in range(2000, year):
+        days += 366 if _leap(y) else 365
+
+    for m in range(1, month):
+        days += _mdays(year, m)
+
+    days += mday - 1
+
+    return ((days * 24 + hour) * 60 + minute) * 60 + second
+
+
+def _leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _mdays(year, month):
+    if month == 2:
+        return 29 if _leap(year) else 28
+
+    return 30 if month in (4, 6, 9, 11) else 31
@@ -0,0 +1,6 @@
+"""
+tools
+Host-side tooling for the kitchen timer: benchmarks, profilers and
+build helpers. Everything here runs on CPython against the `sim`
+package and is never copied to the Pico.
+"""
@@ -0,0 +1,97 @@
+"""
+alarm.py
+Snooze, repeat and dismiss the alarm on the simulated board
+
+    python -m tools.alarm [-t SECONDS]
+
+Sets timer 1 to `t` seconds, starts it and lets the virtual clock run
+to the alarm, three times over:
+
+    snooze   a turn of the knob: the timer runs again for SNOOZE_TIME,
+             keeping the time it was set to
+    repeat   a long press: the timer runs again for the time it was set to
+    dismiss  a short press: the timer is rewound to DEFAULT_TIMER, paused
+
+After a snooze or a repeat the display must be back to counting down
+without a full frame sent to the panel. Every transition is printed with
+the bytes it sent; the exit status is 1 if any of them goes wrong.
+"""
+
+import argparse
+import importlib
+import sys
+
+import sim
+
+from sim import ky040
+
+
+def ring(main):
+    """Run the virtual clock to the alarm, and a few blinks of it"""
+
+    while main.state != main.TIMER_FINISHED:
+        main.loop()
+
+    for _ in range(3):
+        main.loop()
+
+
+def check(main, name, action, state, left_ms, duration):
+    """
+    Do `action` on the alarm and check where timer 1 ends up
+
+    Returns : bool
+        it went as expected
+    """
+
+    timers = main.timers
+    i2c    = main.ssd.i2c
+    frame  = main.ssd.width * main.ssd.height // 8
+
+    ring(main)
+    i2c.clear()
+    action()
+
+    got = (main.state, timers.remaining_ms(0), timers.durations[0])
+
+    main.loop()                              # and its first redraw
+
+    sent = i2c.bytes_written
+    ok   = got[0] == state and left_ms - 1000 < got[1] <= left_ms and got[2] == duration
+
+    if state == main.TIMER_RUNNING:
+        ok = ok and sent < frame and not main.screen.blinking
+
+    print('{:<8} {:>5} bytes sent, state {}, {:>6} ms left, set to {} s: {}'.format(
+          name, sent, got[0], got[1], got[2], 'ok' if ok else 'WRONG'))
+
+    return ok
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.alarm')
+    parser.add_argument('-t', '--time', type = int, default = 70, help = 'seconds the timer is set to. Default: 70')
+    args = parser.parse_args(argv)
+
+    sim.install()
+
+    main = importlib.import_module('main')
+    main.ssd.i2c.keep_log = False
+
+    main.timers.set(0, args.time)
+    main.select(0)
+    main.loop()
+    ky040.click()
+
+    t  = args.time
+    ok = check(main, 'snooze', ky040.turn, main.TIMER_RUNNING, main.SNOOZE_TIME * 1000, t)
+    ok = check(main, 'repeat', ky040.long_click, main.TIMER_RUNNING, t * 1000, t) and ok
+    ok = check(main, 'dismiss', ky040.click, main.TIMER_PAUSED, main.DEFAULT_TIMER * 1000, main.DEFAULT_TIMER) and ok
+
+    sim.reset()
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
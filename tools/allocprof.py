@@ -0,0 +1,104 @@
+"""
+allocprof.py
+Heap allocations per tick of a running countdown
+
+    python -m tools.allocprof [--ticks N]
+
+Boots the firmware on the simulated board, instruments it with
+lib.debug.heap, starts the default countdown and prints the bytes each
+function allocates per tick once past warm-up. Sizes are CPython's, so
+compare them run to run rather than with the Pico; the goal is zero.
+
+Then the time formatting on its own: the bytes Screen.__format_time()
+allocates over every MM:SS and SS.t the timer can show, all told, less
+what the loop calling it allocates. A single byte is a failure: exit
+status 1.
+"""
+
+import argparse
+import importlib
+import sys
+
+import sim
+
+from sim import ky040
+
+
+def profile(ticks = 30):
+    """
+    Run `ticks` countdown ticks under the heap profiler
+
+    Returns : HeapProfiler
+    """
+
+    sim.install()
+
+    main = importlib.import_module('main')
+    heap = importlib.import_module('lib.debug.heap')
+    profiler = heap.HeapProfiler()
+
+    main.ssd.i2c.keep_log = False
+    profiler.instrument(vars(main))
+    main.loop()
+    profiler.reset()
+
+    ky040.click()
+
+    while profiler.ticks < ticks and main.state == main.TIMER_RUNNING:
+        main.loop()
+
+    return profiler
+
+
+def formatting():
+    """
+    Returns : (int, int)
+        calls made and the bytes they allocated, all told: what the same
+        loop allocates around a function doing nothing is taken off
+    """
+
+    sim.install()
+
+    main = importlib.import_module('main')
+    gc   = importlib.import_module('gc')
+    fmt  = main.screen._Screen__format_time
+
+    def nothing(el_timo, tenths = -1):
+        return 0
+
+    def run(func):
+        gc.mem_alloc()
+        before = gc.mem_alloc()
+
+        for t in range(main.MAX_TIME + 1):
+            func(t)
+
+        for t in range(600):
+            func(t // 10, t % 10)
+
+        return gc.mem_alloc() - before
+
+    run(nothing)                             # warm-up: the loop's own first allocations
+    run(fmt)
+
+    calls = main.MAX_TIME + 1 + 600
+
+    return calls, run(fmt) - run(nothing)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.allocprof')
+    parser.add_argument('--ticks', type = int, default = 30)
+    args = parser.parse_args(argv)
+
+    profile(args.ticks).report()
+
+    calls, allocated = formatting()
+
+    print('Screen.__format_time: {} B over {} calls'.format(allocated, calls))
+
+    return 1 if allocated else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,435 @@
+"""
+bench.py
+I2C traffic and render-time benchmarks
+
+Runs canonical scenarios against the simulated SSD1306_I2C and reports,
+per scenario:
+
+bytes        : payload bytes written on the I2C bus
+transactions : I2C write transactions
+show         : flushes, SSD1306.show() or show_region() calls
+glyphs       : glyphs drawn by the Writer
+bus_ms       : time the I2C bus was busy
+virtual_ms   : virtual time the scenario took on the device clock
+wall_ms      : host time spent running it
+
+Some scenarios add their own figures and LIMITS they must stay within.
+
+    python -m tools.bench [-s SCENARIO] [-o results.json] [-b baseline.json]
+
+With a baseline, any counter above baseline * (1 + tolerance) is
+reported and the exit status is 1, as for a broken limit. wall_ms is
+never compared: it measures the host, not the firmware.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+
+import sim
+
+from sim import ky040
+
+
+COUNTERS = ('bytes', 'transactions', 'show', 'glyphs')
+
+
+class Probe:
+    """
+    Counts flushes and glyph draws on live instances without touching
+    their classes
+
+    Parameters
+    ----------
+    ssd : SSD1306_I2C
+        the display driver
+    writer : Writer
+        the font writer
+    """
+
+    def __init__(self, ssd, writer):
+        self.ssd    = ssd
+        self.writer = writer
+        self.i2c    = ssd.i2c
+        self.show   = 0
+        self.glyphs = 0
+
+        show      = ssd.show
+        region    = ssd.show_region
+        blit      = writer._blit
+
+        def counted_show():
+            self.show += 1
+            show()
+
+        def counted_region(*args):
+            self.show += 1
+            region(*args)
+
+        def counted_blit(*args, **kwargs):     # every glyph drawn, by printbytes() or _printchar()
+            blit(*args, **kwargs)
+            self.glyphs += 1
+
+        ssd.show           = counted_show
+        ssd.show_region    = counted_region
+        writer._blit       = counted_blit
+
+
+    def start(self):
+        """Zero the counters"""
+
+        self.i2c.clear()
+        self.i2c.keep_log = False
+        self.show         = 0
+        self.glyphs       = 0
+        self.t0_wall      = time.perf_counter()
+        self.t0_virtual   = sim.utime.now_us()
+
+
+    def result(self):
+        bits = (self.i2c.bytes_written + self.i2c.transactions) * 9
+
+        return {
+            'bytes':        self.i2c.bytes_written,
+            'transactions': self.i2c.transactions,
+            'show':         self.show,
+            'glyphs':       self.glyphs,
+            'bus_ms':       bits * 1000 // self.i2c.freq,
+            'virtual_ms':   (sim.utime.now_us() - self.t0_virtual) // 1000,
+            'wall_ms':      round((time.perf_counter() - self.t0_wall) * 1000, 1),
+        }
+
+
+def boot():
+    """
+    Power the simulated board up and import the firmware
+
+    Returns : (module, Probe)
+        main module and a probe on its display
+    """
+
+    sim.install()
+
+    main = importlib.import_module('main')
+
+    return main, Probe(main.ssd, main.writer)
+
+
+def cold_boot():
+    """Power on to the first frame, the digits; virtual_ms is the time to it"""
+
+    sim.install()
+
+    ssd1306 = importlib.import_module('lib.oled.ssd1306')
+    writer  = importlib.import_module('lib.oled.writer')
+    counts  = {'show': 0, 'glyphs': 0}
+
+    # the instances do not exist before the import: count on this boot's classes
+    def counted(method, key):
+        def call(*args, **kwargs):
+            method(*args, **kwargs)
+            counts[key] += 1
+
+        return call
+
+    ssd1306.SSD1306.show        = counted(ssd1306.SSD1306.show, 'show')
+    ssd1306.SSD1306.show_region = counted(ssd1306.SSD1306.show_region, 'show')
+    writer.Writer._blit         = counted(writer.Writer._blit, 'glyphs')
+
+    t0   = time.perf_counter()
+    main = importlib.import_module('main')
+    i2c  = main.ssd.i2c
+    bits = (i2c.bytes_written + i2c.transactions) * 9
+
+    # nothing is drawn after the first frame during the import
+    return {
+        'bytes':        i2c.bytes_written,
+        'transactions': i2c.transactions,
+        'show':         counts['show'],
+        'glyphs':       counts['glyphs'],
+        'bus_ms':       bits * 1000 // i2c.freq,
+        'virtual_ms':   [at for label, at, _ in main.devices.log if label == '1st frame'][0] // 1000,
+        'wall_ms':      round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def countdown():
+    """Full default (08:00) countdown from start to finish"""
+
+    main, probe = boot()
+    main.loop()
+
+    probe.start()
+    ky040.click()
+
+    while main.state != main.TIMER_FINISHED:
+        main.loop()
+
+    return probe.result()
+
+
+def rotary_burst():
+    """200 detents in SET_MINUTES, rendering after each one"""
+
+    main, probe = boot()
+    main.loop()
+
+    while main.mode != main.SET_MINUTES:    # past SET_PROGRAM, if there are programs
+        ky040.long_click()
+        main.loop()
+
+    probe.start()
+
+    for i in range(200):
+        ky040.turn(cw = (i // 10) % 2 == 0)
+        main.loop()
+
+    return probe.result()
+
+
+def mode_cycle():
+    """Through every setting mode back to RUN_MODE, then start and pause"""
+
+    main, probe = boot()
+    main.loop()
+
+    probe.start()
+    ky040.long_click()
+    main.loop()
+
+    while main.mode != main.RUN_MODE:
+        ky040.long_click()
+        main.loop()
+
+    ky040.click()
+    main.loop()
+    ky040.click()
+    main.loop()
+
+    return probe.result()
+
+
+def finished_alarm():
+    """Ten seconds of the finished alarm, then a press to dismiss it"""
+
+    main, probe = boot()
+    main.loop()
+    main.current_time = 1
+    ky040.click()
+
+    while main.state != main.TIMER_FINISHED:
+        main.loop()
+
+    probe.start()
+    end = sim.utime.now_us() + 10 * 1000000
+
+    while sim.utime.now_us() < end:
+        main.loop()
+
+    ky040.click()
+    main.loop()
+
+    return probe.result()
+
+
+def stopwatch():
+    """
+    Seventy seconds of the stopwatch, with a lap: SS.t at 10 Hz for a
+    minute, then MM:SS. mmss_bytes_per_s is the traffic of the last ten
+    seconds, where only the seconds change
+    """
+
+    main, probe = boot()
+    main.loop()
+    ky040.turn(cw = False)                   # the slot before timer 1
+    main.loop()
+
+    probe.start()
+    ky040.click()
+    t0 = sim.utime.now_us()
+    minute = None                            # (bytes, flushes) at 60 s
+
+    while sim.utime.now_us() - t0 < 70 * 1000000:
+        if sim.utime.now_us() - t0 >= 5 * 1000000 and not main.watch.laps:
+            ky040.turn()
+
+        if minute is None and sim.utime.now_us() - t0 >= 60 * 1000000:
+            minute = (probe.i2c.bytes_written, probe.show)
+
+        main.loop()
+
+    result = probe.result()
+    elapsed = (sim.utime.now_us() - t0) // 1000
+
+    result['fps'] = round(minute[1] / 60, 1)
+    result['error_ms'] = abs(main.watch.elapsed() - elapsed)
+    result['mmss_bytes_per_s'] = (probe.i2c.bytes_written - minute[0]) // 10
+
+    return result
+
+
+def last_minute():
+    """The last ten seconds of a timer with SHOW_TENTHS on"""
+
+    main, probe = boot()
+    main.SHOW_TENTHS = True
+    main.timers.set(0, 10)
+    main.current_time = 10
+    main.loop()
+
+    probe.start()
+    ky040.click()
+
+    while main.state != main.TIMER_RUNNING:
+        main.loop()
+
+    t0 = sim.utime.now_us()
+
+    # frames up to the 00:00 one, the alarm beeps are not part of the countdown
+    while main.state != main.TIMER_FINISHED:
+        t1 = sim.utime.now_us()
+        main.loop()
+
+    result = probe.result()
+    elapsed = (t1 - t0) // 1000
+
+    result['fps'] = round(probe.show * 1000 / elapsed, 1)
+    result['bytes_per_frame'] = probe.i2c.bytes_written // max(probe.show, 1)
+
+    return result
+
+
+SCENARIOS = {
+    'cold_boot': cold_boot,
+    'countdown': countdown,
+    'rotary_burst': rotary_burst,
+    'mode_cycle': mode_cycle,
+    'finished_alarm': finished_alarm,
+    'stopwatch': stopwatch,
+    'last_minute': last_minute,
+}
+
+# scenario -> (figure, minimum, maximum)
+LIMITS = {
+    'cold_boot': (
+        ('virtual_ms', None, 40),            # one full frame, no clearing one
+        ('show', None, 1),
+    ),
+    'stopwatch': (
+        ('fps', 10, None),                   # one frame per tenth, the first minute
+        ('error_ms', None, 1),               # reading matches the clock
+        ('bus_ms', None, 21000),             # bus busy under 30% of the time
+        ('mmss_bytes_per_s', None, 400),     # MM:SS: the changed glyphs, once a second
+    ),
+    'last_minute': (
+        ('fps', 10, None),                   # one frame per tenth
+        ('bytes_per_frame', None, 400),      # changed glyphs only
+    ),
+}
+
+
+def check(results):
+    """
+    List figures outside their LIMITS
+
+    Returns : list of str
+    """
+
+    broken = []
+
+    for name, counters in results.items():
+        for key, lo, hi in LIMITS.get(name, ()):
+            value = counters[key]
+
+            if (lo is not None and value < lo) or (hi is not None and value > hi):
+                broken.append('{}.{}: {} not in [{}, {}]'.format(name, key, value, lo, hi))
+
+    return broken
+
+
+def compare(results, baseline, tolerance):
+    """
+    List counters that got worse than the baseline
+
+    Parameters
+    ----------
+    results : dict
+        scenario -> counters, as produced by run()
+    baseline : dict
+        same shape, from an earlier run
+    tolerance : float
+        allowed relative increase
+
+    Returns : list of str
+    """
+
+    regressions = []
+
+    for name, counters in results.items():
+        if name not in baseline:
+            continue
+
+        for key in COUNTERS:
+            old = baseline[name].get(key)
+            new = counters[key]
+
+            if old is not None and new > old * (1 + tolerance):
+                regressions.append('{}.{}: {} -> {}'.format(name, key, old, new))
+
+    return regressions
+
+
+def run(names = None):
+    """
+    Run scenarios
+
+    Parameters
+    ----------
+    names : list of str, optional
+        scenarios to run. Default: all
+
+    Returns : dict
+        scenario -> counters
+    """
+
+    return {name: SCENARIOS[name]() for name in (names or SCENARIOS)}
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.bench')
+    parser.add_argument('-s', '--scenario', action = 'append', choices = sorted(SCENARIOS))
+    parser.add_argument('-o', '--output', help = 'write JSON results here')
+    parser.add_argument('-b', '--baseline', help = 'JSON results to compare against')
+    parser.add_argument('-t', '--tolerance', type = float, default = 0.0)
+    args = parser.parse_args(argv)
+
+    results = run(args.scenario)
+    text = json.dumps(results, indent = 2, sort_keys = True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    failures = check(results)
+
+    for line in failures:
+        print('LIMIT ' + line, file = sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        for line in regressions:
+            print('REGRESSION ' + line, file = sys.stderr)
+
+        failures += regressions
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+build.py
+Deployable tree for the Pico, cross-compiled to .mpy
+
+    python -m tools.build [--out DIR] [--mpy-cross PATH] [--freeze [FILE ...]]
+
+From source, the Pico parses and compiles config.py, main.py and every
+module under lib/ at each boot, the font's byte-string literal included.
+Here they are compiled once on the host with mpy-cross (`pip install
+mpy-cross`, of the same MicroPython version as the firmware) and written
+to DIR (default build/) with programs.bin:
+
+    main.py  can only run from source: it is compiled as app.mpy and the
+             tree gets a main.py that imports it and runs the main loop
+
+Copy the content of DIR to the root of the Pico and delete the .py files
+of a previous install: MicroPython imports a .py before the .mpy next
+to it.
+
+A module loaded from a .mpy still copies its bytes literals onto the
+heap. One frozen into the firmware keeps them in flash, and a glyph is
+then a memoryview on flash. --freeze leaves FILEs (default: all of lib/,
+the font with it) out of the tree and writes DIR/manifest.py to build a
+firmware with them frozen in:
+
+    make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=.../manifest.py
+
+A package is frozen whole or not at all. '' comes before '.frozen' in
+sys.path: a lib/ folder left on the Pico is the package `lib`, and its
+modules are then only looked up there, never in the firmware. Delete
+lib/ from the Pico when it is frozen.
+
+Then a report, per module: source size, .mpy size and the bytes literals
+it holds, where they end up, and the totals.
+"""
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+
+import sim
+
+
+MAIN   = 'main.py'
+APP    = 'app'                               # main.py compiled under this name
+DATA   = ('programs.bin', 'seven_segment_48.bin')   # read by the firmware, copied as they are
+FROZEN = ('lib/',)                           # frozen by default with --freeze: the whole package
+
+STUB = '''\
+from app import *                            # main.py, precompiled
+
+while True:
+    loop()
+'''
+
+MANIFEST = '''\
+include("$(PORT_DIR)/boards/manifest.py")
+
+'''
+
+
+def sources():
+    """
+    Returns : list of str
+        modules the firmware imports, as paths relative to the repo root
+    """
+
+    found = ['config.py', MAIN]
+
+    for folder, dirs, files in os.walk(os.path.join(sim.ROOT, 'lib')):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+
+        for name in sorted(files):
+            if name.endswith('.py'):
+                found.append(os.path.relpath(os.path.join(folder, name), sim.ROOT).replace(os.sep, '/'))
+
+    return found
+
+
+def literal_bytes(path):
+    """
+    Returns : int
+        bytes held by the bytes literals of the module
+    """
+
+    with open(path) as f:
+        tree = ast.parse(f.read())
+
+    return sum(len(node.value) for node in ast.walk(tree)
+               if isinstance(node, ast.Constant) and isinstance(node.value, bytes))
+
+
+def compile_mpy(mpy_cross, src, out, name):
+    """
+    Compile one module
+
+    Parameters
+    ----------
+    mpy_cross : str
+        the cross compiler
+    src : str
+        source file
+    out : str
+        .mpy to write
+    name : str
+        source name kept in the .mpy, for tracebacks
+    """
+
+    os.makedirs(os.path.dirname(out), exist_ok = True)
+    subprocess.run([mpy_cross, '-march=armv6m', '-s', name, '-o', out, src], check = True)
+
+
+def frozen_modules(freeze, found):
+    """
+    Modules to freeze
+
+    Parameters
+    ----------
+    freeze : tuple of str
+        files, or packages ending with '/'
+    found : list of str
+        modules of the firmware
+
+    Returns : list of str
+
+    Raises
+    ------
+    ValueError
+        not a module, or a package frozen in part
+    """
+
+    frozen = []
+
+    for path in freeze:
+        if path.endswith('/'):
+            match = [m for m in found if m.startswith(path)]
+        else:
+            match = [path] if path in found else []
+
+        if not match or MAIN in match:
+            raise ValueError('{} is not a module of the firmware that can be frozen'.format(path))
+
+        frozen += [m for m in match if m not in frozen]
+
+    for path in frozen:
+        if '/' in path:
+            top  = path.split('/')[0] + '/'
+            left = [m for m in found if m.startswith(top) and m not in frozen]
+
+            if left:                         # the filesystem package would hide the frozen modules
+                raise ValueError('{} is part of {}: freeze it whole ({}), or {} would not be found'.format(
+                                 path, top, top, path))
+
+    return frozen
+
+
+def manifest(frozen):
+    """
+    Returns : str
+        lines of manifest.py freezing `frozen`: packages, then modules
+    """
+
+    root     = sim.ROOT.replace(os.sep, '/')
+    packages = {}
+    lines    = []
+
+    for path in frozen:
+        if '/' in path:
+            top, rest = path.split('/', 1)
+            packages.setdefault(top, []).append(rest)
+        else:
+            lines.append('module("{}", base_path = "{}")\n'.format(path, root))
+
+    for top, files in packages.items():
+        lines.insert(0, 'package("{}", files = {!r}, base_path = "{}")\n'.format(top, files, root))
+
+    return ''.join(lines)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.build')
+    parser.add_argument('--out', default = os.path.join(sim.ROOT, 'build'), help = 'tree to write. Default: build/')
+    parser.add_argument('--mpy-cross', default = 'mpy-cross', help = 'cross compiler. Default: mpy-cross on the PATH')
+    parser.add_argument('--freeze', nargs = '*', metavar = 'FILE',
+                        help = 'modules (or packages, as lib/) to freeze into the firmware instead. Default: lib/')
+    args = parser.parse_args(argv)
+
+    mpy_cross = shutil.which(args.mpy_cross)
+
+    if mpy_cross is None:
+        parser.error('{} not found: pip install mpy-cross, or give --mpy-cross'.format(args.mpy_cross))
+
+    found = sources()
+
+    try:
+        frozen = [] if args.freeze is None else frozen_modules(tuple(args.freeze) or FROZEN, found)
+    except ValueError as e:
+        parser.error(str(e))
+
+    version = subprocess.run([mpy_cross, '--version'], capture_output = True, text = True).stdout.strip()
+
+    if os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+
+    os.makedirs(args.out)
+
+    totals = [0, 0, 0, 0]                    # source, .mpy, literals on the heap, in flash
+
+    print(version)
+    print('{:<34} {:>7} {:>7} {:>7}  literals in'.format('module', 'source', '.mpy', 'bytes'))
+
+    for path in found:
+        src     = os.path.join(sim.ROOT, path)
+        size    = os.path.getsize(src)
+        literal = literal_bytes(src)
+
+        if path in frozen:
+            print('{:<34} {:>7} {:>7} {:>7}  flash, frozen'.format(path, size, '-', literal))
+            totals[0] += size
+            totals[3] += literal
+            continue
+
+        mpy = APP + '.mpy' if path == MAIN else path[:-3] + '.mpy'
+        out = os.path.join(args.out, mpy)
+
+        compile_mpy(mpy_cross, src, out, path)
+
+        print('{:<34} {:>7} {:>7} {:>7}  heap'.format(path, size, os.path.getsize(out), literal))
+        totals[0] += size
+        totals[1] += os.path.getsize(out)
+        totals[2] += literal
+
+    with open(os.path.join(args.out, MAIN), 'w') as f:
+        f.write(STUB)
+
+    for name in DATA:
+        shutil.copy(os.path.join(sim.ROOT, name), args.out)
+
+    if frozen:
+        with open(os.path.join(args.out, 'manifest.py'), 'w') as f:
+            f.write(MANIFEST)
+            f.write(manifest(frozen))
+
+    print('{:<34} {:>7} {:>7}'.format('total', totals[0], totals[1]))
+    print('bytes literals: {} on the heap, {} in flash'.format(totals[2], totals[3]))
+    print('written to {}{}'.format(args.out, ', with manifest.py' if frozen else ''))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
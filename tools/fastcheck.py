@@ -0,0 +1,39 @@
+"""
+fastcheck.py
+Fast paths of the rendering against their Python versions, on the host
+
+    python -m tools.fastcheck [-r REPEAT]
+
+Runs lib/debug/fastcheck.py, timed with the host clock instead of the
+virtual one. The viper versions only run on the Pico: here the check
+covers the Python algorithms against the pixel-by-pixel references.
+Exit status 1 if any result differs.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+import sim
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.fastcheck')
+    parser.add_argument('-r', '--repeat', type = int, default = 10, help = 'runs of every case timed. Default: 10')
+    args = parser.parse_args(argv)
+
+    sim.install()
+
+    fastcheck = importlib.import_module('lib.debug.fastcheck')
+    fastcheck.ticks_us = lambda: time.perf_counter_ns() // 1000
+
+    ok = fastcheck.run(args.repeat)
+
+    sim.reset()
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+fontfile.py
+Font files from font_to_py modules
+
+    python -m tools.fontfile [FONT ...] [-d DIR] [--cache N]
+
+Writes every FONT (default lib/oled/seven_segment_48.py) as DIR/NAME.bin
+(default: the repo root, copied to the Pico by tools/build.py), in the
+layout of lib/oled/filefont.py. Set FONT_FILE in config.py to draw the
+time with it. Then opens each file with FileFont, N glyphs cached
+(default 12), and prints:
+
+    glyphs       characters read exactly as FONT's glyphs
+    file         bytes in flash
+    heap         bytes held by FONT imported, and by the open file: its
+                 index, plus the cache after every glyph was read once
+                 (Writer.metrics() at boot) and the countdown
+    read         host time per get_ch(), from the file and from the cache
+    countdown    cache hits while counting 99:59 down to 00:00
+
+Read times are the host's: on the Pico a read goes through littlefs.
+Exit status 1 if a glyph differs.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import sim
+
+from tools import packfont
+
+
+FONT = 'lib/oled/seven_segment_48.py'
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.fontfile')
+    parser.add_argument('fonts', nargs = '*', metavar = 'FONT', help = 'font_to_py modules. Default: ' + FONT)
+    parser.add_argument('-d', '--dir', default = sim.ROOT, help = 'where to write NAME.bin. Default: the repo root')
+    parser.add_argument('--cache', type = int, default = 12, help = 'glyphs kept in RAM. Default: 12')
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.cache <= 255:
+        parser.error('--cache: 1 to 255 glyphs')
+
+    sim.install()
+
+    filefont = importlib.import_module('lib.oled.filefont')
+    failed   = False
+
+    for path in args.fonts or [FONT]:
+        font = importlib.import_module(packfont.module_name(path))
+        out  = os.path.join(args.dir, os.path.basename(path)[:-3] + '.bin')
+
+        with open(out, 'wb') as f:
+            f.write(filefont.pack(font))
+
+        cache = filefont.FileFont(out, args.cache)
+        wrong = packfont.compare(font, cache)      # every glyph, as Writer.metrics() at boot
+
+        miss, hit    = packfont.timing(cache, packfont.TIMES)
+        hits, misses = packfont.countdown(cache)
+        slots        = [len(b) for b in cache.bufs if b is not None]
+
+        cache.close()
+
+        total  = font.max_ch() - font.min_ch() + 3
+        failed = failed or bool(wrong)
+
+        print('written  {}'.format(os.path.relpath(out)))
+        print('glyphs   {} of {} as {}{}'.format(total - len(wrong), total, path,
+              ', WRONG: ' + ' '.join(wrong) if wrong else ''))
+        print('file     {} bytes'.format(os.path.getsize(out)))
+        print('heap     {} bytes imported; {} open: {} index + {} cache ({})'.format(
+              len(font._font) + len(font._index), len(cache.index) + sum(slots), len(cache.index), sum(slots),
+              ' '.join(str(n) for n in slots)))
+        print('read     {:.1f} us a glyph from the file, {:.1f} us from the cache (host)'.format(miss, hit))
+        print('countdown {} hits, {} reads over {} get_ch()'.format(hits, misses, hits + misses))
+
+    sim.reset()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
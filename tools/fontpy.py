@@ -0,0 +1,108 @@
+"""
+fontpy.py
+font_to_py modules with this repo's glyph lookup
+
+    python -m tools.fontpy [FONT ...]
+
+Rewrites every FONT (default lib/oled/seven_segment_48.py), as written
+by font_to_py.py or by this tool, in place: the same header, functions
+and data, with get_ch() reading the index through lib/oled/fastpath.u16
+instead of a memoryview slice per lookup, and a get_code() taking the
+character code, for Writer.printbytes() (no str per character). Run it
+on every font fresh out of font_to_py.py, rather than editing the
+module by hand: the next font would lose the edit.
+
+Then checks every glyph against the module it replaced. Exit status 1
+if one differs.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import sim
+
+from tools import packfont
+
+
+FONT = 'lib/oled/seven_segment_48.py'
+
+HEADER = '''\
+{comments}version = '{version}'
+
+from lib.oled.fastpath import u16
+
+'''
+
+GET_CH = '''\
+_mvfont = memoryview(_font)
+
+# get_code() and get_ch() written by tools/fontpy.py
+def get_code(oc):
+    ioff = 2 * (oc - {min_ch} + 1) if oc >= {min_ch} and oc <= {max_ch} else 0
+    doff = u16(_index, ioff)
+    width = u16(_font, doff)
+
+    next_offs = doff + 2 + ((width - 1)//8 + 1) * {height}
+    return _mvfont[doff + 2:next_offs], {height}, width
+
+def get_ch(ch):
+    return get_code(ord(ch))
+'''
+
+
+def source(font, comments):
+    """
+    Returns : str
+        the module, from an imported font and its header comments
+    """
+
+    text = HEADER.format(comments = comments, version = getattr(font, 'version', '0'))
+
+    for name in packfont.FUNCS:
+        text += 'def {}():\n    return {!r}\n\n'.format(name, getattr(font, name)())
+
+    text += packfont.literal('_font', font._font)
+    text += packfont.literal('_index', font._index)
+    text += GET_CH.format(min_ch = font.min_ch(), max_ch = font.max_ch(), height = font.height())
+
+    return text
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.fontpy')
+    parser.add_argument('fonts', nargs = '*', metavar = 'FONT', help = 'font_to_py modules. Default: ' + FONT)
+    args = parser.parse_args(argv)
+
+    sim.install()
+
+    failed = False
+
+    for path in args.fonts or [FONT]:
+        name = packfont.module_name(path)
+        old  = importlib.import_module(name)
+
+        with open(path) as f:
+            comments = ''.join(line for line in f.readlines()[:3] if line.startswith('# '))
+
+        with open(path, 'w') as f:
+            f.write(source(old, comments))
+
+        del sys.modules[name]
+
+        wrong  = packfont.compare(old, importlib.import_module(name))
+        total  = old.max_ch() - old.min_ch() + 3
+        failed = failed or bool(wrong)
+
+        print('written  {}'.format(os.path.relpath(path)))
+        print('glyphs   {} of {} as before{}'.format(total - len(wrong), total,
+              ', WRONG: ' + ' '.join(wrong) if wrong else ''))
+
+    sim.reset()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+fuzz.py
+Random rotary sessions against the firmware on the simulated board
+
+    python -m tools.fuzz [--runs N] [--steps N] [--seed S] [--boot]
+
+Every run starts from a board just booted and plays a random sequence
+of knob turns, short and long presses and waits (the virtual clock
+jumping up to a couple of minutes). After every step the main loop
+makes one pass and these must hold:
+
+    time     the time set is within 1..MAX_TIME, on every timer
+    events   every edge the knob made reached the rotary handlers once,
+             nothing is left queued and no long press timer is left armed
+    display  the panel, rebuilt from the I2C traffic, shows the frame
+             buffer; it is lit unless the alarm blinks it off; the
+             digits and the setup underline drawn are those of the
+             timer on display and the mode
+
+A failing sequence is shrunk, dropping steps for as long as it still
+fails, and printed, with the exit status 1. Runs happen in a scratch directory
+holding a copy of programs.bin, so presets and the journal written on
+the way never touch the working tree.
+
+The firmware is booted once: every run restores a snapshot of the board
+taken after the boot (sim/snapshot.py), files included, which costs a
+fraction of a boot. --boot boots a fresh board for every run instead,
+as before, to check that both find the same.
+"""
+
+import argparse
+import importlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import sim
+
+from sim import ky040
+from sim import snapshot
+
+
+# SSD1306 commands followed by arguments, and how many
+ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8D: 1, 0xA8: 1, 0xAD: 1,
+        0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1}
+
+
+class Panel:
+    """
+    SSD1306 display RAM, fed by the I2C traffic
+
+    Only horizontal addressing is modelled, the one the driver sets.
+
+    Parameters
+    ----------
+    ssd : SSD1306_I2C
+        the driver, whose buffer the panel shows at boot
+    """
+
+    def __init__(self, ssd):
+        self.ram   = bytearray(ssd.buffer)
+        self.on    = True
+        self.cmd   = []                      # command waiting for its arguments
+        self.cols  = [0, 127]
+        self.pages = [0, 7]
+        self.col   = 0
+        self.page  = 0
+
+        ssd.i2c.listeners.append(self.receive)
+
+
+    def receive(self, addr, data):
+        if data[0] == 0x40:
+            self.write(data[1:])
+            return
+
+        cmd = self.cmd
+        cmd.append(data[1])
+
+        if len(cmd) <= ARGS.get(cmd[0], 0):
+            return
+
+        if cmd[0] == 0x21:
+            self.cols = cmd[1:]
+            self.col  = cmd[1]
+        elif cmd[0] == 0x22:
+            self.pages = cmd[1:]
+            self.page  = cmd[1]
+        elif cmd[0] & 0xFE == 0xAE:
+            self.on = bool(cmd[0] & 1)
+
+        self.cmd = []
+
+
+    def write(self, data):
+        c0, c1 = self.cols
+        p0, p1 = self.pages
+        at     = 0
+
+        while at < len(data):                # a run to the end of the window row at a time
+            n  = min(len(data) - at, c1 + 1 - self.col)
+            to = self.page * 128 + self.col
+
+            self.ram[to:to + n] = data[at:at + n]
+            self.col += n
+            at       += n
+
+            if self.col > c1:
+                self.col   = c0
+                self.page += 1
+
+                if self.page > p1:
+                    self.page = p0
+
+
+class Board:
+    """
+    A booted board, with the checks wired in
+
+    Parameters
+    ----------
+    boot : bool, optional
+        boot again on every restart(), instead of restoring the board
+        as it was after the first boot. Default False
+    """
+
+    def __init__(self, boot = False):
+        self.snapshot = None
+
+        if not boot:
+            self._boot()
+            self.snapshot = snapshot.take(self.panel, files = (self.main.PRESETS_FILE, self.main.JOURNAL_FILE))
+
+
+    def _boot(self):
+        sim.install()
+
+        if os.path.exists('presets.bin'):
+            os.remove('presets.bin')
+
+        self.main    = importlib.import_module('main')
+        self.panel   = Panel(self.main.ssd)
+        self.edges   = 0                     # rotary events sent
+        self.handled = 0                     # and received
+
+        self.main.ssd.i2c.keep_log = False
+        self.main.rotary.add_handler(self.count)
+        self.step('loop', 0)
+
+
+    def restart(self):
+        """Back to just after the boot"""
+
+        if self.snapshot is None:
+            self._boot()
+            return
+
+        self.snapshot.restore()
+        self.edges   = 0
+        self.handled = 0
+
+
+    def count(self, change):
+        self.handled += 1
+
+
+    def step(self, op, arg):
+        """Play one step and a pass of the main loop"""
+
+        if op == 'turn':
+            ky040.turn(cw = arg > 0, steps = abs(arg))
+            self.edges += abs(arg)
+        elif op == 'click':
+            ky040.click()
+            self.edges += 2
+        elif op == 'long':
+            ky040.long_click()
+            self.edges += 2
+        elif op == 'wait':
+            sim.utime.advance(arg)
+
+        sim.micropython.run_scheduled()      # the firmware runs them between bytecodes
+        self.main.loop()
+
+
+    def check(self):
+        """
+        Returns : str
+            what does not hold, '' if all does
+        """
+
+        m = self.main
+
+        for i in range(m.timers.count):
+            if not 1 <= m.timers.durations[i] <= m.MAX_TIME:
+                return 'timer {} set to {} s'.format(i + 1, m.timers.durations[i])
+
+        if m.mode != m.STOPWATCH and m.state == m.TIMER_PAUSED and not 1 <= m.current_time <= m.MAX_TIME:
+            return 'time on display {} s'.format(m.current_time)
+
+        if self.handled != self.edges:
+            return '{} rotary events sent, {} handled'.format(self.edges, self.handled)
+
+        if sim.micropython.pending() or m.tim in sim.utime._timers or m.sw_pressed:
+            return 'switch events left pending'
+
+        if self.panel.ram != m.ssd.buffer:
+            return 'panel differs from the frame buffer'
+
+        if self.panel.on != (not m.screen.blinking or m.screen.blink_on):
+            return 'panel is {}'.format('on' if self.panel.on else 'off')
+
+        bar = m.mode if m.mode == m.SET_MINUTES or m.mode == m.SET_SECONDS else -1
+
+        if m.old_bar != bar:
+            return 'underline for mode {} in mode {}'.format(m.old_bar, m.mode)
+
+        if m.mode == m.STOPWATCH or m.state == m.TIMER_FINISHED or m.tenths_shown():
+            return ''
+
+        if m.state != m.timers.state(m.selected):
+            return 'state {}, timer {} is {}'.format(m.state, m.selected + 1, m.timers.state(m.selected))
+
+        shown = m.ready_target if m.mode == m.SET_READY else m.current_time
+
+        if m.old_time != shown:
+            return '{} s drawn, {} s on display'.format(m.old_time, shown)
+
+        if (m.state == m.TIMER_PAUSED and m.mode != m.SET_READY and
+                m.current_time != m.timers.left(m.selected)):
+            return '{} s on display, timer {} has {} s'.format(m.current_time, m.selected + 1, m.timers.left(m.selected))
+
+        return ''
+
+
+def play(board, steps):
+    """
+    Returns : (int, str)
+        steps played and what went wrong, '' if nothing did
+    """
+
+    board.restart()
+
+    for n, (op, arg) in enumerate(steps):
+        try:
+            board.step(op, arg)
+            why = board.check()
+        except Exception as e:
+            why = '{}: {}'.format(type(e).__name__, e)
+
+        if why:
+            return n + 1, why
+
+    return len(steps), ''
+
+
+def generate(rng, size):
+    steps = []
+
+    for _ in range(size):
+        op = rng.choice(('turn', 'turn', 'turn', 'click', 'click', 'long', 'wait', 'loop'))
+
+        if op == 'turn':
+            arg = rng.choice((-1, 1)) * rng.choice((1, 1, 1, 2, 5, 40))
+        elif op == 'wait':
+            arg = rng.choice((100, 900, 5000, 60000, 130000))
+        else:
+            arg = 0
+
+        steps.append((op, arg))
+
+    return steps
+
+
+def shrink(board, steps):
+    """
+    Returns : list
+        a shorter sequence that still fails, by dropping chunks
+    """
+
+    chunk = len(steps) // 2
+
+    while chunk:
+        i = 0
+
+        while i < len(steps):
+            fewer = steps[:i] + steps[i + chunk:]
+
+            if play(board, fewer)[1]:
+                steps = fewer
+            else:
+                i += chunk
+
+        chunk //= 2
+
+    return steps
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.fuzz')
+    parser.add_argument('--runs', type = int, default = 500)
+    parser.add_argument('--steps', type = int, default = 24, help = 'most steps per run. Default: 24')
+    parser.add_argument('--seed', type = int, default = 1)
+    parser.add_argument('--boot', action = 'store_true', help = 'boot a fresh board for every run')
+    args = parser.parse_args(argv)
+
+    rng   = random.Random(args.seed)
+    cwd   = os.getcwd()
+    total = 0
+    bad   = None
+
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copy(os.path.join(sim.ROOT, 'programs.bin'), scratch)
+        os.chdir(scratch)
+
+        try:
+            t0    = time.time()
+            board = Board(args.boot)
+
+            for run in range(args.runs):
+                steps = generate(rng, rng.randrange(1, args.steps + 1))
+                n, why = play(board, steps)
+                total += n
+
+                if why:
+                    bad = shrink(board, steps[:n])
+                    break
+
+            took = time.time() - t0
+
+            if bad is not None:
+                print('run {}: {}'.format(run, play(board, bad)[1]))
+
+                for op, arg in bad:
+                    print('  {} {}'.format(op, arg) if arg else '  ' + op)
+        finally:
+            sim.reset()
+            os.chdir(cwd)
+
+    print('{} runs, {} steps in {:.1f} s: {:.0f} runs/s, {:.0f} steps/s'.format(
+          run + 1, total, took, (run + 1) / took, total / took))
+
+    return 1 if bad is not None else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
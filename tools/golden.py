@@ -0,0 +1,171 @@
+"""
+golden.py
+Pixel-exact golden images of the Screen drawing calls
+
+    python -m tools.golden             # compare, exit status 1 on any change
+    python -m tools.golden --update    # accept the current rendering
+    python -m tools.golden --out DIR   # also write PBM/PNG of every frame
+    python -m tools.golden --segments  # the time drawn as bars (SEGMENT_TIME)
+    python -m tools.golden --packed    # with the packed font (PACKED_FONT)
+    python -m tools.golden --file      # with the font file (FONT_FILE)
+
+Each scene is drawn on a freshly booted simulated board, upright and
+rotated, captured with SSD1306.capture() and compared with the PBM
+files in tools/golden/. Images are upright as the reader sees them; the
+rotated variants differ by the Screen layout used for an upside-down
+panel.
+Text drawn with ssd.text() uses the simulator's font, so the goldens
+are host references, not photos of the Pico.
+The goldens hold the bitmap font: with --segments, the bars must draw
+the very same screens, and so must the packed font with --packed and
+the font file with --file.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import sim
+
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+FONT_FILE  = 'seven_segment_48.bin'         # written by python -m tools.fontfile
+
+
+def _timer(screen):
+    screen.print_timer(8 * 60)
+
+
+def _minutes(screen):
+    screen.print_timer(8 * 60)
+    screen.set_minutes()
+
+
+def _seconds(screen):
+    screen.print_timer(8 * 60)
+    screen.set_seconds()
+
+
+def _battery(screen):
+    screen.print_voltage('3.9', False, 72)
+
+
+def _usb(screen):
+    screen.print_voltage('5.1', True)
+
+
+def _end(screen):
+    screen.end_msg()
+
+
+SCENES = {
+    'print_timer': _timer,
+    'set_minutes': _minutes,
+    'set_seconds': _seconds,
+    'print_voltage': _battery,
+    'print_voltage_usb': _usb,
+    'end_msg': _end,
+}
+
+VARIANTS = {
+    'upright': False,
+    'rotated': True,
+}
+
+
+def render(scene, rotate, settings = None):
+    """
+    Draw one scene on a freshly booted board
+
+    Parameters
+    ----------
+    scene : str
+        key of SCENES
+    rotate : bool
+        passed on to Screen
+    settings : dict, optional
+        config.py settings to override, by name. Default: none
+
+    Returns : SSD1306_I2C
+        the display, holding the frame
+    """
+
+    sim.install()
+
+    config = importlib.import_module('config')
+    Screen = importlib.import_module('lib.io.screen').Screen
+
+    for name, value in (settings or {}).items():
+        setattr(config, name, value)         # read when the writer is set up
+
+    screen = Screen(config.ssd, config.writer, rotate = rotate)
+    screen.clear_all()
+    SCENES[scene](screen)
+
+    return config.ssd
+
+
+def frames(settings = None):
+    """
+    Yield (name, ssd, pbm bytes) for every scene and variant
+    """
+
+    capture = importlib.import_module('lib.oled.capture')
+
+    for scene in SCENES:
+        for variant, rotate in VARIANTS.items():
+            ssd = render(scene, rotate, settings)
+            image = capture.pbm(ssd.capture(), ssd.width, ssd.height)
+
+            yield '{}-{}'.format(scene, variant), ssd, image
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.golden')
+    parser.add_argument('--update', action = 'store_true', help = 'rewrite the golden images')
+    parser.add_argument('--out', help = 'write every frame here as PBM and PNG')
+    parser.add_argument('--segments', action = 'store_true', help = 'draw the time as bars, against the same goldens')
+    parser.add_argument('--packed', action = 'store_true', help = 'use the packed font, against the same goldens')
+    parser.add_argument('--file', action = 'store_true', help = 'read the font from ' + FONT_FILE + ', against the same goldens')
+    args = parser.parse_args(argv)
+
+    settings = {'SEGMENT_TIME': args.segments, 'PACKED_FONT': args.packed,
+                'FONT_FILE': os.path.join(sim.ROOT, FONT_FILE) if args.file else None}
+
+    if args.update and (args.segments or args.packed or args.file):
+        parser.error('the goldens are the bitmap font\'s: --update alone')
+
+    changed = []
+
+    for name, ssd, image in frames(settings):
+        path = os.path.join(GOLDEN_DIR, name + '.pbm')
+
+        if args.out:
+            os.makedirs(args.out, exist_ok = True)
+            ssd.save_pbm(os.path.join(args.out, name + '.pbm'))
+            ssd.save_png(os.path.join(args.out, name + '.png'))
+
+        if args.update:
+            os.makedirs(GOLDEN_DIR, exist_ok = True)
+
+            with open(path, 'wb') as f:
+                f.write(image)
+
+            continue
+
+        try:
+            with open(path, 'rb') as f:
+                golden = f.read()
+        except OSError:
+            golden = None
+
+        if golden != image:
+            changed.append(name)
+            print('CHANGED ' + name, file = sys.stderr)
+
+    return 1 if changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
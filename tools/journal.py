@@ -0,0 +1,191 @@
+"""
+journal.py
+Pull the plug on the simulated board and check that the timers come back
+
+    python -m tools.journal [--trials N] [--seed S]
+
+Every trial boots a fresh board with two timers going (the one on
+display running, the other paused part way), lets it run for a random while, then cuts the power:
+either between two passes of the main loop or in the middle of a
+journal write, leaving only the first few bytes of the record on flash
+(a torn write). The board is then powered up again on the same flash,
+and the resumed timers must match the last record that was written
+whole: same timer on display, same states, durations and time left.
+
+In half the trials the timer on display counts down to a time of day
+("ready at") instead, and the power stays off up to half a minute with
+the RTC going on. That timer must come back armed on the same target,
+its time left read from the RTC: the time off counts for it alone.
+
+The exit status is 1 if any trial does not.
+"""
+
+import argparse
+import importlib
+import random
+import struct
+import sys
+
+import sim
+
+
+def boot(fresh, epoch = 0):
+    sim.install(fresh = fresh)
+    sim.reset(epoch, fresh = fresh)          # the RTC, kept by a coin cell
+
+    main = importlib.import_module('main')
+    main.ssd.i2c.keep_log = False
+
+    return main
+
+
+def decode(journal, record):
+    """
+    Returns : (int, (int, int), list of (int, int, int))
+        timer on display, "ready at" timer and target, and the state,
+        duration and ms left every timer should resume with
+    """
+
+    mod   = importlib.import_module('lib.core.journal')
+    cfg   = importlib.import_module('config')
+    at    = mod.HEAD_SZ
+    items = []
+
+    for _ in range(journal.timers.count):
+        state, _, _, duration, left = struct.unpack_from(mod.TIMER, record, at)
+        at += mod.TIMER_SZ
+
+        if state == cfg.TIMER_FINISHED:     # comes back rewound
+            state, left = cfg.TIMER_PAUSED, duration * 1000
+
+        items.append((state, duration, left))
+
+    _, selected, ready, target = struct.unpack_from(mod.HEAD, record)
+
+    return selected, (ready, target), items
+
+
+def trial(rng):
+    """
+    Returns : (bool, bool, str)
+        torn write, resumed as expected, what went wrong
+    """
+
+    main    = boot(True)
+    journal = main.journal
+    timers  = main.timers
+    store   = journal._store
+    good    = []                             # last record written whole
+    tear    = []                             # bytes of the next record to write
+
+    def cut_store(slot):
+        if tear:
+            with open(journal.path, 'r+b') as f:
+                f.seek(slot * journal.size)
+                f.write(journal.buf[:tear[0]])
+
+            raise sim.Stop(sim.utime.now_us() // 1000)
+
+        store(slot)
+        good[:] = [bytes(journal.buf)]
+
+    journal._store = cut_store
+
+    timers.set(0, rng.randrange(120, 900))   # none ends before the cut
+    timers.set(1, rng.randrange(120, 900))
+    timers.start(0)
+    timers.start(1)
+
+    shown = rng.randrange(2)
+    other = 1 - shown
+    ready = rng.random() < 0.5
+
+    if ready:                                # a few minutes ahead: still going at the cut
+        main.readyat.arm(shown, (main.readyat.now() // 60 + rng.randrange(3, 15)) % (24 * 60))
+
+    main.select(shown)
+
+    run = rng.randrange(2000, 60000) * 1000
+    mid = sim.utime.now_us() + run // 2
+    end = mid + run // 2
+
+    try:
+        while sim.utime.now_us() < end:
+            if timers.state(other) == main.TIMER_RUNNING and sim.utime.now_us() > mid:
+                timers.pause(other)
+
+            main.loop()
+
+        torn = rng.random() < 0.5
+
+        if torn:
+            tear.append(rng.randrange(journal.size))
+
+            while True:                      # a timer is running: a refresh is due
+                main.loop()
+    except sim.Stop:
+        pass
+
+    off  = rng.randrange(30) if ready else 0
+    main = boot(False, sim.utime._epoch + sim.utime.now_us() // 1000000 + off)
+
+    if not good:
+        return torn, main.selected == 0, 'resumed without a record'
+
+    selected, armed, expected = decode(main.journal, good[0])
+    timers = main.timers
+    got    = [(timers.state(i), timers.durations[i], timers.remaining_ms(i)) for i in range(timers.count)]
+
+    # running timers resume before the first frame and the hello beep, and run meanwhile
+    booted = sim.utime.now_us() // 1000 - [at for label, at, _ in main.devices.log if label == 'classes'][0] // 1000
+    got    = [(state, duration, left + booted if state == main.TIMER_RUNNING else left)
+              for state, duration, left in got]
+
+    if armed[0] >= 0:                        # on the RTC: within its second, not as journaled
+        i    = armed[0]
+        left = main.readyat.left(armed[1])
+        ms   = timers.remaining_ms(i)
+
+        if (main.readyat.slot, main.readyat.target) != armed:
+            return torn, False, 'ready at {}, expected {}'.format((main.readyat.slot, main.readyat.target), armed)
+
+        if timers.state(i) != main.TIMER_RUNNING or not (left - 1) * 1000 < ms <= left * 1000:
+            return torn, False, 'ready timer has {} ms, the RTC says {} s'.format(ms, left)
+
+        got[i] = expected[i] = None
+
+    if main.selected != selected:
+        return torn, False, 'timer {} on display, expected {}'.format(main.selected + 1, selected + 1)
+
+    if got != expected:
+        return torn, False, 'resumed {}, expected {}'.format(got[:2], expected[:2])
+
+    return torn, True, ''
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.journal')
+    parser.add_argument('--trials', type = int, default = 50)
+    parser.add_argument('--seed', type = int, default = 1)
+    args = parser.parse_args(argv)
+
+    rng    = random.Random(args.seed)
+    torn   = 0
+    failed = 0
+
+    for n in range(args.trials):
+        was_torn, ok, why = trial(rng)
+        torn += was_torn
+
+        if not ok:
+            failed += 1
+            print('trial {}: {}'.format(n, why))
+
+    sim.reset()
+    print('{} power cuts, {} of them mid-write: {} resumed wrong'.format(args.trials, torn, failed))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+packfont.py
+Packed font module from a font_to_py one
+
+    python -m tools.packfont [FONT] [-o OUT] [--cache N]
+
+Converts FONT (default lib/oled/seven_segment_48.py) into OUT (default:
+FONT with _rle before .py), where every glyph is stored as row runs and
+decoded on demand by lib/oled/packedfont.py, with N glyphs (default 12)
+kept decoded. OUT has the same functions as FONT and can replace it
+anywhere (see PACKED_FONT in config.py).
+
+Then checks OUT against FONT and prints:
+
+    glyphs       characters decoded exactly as FONT's glyphs
+    size         bytes literals of both modules, all glyphs and 0-9 : .
+    decode       host time per get_ch(), decoded and from the cache
+    heap         bytes held once imported: literals, plus the cache after
+                 Writer.metrics() and the countdown
+    countdown    cache hits while counting 99:59 down to 00:00
+
+The heap figures are those of a module loaded from source or .mpy; a
+frozen module keeps its literals in flash (tools/build.py). Decode times
+are the host's: on the Pico, lib/debug/fastcheck.py times unpack().
+Exit status 1 if a glyph differs.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import sim
+
+
+FONT  = 'lib/oled/seven_segment_48.py'
+TIMES = '0123456789:.'
+
+HEADER = '''\
+# Code generated by tools/packfont.py from {source}.
+{comments}# Glyphs stored as row runs: see lib/oled/packedfont.py
+version = '{version}'
+
+from lib.oled.packedfont import PackedFont
+
+'''
+
+FUNCS = ('height', 'baseline', 'max_width', 'hmap', 'reverse', 'monospaced', 'min_ch', 'max_ch')
+
+
+def module_name(path):
+    return os.path.relpath(os.path.abspath(path), sim.ROOT)[:-3].replace(os.sep, '.')
+
+
+def rows(font, code):
+    """
+    Returns : (list of bytes, int)
+        the rows of a glyph, its width
+    """
+
+    glyph, ht, wd = font.get_ch(chr(code))
+    gbytes        = (wd + 7) // 8
+
+    return [bytes(glyph[r * gbytes:(r + 1) * gbytes]) for r in range(ht)], wd
+
+
+def pack_glyph(lines, width):
+    """
+    Returns : bytes
+        width, then the runs of the rows
+    """
+
+    if width > 255:
+        raise ValueError('glyph {} px wide: 255 at most'.format(width))
+
+    out = bytearray([width])
+    r   = 0
+
+    while r < len(lines):
+        n = 1
+
+        while r + n < len(lines) and lines[r + n] == lines[r] and n < 127:
+            n += 1
+
+        if any(lines[r]):
+            out.append(n)
+            out += lines[r]
+        else:
+            out.append(0x80 | n)
+
+        r += n
+
+    return bytes(out)
+
+
+def pack(font):
+    """
+    Returns : (bytes, bytes)
+        glyph records, and their index: the default glyph first, then
+        min_ch to max_ch, and the end of the data
+    """
+
+    data   = bytearray()
+    index  = bytearray()
+    codes  = [None] + list(range(font.min_ch(), font.max_ch() + 1))
+    done   = {}                              # record -> offset: the default glyph is a copy
+
+    for code in codes:
+        record = pack_glyph(*rows(font, 0 if code is None else code))
+
+        if record not in done:
+            done[record] = len(data)
+            data        += record
+
+        index += done[record].to_bytes(2, 'little')
+
+    if len(data) > 0xFFFF:
+        raise ValueError('{} bytes of glyphs: 16 bit offsets hold 65535'.format(len(data)))
+
+    index += len(data).to_bytes(2, 'little')
+
+    return bytes(data), bytes(index)
+
+
+def literal(name, data):
+    lines = ["b'" + ''.join('\\x{:02x}'.format(b) for b in data[i:i + 16]) + "'"
+             for i in range(0, len(data), 16)]
+
+    return '{} =\\\n{}\n\n'.format(name, '\\\n'.join(lines))
+
+
+def write_module(path, font, source, data, index, cache):
+    with open(os.path.join(sim.ROOT, source)) as f:
+        comments = ''.join(line for line in f.readlines()[1:4] if line.startswith('# '))
+
+    text = HEADER.format(source = source, comments = comments, version = getattr(font, 'version', '0'))
+
+    for name in FUNCS:
+        text += 'def {}():\n    return {!r}\n\n'.format(name, getattr(font, name)())
+
+    text += literal('_font', data)
+    text += literal('_index', index)
+    text += '_packed = PackedFont(_font, _index, {}, {}, {}, {})\n\n'.format(
+            font.height(), font.min_ch(), font.max_ch(), cache)
+    text += 'get_ch = _packed.get_ch\n'
+    text += 'get_code = _packed.get_code\n'
+
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def compare(font, packed):
+    """
+    Returns : list of str
+        characters decoded differently, by get_ch() or get_code()
+    """
+
+    wrong = []
+    by_code = getattr(packed, 'get_code', None)
+
+    for code in range(font.min_ch() - 1, font.max_ch() + 2):     # the default glyph on both ends
+        want = font.get_ch(chr(code))
+
+        for got in (packed.get_ch(chr(code)), by_code(code) if by_code else want):
+            if bytes(want[0]) != bytes(got[0]) or want[1:] != got[1:]:
+                wrong.append(chr(code))
+                break
+
+    return wrong
+
+
+def timing(cache, chars, repeat = 20):
+    """
+    Parameters
+    ----------
+    cache : PackedFont
+        font timed
+
+    Returns : (float, float)
+        us per get_ch() with every call a miss, and with every call a hit
+    """
+
+    miss = hit = 0
+
+    for _ in range(repeat):
+        for ch in chars:
+            cache.clear()
+            t0    = time.perf_counter()
+            cache.get_ch(ch)
+            miss += time.perf_counter() - t0
+
+            t0   = time.perf_counter()
+            cache.get_ch(ch)
+            hit += time.perf_counter() - t0
+
+    calls = repeat * len(chars)
+
+    return miss / calls * 1e6, hit / calls * 1e6
+
+
+def countdown(cache):
+    """
+    Returns : (int, int)
+        hits and misses of cache.get_ch() for the characters redrawn,
+        counting down from 99:59, as Screen does: from the first one that
+        changed
+    """
+
+    cache.clear()
+    shown = ''
+
+    for t in range(99 * 60 + 59, -1, -1):
+        text = '{:02d}:{:02d}'.format(*divmod(t, 60))
+        i    = 0
+
+        while i < len(shown) and shown[i] == text[i]:
+            i += 1
+
+        for ch in text[i:]:
+            cache.get_ch(ch)
+
+        shown = text
+
+    return cache.hits, cache.misses
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.packfont')
+    parser.add_argument('font', nargs = '?', default = FONT, help = 'font_to_py module. Default: ' + FONT)
+    parser.add_argument('-o', '--out', help = 'packed module to write. Default: FONT_rle.py')
+    parser.add_argument('--cache', type = int, default = 12, help = 'glyphs kept decoded. Default: 12')
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.cache <= 255:
+        parser.error('--cache: 1 to 255 glyphs')
+
+    out = args.out or args.font[:-3] + '_rle.py'
+
+    sim.install()
+
+    font        = importlib.import_module(module_name(args.font))
+    data, index = pack(font)
+
+    write_module(out, font, os.path.relpath(os.path.abspath(args.font), sim.ROOT).replace(os.sep, '/'),
+                 data, index, args.cache)
+
+    packed = importlib.import_module(module_name(out))
+    wrong  = compare(font, packed)           # every glyph, as Writer.metrics() at boot
+
+    raw      = len(font._font) + len(font._index)
+    raw_time = sum(len(rows(font, ord(c))[0]) * ((font.get_ch(c)[2] + 7) // 8) + 2 for c in TIMES)
+    run_time = sum(len(pack_glyph(*rows(font, ord(c)))) for c in TIMES)
+    cache    = packed._packed
+    miss, hit    = timing(cache, TIMES)
+    hits, misses = countdown(cache)
+    slots        = [len(b) for b in cache.bufs if b is not None]
+
+    print('written  {}'.format(out))
+    print('glyphs   {} of {} as {}{}'.format(
+          font.max_ch() - font.min_ch() + 3 - len(wrong), font.max_ch() - font.min_ch() + 3, args.font,
+          ', WRONG: ' + ' '.join(wrong) if wrong else ''))
+    print('size     {} -> {} bytes, {:.1f}x; {} : . alone: {} -> {} bytes, {:.1f}x'.format(
+          raw, len(data) + len(index), raw / (len(data) + len(index)),
+          TIMES[:10], raw_time, run_time, raw_time / run_time))
+    print('decode   {:.1f} us a glyph decoded, {:.1f} us from the cache (host)'.format(miss, hit))
+    print('heap     {} bytes for {}; {} for the packed one: {} literals + {} cache ({})'.format(
+          raw, args.font, len(data) + len(index) + sum(slots), len(data) + len(index), sum(slots),
+          ' '.join(str(n) for n in slots)))
+    print('countdown {} hits, {} decodes over {} get_ch()'.format(hits, misses, hits + misses))
+
+    sim.reset()
+
+    return 1 if wrong else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
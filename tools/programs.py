@@ -0,0 +1,166 @@
+"""
+programs.py
+Build, list and check multi-stage program tables
+
+    python -m tools.programs build programs.txt [-o programs.bin]
+    python -m tools.programs show [programs.bin]
+    python -m tools.programs run [programs.bin] [-p N]
+
+A source file has one program per line: a name (8 characters at most)
+followed by its stages as "m:ss tone" pairs, tone being one of short,
+double, error or half. '#' starts a comment.
+
+    Eggs    8:00 short  2:00 double
+
+`run` boots the firmware on the simulated board, puts each program on
+timer 1, starts it and lets the virtual clock run to the alarm. Every
+stage change is printed with the time it was due and the time the main
+loop noticed it; the exit status is 1 if a program does not end
+exactly on the sum of its stages.
+"""
+
+import argparse
+import importlib
+import sys
+
+import sim
+
+from sim import ky040
+
+
+TONES = ('short', 'double', 'error', 'half')
+
+
+def parse(text):
+    """
+    Read a program source
+
+    Returns : list of (str, list of (int, int))
+        name and (seconds, tone) stages of every program
+    """
+
+    programs = []
+
+    for n, line in enumerate(text.splitlines(), 1):
+        words = line.split('#')[0].split()
+
+        if not words:
+            continue
+
+        if len(words) < 3 or len(words) % 2 == 0 or len(words[0]) > 8:
+            raise ValueError('line {}: expected name and "m:ss tone" pairs'.format(n))
+
+        stages = []
+
+        for t, tone in zip(words[1::2], words[2::2]):
+            m, s = t.split(':')
+            stages.append((int(m) * 60 + int(s), TONES.index(tone)))
+
+        programs.append((words[0], stages))
+
+    return programs
+
+
+def fmt(seconds):
+    return '{}:{:02d}'.format(seconds // 60, seconds % 60)
+
+
+def show(table):
+    for p in range(table.count):
+        stages = [table.stage(p, s) for s in range(table.stages(p))]
+        print('{:<8} '.format(table.name(p)) +
+              '  '.join('{} {}'.format(fmt(t), TONES[tone]) for t, tone in stages))
+
+
+def run_program(data, p):
+    """
+    Run program `p` of a packed table on the simulated board
+
+    Returns : bool
+        the program ended on time
+    """
+
+    sim.install()
+
+    main     = importlib.import_module('main')
+    programs = importlib.import_module('lib.core.programs')
+
+    main.ssd.i2c.keep_log = False
+    main.programs.table   = programs.ProgramTable(data)
+
+    table  = main.programs.table
+    timers = main.timers
+
+    main.programs.load(0, p)
+    main.current_time = timers.left(0)
+    main.loop()
+    ky040.click()
+
+    while main.state != main.TIMER_RUNNING:
+        main.loop()
+
+    due   = timers.deadlines[0] - table.stage(p, 0)[0] * 1000
+    stage = 0
+
+    print('{} ({} stages)'.format(table.name(p), table.stages(p)))
+
+    # stages move on at the top of the loop, before anything is drawn
+    while main.state != main.TIMER_FINISHED:
+        top = timers.now()
+        main.loop()
+
+        if main.programs.stage[0] != stage:
+            due  += table.stage(p, stage)[0] * 1000
+            stage = main.programs.stage[0]
+            print('  stage {}  due {:>8} ms  noticed +{} ms'.format(stage + 1, due, top - due))
+
+    due += table.stage(p, stage)[0] * 1000
+    print('  alarm    due {:>8} ms  noticed +{} ms'.format(due, top - due))
+
+    return timers.deadlines[0] == due
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.programs')
+    sub = parser.add_subparsers(dest = 'command', required = True)
+
+    build = sub.add_parser('build', help = 'compile a source file')
+    build.add_argument('source')
+    build.add_argument('-o', '--output', default = 'programs.bin')
+
+    for name in ('show', 'run'):
+        cmd = sub.add_parser(name)
+        cmd.add_argument('table', nargs = '?', default = 'programs.bin')
+
+    cmd.add_argument('-p', '--program', type = int, action = 'append', help = 'program number, from 0. Default: all')
+    args = parser.parse_args(argv)
+
+    sim.install()
+    programs = importlib.import_module('lib.core.programs')
+
+    if args.command == 'build':
+        with open(args.source) as f:
+            data = programs.pack(parse(f.read()))
+
+        with open(args.output, 'wb') as f:
+            f.write(data)
+
+        print('{}: {} bytes'.format(args.output, len(data)))
+        return 0
+
+    with open(args.table, 'rb') as f:
+        data = f.read()
+
+    table = programs.ProgramTable(data)
+
+    if args.command == 'show':
+        show(table)
+        return 0
+
+    late = [p for p in (args.program or range(table.count)) if not run_program(data, p)]
+
+    return 1 if late else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
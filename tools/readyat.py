@@ -0,0 +1,122 @@
+"""
+readyat.py
+Check "ready at" targets against the RTC on the simulated board
+
+    python -m tools.readyat [--drift PPM]
+
+Sets the RTC to 18:07:20, goes through the preset menu with the knob to
+"ready at", sets 18:30 and starts it, then runs the virtual clock to
+the alarm. The RTC is stubbed with one that runs `drift` parts per
+million fast (or slow, if negative) against the tick counter, as two
+crystals would, and the alarm must go off when the RTC, not the tick
+counter, reads 18:30:00. The exit status is 1 if it goes off a second
+or more away from that.
+"""
+
+import argparse
+import importlib
+import sys
+
+import sim
+
+from sim import ky040
+
+
+class DriftingRTC:
+    """
+    RTC running `ppm` parts per million away from the virtual clock
+
+    Parameters
+    ----------
+    rtc : machine.RTC
+        the simulated RTC, read at start
+    ppm : int
+        drift
+    """
+
+    def __init__(self, rtc, ppm):
+        dt = rtc.datetime()
+
+        self.base  = dt[4] * 3600 + dt[5] * 60 + dt[6]
+        self.t0_us = sim.utime.now_us()
+        self.ppm   = ppm
+
+
+    def ms(self):
+        """
+        Returns : int
+            ms since midnight, more than the RTC tells
+        """
+
+        us = sim.utime.now_us() - self.t0_us
+
+        return self.base * 1000 + (us + us * self.ppm // 1000000) // 1000
+
+
+    def seconds(self):
+        return self.ms() // 1000
+
+
+    def datetime(self):
+        s = self.seconds()
+
+        return (2024, 5, 17, 4, s // 3600 % 24, s // 60 % 60, s % 60, 0)
+
+
+def run(ppm):
+    """
+    Returns : (int, int)
+        RTC ms since midnight when the alarm went off, and the target
+    """
+
+    sim.install()
+
+    main = importlib.import_module('main')
+    main.ssd.i2c.keep_log = False
+    main.rtc.datetime((2024, 5, 17, 4, 18, 7, 20, 0))
+
+    rtc = DriftingRTC(main.rtc, ppm)
+    main.readyat.rtc = rtc
+    main.loop()
+
+    ky040.long_click()                       # preset menu, on SAVE
+    main.loop()
+    ky040.turn(cw = False)                   # READY AT
+    main.loop()
+    ky040.click()
+    main.loop()
+
+    while main.ready_target != 18 * 60 + 30:
+        ky040.turn(cw = main.ready_target < 18 * 60 + 30)
+        main.loop()
+
+    ky040.click()
+
+    # the timer rings at the top of the loop, before the alarm is drawn and beeped
+    while main.state != main.TIMER_FINISHED:
+        rang = rtc.ms()
+        main.loop()
+
+    return rang, main.readyat.target * 60000
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.readyat')
+    parser.add_argument('--drift', type = int, action = 'append', help = 'RTC drift in ppm. Default: 0, 20000 and -20000')
+    args = parser.parse_args(argv)
+
+    failed = 0
+
+    for ppm in args.drift or (0, 20000, -20000):
+        rang, target = run(ppm)
+        late = rang - target
+        failed += abs(late) >= 1000
+
+        print('drift {:>+6} ppm: alarm at RTC {:02d}:{:02d}:{:02d}.{:03d}, {:+d} ms'.format(
+              ppm, rang // 3600000, rang // 60000 % 60, rang // 1000 % 60, rang % 1000, late))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
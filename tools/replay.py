@@ -0,0 +1,203 @@
+"""
+replay.py
+Replay a recorded input log against the firmware on the host
+
+    python -m tools.replay input.log [--tail MS] [--json]
+
+The log comes from lib.debug.recorder (RECORD_INPUT in config.py).
+Each record is injected at its original time on the virtual clock:
+rotary events go through micropython.schedule() into the Rotary
+handlers, exactly as the IRQ would send them, and ADC readings become
+what the simulated converter returns. The main loop runs in between
+as fast as the host allows, so a replay is deterministic and much
+faster than real time.
+
+For every rotary event the time until the end of the first flush
+started after it, SSD1306.show() or show_region(), is reported as its
+event-to-pixel latency.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+
+import sim
+
+from sim import machine
+from sim import micropython
+from sim import utime
+
+
+KIND_NAMES = {1: 'ROT_CW', 2: 'ROT_CCW', 4: 'SW_PRESS', 8: 'SW_RELEASE'}
+
+
+class Replay:
+    """
+    Feeds a decoded log to a freshly booted firmware
+
+    Parameters
+    ----------
+    events : list of (ms, kind, value)
+        from recorder.read_log()
+    """
+
+    def __init__(self, events):
+        sim.install()
+
+        self.main      = importlib.import_module('main')
+        self.recorder  = importlib.import_module('lib.debug.recorder')
+        self.events    = events
+        self.base      = utime.now_us() // 1000
+        self.next      = 0
+        self.pending   = []
+        self.latencies = []
+        self.depth     = 0                   # flushes in progress: show_region() may call show()
+        self.timer     = machine.Timer(-1)
+
+        self.main.ssd.i2c.keep_log = False
+
+        self.main.ssd.show        = self._timed(self.main.ssd.show)
+        self.main.ssd.show_region = self._timed(self.main.ssd.show_region)
+        self._arm()
+
+
+    def _timed(self, flush):
+        """
+        Returns : callable
+            `flush`, reporting latencies when it ends, unless it runs
+            inside another flush (counted once, by the outer one)
+        """
+
+        def timed(*args):
+            start       = utime.now_us() // 1000
+            self.depth += 1
+
+            try:
+                flush(*args)
+            finally:
+                self.depth -= 1
+
+            if not self.depth:
+                self._shown(start)
+
+        return timed
+
+
+    def _arm(self):
+        if self.next >= len(self.events):
+            return
+
+        due = self.base + self.events[self.next][0]
+        delay = max(due - utime.now_us() // 1000, 0)
+
+        self.timer.init(mode = machine.Timer.ONE_SHOT, period = delay, callback = self._inject)
+
+
+    def _inject(self, t):
+        now = utime.now_us() // 1000
+
+        while self.next < len(self.events) and self.base + self.events[self.next][0] <= now:
+            at, kind, value = self.events[self.next]
+            self.next += 1
+
+            if kind == self.recorder.KIND_VIN:
+                self.main.Vin.set(value)
+            elif kind == self.recorder.KIND_VSYS:
+                self.main.Vsys.set(value)
+            elif kind in KIND_NAMES:
+                self.pending.append((at, kind, now))
+                micropython.schedule(self.main.rotary.call_handlers, kind)
+
+        self._arm()
+
+
+    def _shown(self, start):
+        now = utime.now_us() // 1000
+        late = []
+
+        # events that arrived while the frame was on the bus wait for the next one
+        for event in self.pending:
+            at, kind, injected = event
+
+            if injected > start:
+                late.append(event)
+            else:
+                self.latencies.append((at, KIND_NAMES[kind], now - injected))
+
+        self.pending = late
+
+
+    def run(self, tail = 2000):
+        """
+        Play every event, then keep running for `tail` ms
+
+        Returns : list of (ms, event name, latency ms)
+        """
+
+        end = self.base + (self.events[-1][0] if self.events else 0) + tail
+        utime.stop_at(end)
+
+        try:
+            while True:
+                self.main.loop()
+        except sim.Stop:
+            pass
+        finally:
+            utime.stop_at(None)
+
+        return self.latencies
+
+
+def summary(latencies):
+    """
+    Returns : dict
+        event name -> {count, mean_ms, max_ms}
+    """
+
+    out = {}
+
+    for _, name, ms in latencies:
+        s = out.setdefault(name, {'count': 0, 'mean_ms': 0, 'max_ms': 0})
+        s['count'] += 1
+        s['mean_ms'] += ms
+        s['max_ms'] = max(s['max_ms'], ms)
+
+    for s in out.values():
+        s['mean_ms'] = round(s['mean_ms'] / s['count'], 1)
+
+    return out
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.replay')
+    parser.add_argument('log', help = 'file written by lib.debug.recorder')
+    parser.add_argument('--tail', type = int, default = 2000, help = 'ms to keep running after the last event')
+    parser.add_argument('--json', action = 'store_true', help = 'print JSON instead of a table')
+    args = parser.parse_args(argv)
+
+    sim.install()
+    recorder = importlib.import_module('lib.debug.recorder')
+
+    with open(args.log, 'rb') as f:
+        events = recorder.read_log(f.read())
+
+    latencies = Replay(events).run(args.tail)
+
+    if args.json:
+        print(json.dumps({'events': latencies, 'summary': summary(latencies)}, indent = 2))
+        return 0
+
+    print('{:>10}  {:<10}{:>12}'.format('t (ms)', 'event', 'latency ms'))
+
+    for at, name, ms in latencies:
+        print('{:>10}  {:<10}{:>12}'.format(at, name, ms))
+
+    for name, s in sorted(summary(latencies).items()):
+        print('{:<10} n={:<5} mean={:<8} max={}'.format(name, s['count'], s['mean_ms'], s['max_ms']))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+segments.py
+Bar-drawn digits against the bitmap font
+
+    python -m tools.segments
+
+Checks lib/oled/segments.py on the simulated board:
+
+    glyphs       at 48 px and 3 px bars, every character of a time is the
+                 font's glyph pixel for pixel, with the same advance and
+                 blank columns
+    redraw       turning any digit into any other with redraw() leaves
+                 the same pixels as drawing it on a blank cell, at every
+                 size below: thickness 1 makes bars share pixels
+    sizes        at other heights and thicknesses nothing is drawn outside
+                 the character cells
+
+and prints the bars it keeps against the bytes of the bitmap font. Exit
+status 1 if anything differs. python -m tools.golden --segments compares
+whole screens with the goldens of the bitmap font.
+"""
+
+import argparse
+import importlib
+import sys
+
+import sim
+
+
+CHARS = b'0123456789:.'
+SIZES = ((48, 3), (48, 1), (32, 3), (64, 5), (24, 1), (40, 3))
+
+
+def canvas(width, height):
+    framebuf = importlib.import_module('framebuf')
+    buf      = bytearray((width + 7) // 8 * height)
+
+    return framebuf.FrameBuffer(buf, width, height, framebuf.MONO_HLSB), buf
+
+
+def lit(fb, width, height):
+    return {(x, y) for y in range(height) for x in range(width) if fb.pixel(x, y)}
+
+
+def glyphs(font, segments):
+    """
+    Returns : list of str
+        characters that differ from the font
+    """
+
+    fwidths, fblank = importlib.import_module('config').writer.metrics()   # the bitmap font's
+    swidths, sblank = segments.metrics()
+    wrong           = []
+
+    for code in CHARS:
+        glyph, ht, wd = font.get_ch(chr(code))
+        want, buf     = canvas(wd, ht)
+        buf[:]        = glyph
+
+        fb, _ = canvas(32, ht)
+        segments.device = fb
+        segments.set_textpos(fb, 0, 0)
+        segments.printbytes(bytes([code]), 0, 1)
+
+        if lit(fb, 32, ht) != lit(want, wd, ht) or (fwidths[code], fblank[code]) != (swidths[code], sblank[code]):
+            wrong.append(chr(code))
+
+    return wrong
+
+
+def redraws(segments, height):
+    """
+    Returns : (int, int, list)
+        pairs redrawn bar by bar, pairs left to a full draw, pairs wrong
+    """
+
+    done, whole, wrong = 0, 0, []
+    width              = max(segments.metrics()[0])
+
+    for old in CHARS[:10]:
+        for new in CHARS[:10]:
+            fb, _ = canvas(width, height)
+            segments.device = fb
+            segments.set_textpos(fb, 0, 0)
+            segments.printbytes(bytes([old]), 0, 1)
+            segments.set_textpos(fb, 0, 0)
+
+            if not segments.redraw(old, new):
+                whole += 1
+                continue
+
+            fresh, _ = canvas(width, height)
+            segments.device = fresh
+            segments.set_textpos(fresh, 0, 0)
+            segments.printbytes(bytes([new]), 0, 1)
+
+            if lit(fb, width, height) != lit(fresh, width, height):
+                wrong.append(chr(old) + '>' + chr(new))
+
+            done += 1
+
+    return done, whole, wrong
+
+
+def sizes(Segments):
+    """
+    Returns : list of str
+        sizes drawing outside the cells
+    """
+
+    wrong = []
+
+    for height, thickness in SIZES:
+        probe  = Segments(None, height, thickness)
+        widths = probe.metrics()[0]
+        text   = b'12:34.5'
+        width  = sum(widths[c] for c in text)
+        fb, _  = canvas(width + 16, height + 16)
+
+        probe.device = fb
+        probe.set_textpos(fb, 8, 8)
+        probe.printbytes(text, 0, len(text))
+
+        if any(not (8 <= x < 8 + width and 8 <= y < 8 + height) for x, y in lit(fb, width + 16, height + 16)):
+            wrong.append('{} px/{}'.format(height, thickness))
+
+    return wrong
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.segments')
+    parser.parse_args(argv)
+
+    sim.install()
+
+    font     = importlib.import_module('lib.oled.seven_segment_48')
+    Segments = importlib.import_module('lib.oled.segments').Segments
+    segments = Segments(None)
+
+    bad_glyphs             = glyphs(font, segments)
+    done, whole, bad_pairs = 0, 0, []
+    bad_sizes              = sizes(Segments)
+
+    for height, thickness in SIZES:
+        d, w, wrong = redraws(Segments(None, height, thickness), height)
+        done       += d
+        whole      += w
+        bad_pairs  += ['{} at {} px/{}'.format(pair, height, thickness) for pair in wrong]
+    bars                   = sum(len(b) for b in segments.bars.values())
+
+    print('glyphs  {} of {} as the font{}'.format(
+          len(CHARS) - len(bad_glyphs), len(CHARS), ', WRONG: ' + ' '.join(bad_glyphs) if bad_glyphs else ''))
+    print('redraw  {} digit pairs bar by bar, {} drawn whole, over {} sizes{}'.format(
+          done, whole, len(SIZES), ', WRONG: ' + ' '.join(bad_pairs) if bad_pairs else ''))
+    print('sizes   {} of {} within their cells{}'.format(
+          len(SIZES) - len(bad_sizes), len(SIZES), ', WRONG: ' + ' '.join(bad_sizes) if bad_sizes else ''))
+    print('memory  {} bars of 4 small ints, against {} bytes of bitmaps'.format(bars, len(font._font) + len(font._index)))
+
+    sim.reset()
+
+    return 1 if bad_glyphs or bad_pairs or bad_sizes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+timers.py
+Check the timer core with dozens of timers on a fake clock
+
+    python -m tools.timers [--timers N] [--runs RUNS] [--seed SEED]
+
+Drives lib/core/timers.py alone, through its `clock` hook: N timers
+(default 48) of 1 s to 2 min, started within the first 5 s, on a fake
+ticks_ms() that wraps as the rp2 one does. Each scenario is run RUNS
+times (default 20):
+
+    steps        the clock moves on in random steps of up to 250 ms
+    pause        every timer is also paused once and resumed later
+    wrap         as pause, with ticks_ms() wrapping 30 s into the run
+    wait         as wrap, the loop sleeping exactly what wait(-1) says
+    rebase       as wrap, with the manager's own clock moved back to 0
+                 (REBASE_MS) 30 s into the run, as after 3 days of uptime
+
+After every step poll() runs, and the time each timer is first seen
+finished is compared with when it should end: its start, plus its
+duration, plus the time it spent paused. A timer must never end early,
+nor later than the step that crossed its end (not at all late under
+wait), and timers must end in the order of their ends. others() must
+list the timers soonest first, and the clock and deadlines must stay
+small ints on the Pico (under 2**30 either way): CPython's own ints
+never overflow, so this is checked by value. Exit status 1 on any
+failure.
+"""
+
+import argparse
+import importlib
+import random
+import sys
+
+import sim
+
+
+MAX_STEP  = 250                              # ms, random steps
+START_MS  = 5000                             # timers start within this
+WRAP_AT   = 30000                            # ms into the run for the wrap scenarios
+SMALL     = 1 << 30                          # rp2 small ints are under this, either way
+
+SCENARIOS = (
+    # name, pause, wrap, sleep on wait(), rebase
+    ('steps',  False, False, False, False),
+    ('pause',  True,  False, False, False),
+    ('wrap',   True,  True,  False, False),
+    ('wait',   True,  True,  True,  False),
+    ('rebase', True,  True,  False, True),
+)
+
+
+class FakeClock:
+    """
+    ticks_ms() on a counter moved by hand
+
+    Parameters
+    ----------
+    start : int
+        ticks at creation, before wrapping
+    """
+
+    def __init__(self, start):
+        self.ms = start
+
+
+    def __call__(self):
+        return self.ms & sim.utime.TICKS_MAX
+
+
+def plan(rng, count, pause):
+    """
+    Returns : (list of (int, str, int), list of int, list of int)
+        actions (ms into the run, 'start' or 'pause', timer), durations
+        in seconds and the ms into the run every timer should end
+    """
+
+    actions   = []
+    durations = []
+    ends      = []
+
+    for i in range(count):
+        seconds = rng.randrange(1, 121)
+        start   = rng.randrange(0, START_MS)
+        end     = start + seconds * 1000
+
+        actions.append((start, 'start', i))
+
+        if pause:
+            at   = start + rng.randrange(1, seconds * 1000)  # before the end, while running
+            held = rng.randrange(100, 10000)
+
+            actions.append((at, 'pause', i))
+            actions.append((at + held, 'start', i))
+            end += held
+
+        durations.append(seconds)
+        ends.append(end)
+
+    actions.sort()
+
+    return actions, durations, ends
+
+
+def others(timers, tm, i):
+    """
+    Returns : list of int
+        what TimerManager.others() should list, sorted the plain way
+    """
+
+    used    = [j for j in range(tm.count) if j != i and tm.in_use(j)]
+    running = sorted((j for j in used if tm.states[j] == timers.TIMER_RUNNING), key = lambda j: tm.deadlines[j])
+    rest    = sorted((j for j in used if tm.states[j] != timers.TIMER_RUNNING),
+                     key = lambda j: tm.states[j] != timers.TIMER_FINISHED)
+
+    return running + rest
+
+
+def run(rng, timers, count, pause, wrap, sleep, rebase):
+    """
+    Returns : (list of str, int)
+        what went wrong, the latest end seen after it was due, in ms
+    """
+
+    base  = sim.utime.TICKS_PERIOD - WRAP_AT if wrap else rng.randrange(0, 1 << 20)
+    clock = FakeClock(base)
+    tm    = timers.TimerManager(count, 0, clock)
+
+    if rebase:
+        tm.ms = timers.REBASE_MS - WRAP_AT
+
+    actions, durations, ends = plan(rng, count, pause)
+
+    for i, seconds in enumerate(durations):
+        tm.set(i, seconds)
+
+    seen  = [None] * count                   # ms into the run each was first seen finished
+    now   = 0
+    step  = 0
+    late  = 0
+    wrong = []
+    last  = max(ends)
+
+    while True:
+        while actions and actions[0][0] <= now:
+            _, what, i = actions.pop(0)
+
+            if what == 'start':
+                tm.start(i)
+            else:
+                tm.pause(i)
+
+        tm.poll()
+
+        if not all(-SMALL <= v < SMALL for v in [tm.ms] + list(tm.deadlines)):
+            wrong.append('clock or deadlines past small ints at {} ms'.format(now))
+            break
+
+        i = rng.randrange(count)
+
+        if list(tm.order[:tm.others(i)]) != others(timers, tm, i):
+            wrong.append('others({}) out of order at {} ms'.format(i, now))
+            break
+
+        for i in range(count):
+            if seen[i] is None and tm.state(i) == timers.TIMER_FINISHED:
+                seen[i] = now
+
+                if now < ends[i]:
+                    wrong.append('timer {} ended {} ms early'.format(i, ends[i] - now))
+                elif now - ends[i] > (0 if sleep else step):
+                    wrong.append('timer {} ended {} ms late'.format(i, now - ends[i]))
+
+                late = max(late, now - ends[i])
+
+        if now >= last:
+            break
+
+        step = tm.wait(-1) if sleep else rng.randrange(1, MAX_STEP + 1)
+
+        if actions:
+            step = min(step, actions[0][0] - now)
+
+        clock.ms += step
+        now      += step
+
+    missing = [i for i in range(count) if seen[i] is None]
+
+    if missing:
+        wrong.append('timers {} never ended'.format(missing))
+        return wrong, late
+
+    order = sorted(range(count), key = lambda i: ends[i])
+
+    for a, b in zip(order, order[1:]):
+        if ends[a] < ends[b] and seen[a] > seen[b]:
+            wrong.append('timer {} ended after timer {}, due later'.format(a, b))
+
+    return wrong, late
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m tools.timers')
+    parser.add_argument('--timers', type = int, default = 48, help = 'timers per run. Default: 48')
+    parser.add_argument('--runs', type = int, default = 20, help = 'runs per scenario. Default: 20')
+    parser.add_argument('--seed', type = int, default = 1, help = 'random seed. Default: 1')
+    args = parser.parse_args(argv)
+
+    sim.install()
+
+    timers = importlib.import_module('lib.core.timers')
+    rng    = random.Random(args.seed)
+    failed = False
+
+    for name, pause, wrap, sleep, rebase in SCENARIOS:
+        wrong = []
+        late  = 0
+
+        for _ in range(args.runs):
+            w, l   = run(rng, timers, args.timers, pause, wrap, sleep, rebase)
+            wrong += w
+            late   = max(late, l)
+
+        print('{:<6} {} runs of {} timers: latest end noticed +{} ms, {}'.format(
+              name, args.runs, args.timers, late, 'ok' if not wrong else '{} WRONG'.format(len(wrong))))
+
+        for line in wrong[:5]:
+            print('       ' + line)
+
+        failed = failed or bool(wrong)
+
+    sim.reset()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())